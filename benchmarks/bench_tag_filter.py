@@ -0,0 +1,92 @@
+"""
+Microbenchmark for tag filter evaluation.
+
+Compares evaluating 50 filters against a synthetic fleet through the inverted
+TagIndex with checking every resource one by one.
+
+Run with: python benchmarks/bench_tag_filter.py [resources] [filters]
+"""
+
+import random
+import sys
+import time
+
+from cli.internal.aws.tag_filter import TagIndex, compile_tag_filter
+
+TEAMS = [f"team-{i}" for i in range(40)]
+ENVIRONMENTS = ["prod", "staging", "dev", "qa"]
+TIERS = ["gold", "silver", "bronze"]
+
+
+def make_fleet(size: int) -> list[dict]:
+    rng = random.Random(42)
+    fleet = []
+    for i in range(size):
+        tags = [
+            {"Key": "Team", "Value": rng.choice(TEAMS)},
+            {"Key": "Env", "Value": rng.choice(ENVIRONMENTS)},
+            {"Key": "Tier", "Value": rng.choice(TIERS)},
+        ]
+        if rng.random() < 0.2:
+            tags.append({"Key": "Backup", "Value": "true"})
+        fleet.append({"DBClusterIdentifier": f"cluster-{i}", "TagList": tags})
+    return fleet
+
+
+def make_filters(count: int) -> list[str]:
+    rng = random.Random(7)
+    filters = []
+    for i in range(count):
+        team = rng.choice(TEAMS)
+        env = rng.choice(ENVIRONMENTS)
+        match i % 5:
+            case 0:
+                filters.append(f"tag:Team={team} AND tag:Env={env}")
+            case 1:
+                filters.append(f"tag:Team={team} OR tag:Backup=true")
+            case 2:
+                filters.append(f"tag:Env={env} AND (tag:Tier=gold OR tag:Tier=silver)")
+            case 3:
+                filters.append(f"tag:Team={team} AND NOT tag:Env=dev")
+            case _:
+                filters.append(f"tag:Team*=team-{i % 4}* AND tag:Backup")
+    return filters
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{label:<24} {elapsed:>10.2f} ms")
+    return result, elapsed
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    filter_count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    fleet = make_fleet(size)
+    filters = [compile_tag_filter(f) for f in make_filters(filter_count)]
+    print(f"{size} resources, {filter_count} filters\n")
+
+    index, _ = timed("build index", lambda: TagIndex(fleet))
+    indexed_matches, indexed = timed(
+        "evaluate via index",
+        lambda: sum(len(compiled.evaluate(index)) for compiled in filters),
+    )
+    linear_matches, linear = timed(
+        "evaluate per resource",
+        lambda: sum(
+            1
+            for compiled in filters
+            for record in fleet
+            if compiled.matches(record["TagList"])
+        ),
+    )
+
+    assert indexed_matches == linear_matches
+    print(f"\n{indexed_matches} matches, index speedup: {linear / indexed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
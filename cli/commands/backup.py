@@ -1,15 +1,26 @@
-import typer
+import os
+from typing import Annotated, Any
+
 import structlog
-from typing import Annotated
-from botocore.exceptions import ClientError, NoCredentialsError
+import typer
+import yaml
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
 
-from cli.internal.utility.config import read_config
+from cli.internal.aws.accounts import (
+    DEFAULT_MAX_TARGETS,
+    AccountSessions,
+    get_accounts,
+    get_targets,
+    run_targets,
+    target_label,
+)
+from cli.internal.aws.backup import backup_resource_groups, get_client_pool_size
+from cli.internal.aws.client import client_pool
+from cli.internal.aws.discovery import get_discovery_settings
+from cli.internal.aws.journal import RunJournal, new_run_id
+from cli.internal.aws.rate_limit import get_api_settings
 from cli.internal.aws.session import create_session
-from cli.internal.aws.client import get_client
-from cli.internal.aws.resource_filtering import list_resource_by_tag
-from cli.internal.aws.backup import backup_rds_resources
-
-POLL_INTERVAL = 30  # seconds
+from cli.internal.utility.config import get_regions, read_config
 
 app = typer.Typer()
 
@@ -24,8 +35,43 @@ def backup(
     ],
     parallel: Annotated[
         int,
-        typer.Option("-p", "--parallel", help="Number of backups to run in parallel"),
+        typer.Option(
+            "-p",
+            "--parallel",
+            help="Number of backups to run in parallel across all resource groups",
+        ),
     ] = 3,
+    max_targets: Annotated[
+        int,
+        typer.Option(
+            "--max-targets",
+            help="Number of account/region targets to back up at the same time",
+        ),
+    ] = DEFAULT_MAX_TARGETS,
+    refresh: Annotated[
+        bool,
+        typer.Option("--refresh", help="Rescan resources and update the cache"),
+    ] = False,
+    no_cache: Annotated[
+        bool,
+        typer.Option("--no-cache", help="Neither read nor write the resource cache"),
+    ] = False,
+    resume: Annotated[
+        str | None,
+        typer.Option(
+            "--resume",
+            help="Continue an interrupted run: reattach to its in-flight "
+            "snapshots and skip finished ones",
+        ),
+    ] = None,
+    detach: Annotated[
+        bool,
+        typer.Option(
+            "--detach",
+            help="Start the snapshots and exit without waiting, check them "
+            "later with 'sumi status --run <id>'",
+        ),
+    ] = False,
 ):
     """Execute backup for all configured resources."""
     try:
@@ -33,13 +79,30 @@ def backup(
     except FileNotFoundError:
         logger.error(f"Config file not found: {file_path}")
         raise typer.Exit(code=1)
-    except Exception as e:
+    except (OSError, ValueError, yaml.YAMLError) as e:
         logger.error(f"Failed to read config: {e}")
         raise typer.Exit(code=1)
 
     provider = config["provider"]["name"]
     auth = config["auth"]
-    region = config["provider"]["region"]
+
+    try:
+        discovery_settings = get_discovery_settings(config)
+        api_settings = get_api_settings(config)
+    except ValueError as e:
+        logger.error(str(e))
+        raise typer.Exit(code=1)
+    discovery_settings["use_cache"] = not no_cache
+    discovery_settings["refresh_cache"] = refresh
+
+    try:
+        journal = open_journal(resume, os.path.abspath(file_path))
+    except FileNotFoundError:
+        logger.error(f"No journal found for run {resume}")
+        raise typer.Exit(code=1)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to open run journal: {e}")
+        raise typer.Exit(code=1)
 
     # Create AWS session
     try:
@@ -49,65 +112,178 @@ def backup(
             "No AWS credentials found. Configure with 'aws configure' or check your profile"
         )
         raise typer.Exit(code=1)
-    except Exception as e:
+    except (BotoCoreError, ClientError, ValueError) as e:
         logger.error(f"Failed to create AWS session: {e}")
         raise typer.Exit(code=1)
 
     match provider:
         case "aws":
             try:
-                for resource_config in config["backup"]["resources"]:
-                    service_type = resource_config["type"]
-                    resource_name = resource_config["name"]
-                    tags = resource_config["discover"]
-
-                    logger.info(
-                        f"\n=== Processing {resource_name} ({service_type}) ==="
-                    )
-                    logger.info(f"Discovering resources with: {tags}")
-
-                    try:
-                        client = get_client(service_type, session, region)
-                        resources = list_resource_by_tag(client, service_type, tags)
-                    except ClientError as e:
-                        logger.error(f"AWS API error discovering resources: {e}")
-                        continue
-                    except Exception as e:
-                        logger.error(f"Failed to discover resources: {e}")
-                        continue
-
-                    if not resources:
-                        logger.error(f"No resources found for {resource_name}")
-                        continue
-
-                    logger.info(f"Found {len(resources)} resource(s)")
-
-                    match service_type:
-                        case "rds":
-                            try:
-                                backup_rds_resources(
-                                    resources, session, region, parallel
-                                )
-                            except ClientError as e:
-                                logger.error(f"AWS API error during backup: {e}")
-                                logger.error(
-                                    "Check IAM permissions for RDS snapshot creation"
-                                )
-                            except Exception as e:
-                                logger.error(f"Backup failed: {e}")
-                        case _:
-                            logger.error(
-                                f"Resource type {service_type} is not supported yet."
-                            )
-                            continue
-
+                sessions = AccountSessions(session, config["app"])
+                # Size each client's HTTP pool for the threads sharing it and
+                # share one adaptive RDS call budget per account and region
+                client_pool.configure(
+                    get_client_pool_size(parallel, discovery_settings["tag_workers"]),
+                    api_settings["rds_rate"],
+                )
+                failed_targets = run_backup(
+                    config,
+                    sessions,
+                    discovery_settings,
+                    parallel,
+                    max_targets,
+                    journal,
+                    detach,
+                )
             except KeyError as e:
                 logger.error(f"Missing required configuration key: {e}")
                 raise typer.Exit(code=1)
-            except Exception as e:
+            except (BotoCoreError, ClientError, ValueError) as e:
                 logger.error(f"Unexpected error during backup: {e}")
                 raise typer.Exit(code=1)
 
+            pool_stats = client_pool.stats()
+            logger.info(
+                f"Created {pool_stats['misses']} AWS client(s), "
+                f"reused them {pool_stats['hits']} time(s)"
+            )
+            if detach:
+                logger.info(f"Check progress with: sumi status --run {journal.run_id}")
+            if failed_targets:
+                logger.info(f"Resume with: sumi backup --resume {journal.run_id}")
+                raise typer.Exit(code=1)
+
         case _:
             logger.error(f"Provider {provider} is not supported yet.")
             raise typer.Exit(code=1)
+
+
+def run_backup(
+    config: dict[str, Any],
+    sessions: AccountSessions,
+    discovery_settings: dict[str, Any],
+    parallel: int,
+    max_targets: int,
+    journal: RunJournal,
+    detach: bool = False,
+) -> list[str]:
+    """
+    Back up every account and region of an AWS config and report the results.
+    Runs every account and region at once, up to max_targets, each with its
+    own parallel snapshot limit shared by its groups.
+    Returns the labels of the targets that failed. Raises KeyError for
+    missing config keys and ValueError for invalid regions or accounts.
+    """
+    regions = get_regions(config)
+    accounts = get_accounts(config)
+    resource_configs = config["backup"]["resources"]
+
+    target_results = run_targets(
+        get_targets(accounts, regions),
+        sessions,
+        lambda target_session, region: backup_resource_groups(
+            resource_configs,
+            target_session,
+            region,
+            discovery_settings,
+            parallel,
+            journal,
+            detach,
+        ),
+        max_targets,
+    )
+    return report_backup_results(target_results)
+
+
+def open_journal(run_id: str | None, config_path: str) -> RunJournal:
+    """
+    Load the journal of the run to resume, or start the journal of a new run.
+    Raises FileNotFoundError for an unknown run id.
+    """
+    if run_id is not None:
+        journal = RunJournal.load(run_id)
+        logger.info(f"Resuming backup run {run_id}")
+        return journal
+
+    journal = RunJournal.create(new_run_id(), config_path)
+    logger.info(
+        f"Backup run {journal.run_id}, if interrupted continue it with "
+        f"--resume {journal.run_id}"
+    )
+    return journal
+
+
+def report_backup_results(
+    target_results: list[
+        tuple[dict[str, Any], list[dict[str, Any]] | None, Exception | None]
+    ],
+) -> list[str]:
+    """
+    Log the results of every account/region target and a consolidated summary.
+    Returns the labels of the targets that failed.
+    """
+    failed_targets = []
+    all_results: list[dict[str, Any]] = []
+
+    for target, results, error in target_results:
+        label = target_label(target)
+        if error is not None:
+            logger.error(f"Backup in {label} failed: {error}")
+            failed_targets.append(label)
+            continue
+
+        results = results or []
+        all_results.extend(results)
+        available = sum(1 for r in results if r["status"] == "available")
+        failed = sum(1 for r in results if r["status"] == "failed")
+        initiated = len(results) - available - failed
+        logger.info(
+            f"{label}: {available} snapshot(s) available, {failed} failed"
+            + (f", {initiated} started" if initiated else "")
+        )
+        for result in results:
+            share = result.get("share")
+            if share is not None and share["status"] != "shared":
+                logger.error(
+                    f"{label}: sharing {result['snapshot_id']} failed: "
+                    f"{share.get('error')}"
+                )
+            for copy in result.get("copies", []):
+                if copy["status"] != "available":
+                    logger.error(
+                        f"{label}: copy of {copy['snapshot_id']} to "
+                        f"{copy['region']} {copy['status']}: {copy.get('error')}"
+                    )
+
+    accounts = {target["account"]["name"] for target, _, _ in target_results}
+    regions = {target["region"] for target, _, _ in target_results}
+    available = sum(1 for r in all_results if r["status"] == "available")
+    initiated = sum(1 for r in all_results if r["status"] == "initiated")
+    longest = max((r["duration"] for r in all_results), default=0)
+    if initiated:
+        logger.info(
+            f"Backup detached: {initiated} snapshot(s) started, "
+            f"{available} already available, across {len(accounts)} account(s) "
+            f"and {len(regions)} region(s), {len(failed_targets)} target(s) failed"
+        )
+        return failed_targets
+    logger.info(
+        f"Backup finished: {available}/{len(all_results)} snapshot(s) available "
+        f"across {len(accounts)} account(s) and {len(regions)} region(s), "
+        f"{len(failed_targets)} target(s) failed, longest took {longest:.0f}s"
+    )
+    copies = [copy for r in all_results for copy in r.get("copies", [])]
+    if copies:
+        copied = sum(1 for copy in copies if copy["status"] == "available")
+        logger.info(f"Copies: {copied}/{len(copies)} available in their regions")
+    shares = [r["share"] for r in all_results if "share" in r]
+    if shares:
+        shared = [share for share in shares if share["status"] == "shared"]
+        # The slowest share bounds how much data the receiving accounts can lose
+        slowest = max((share["latency"] for share in shared), default=0)
+        logger.info(
+            f"Shares: {len(shared)}/{len(shares)} shared, "
+            f"slowest {slowest:.0f}s after its snapshot started"
+        )
+
+    return failed_targets
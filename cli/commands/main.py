@@ -1,12 +1,21 @@
 import typer
+
 from cli.commands.backup import app as backup_command
 from cli.commands.plan import app as plan_command
+from cli.commands.prune import app as prune_command
+from cli.commands.restore import app as restore_command
+from cli.commands.serve import app as serve_command
+from cli.commands.status import app as status_command
 from cli.commands.validate import app as validate_command
 
 app = typer.Typer()
 
 app.add_typer(backup_command)
 app.add_typer(plan_command)
+app.add_typer(prune_command)
+app.add_typer(restore_command)
+app.add_typer(serve_command)
+app.add_typer(status_command)
 app.add_typer(validate_command)
 
 if __name__ == "__main__":
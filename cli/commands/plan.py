@@ -1,11 +1,17 @@
+from typing import Annotated
+
+import structlog
 import typer
-from typing_extensions import Annotated
-from botocore.exceptions import ClientError, NoCredentialsError
+import yaml
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
 
-from cli.internal.utility.config import read_config
+from cli.internal.aws.accounts import DEFAULT_MAX_TARGETS
+from cli.internal.aws.client import client_pool
+from cli.internal.aws.discovery import get_discovery_settings
 from cli.internal.aws.plan import aws_plan
+from cli.internal.aws.rate_limit import get_api_settings
 from cli.internal.aws.session import create_session
-import structlog
+from cli.internal.utility.config import read_config
 
 app = typer.Typer()
 logger = structlog.get_logger()
@@ -17,6 +23,21 @@ def plan(
         str,
         typer.Option("-c", "--config", help="Config file used for defining resources"),
     ],
+    max_targets: Annotated[
+        int,
+        typer.Option(
+            "--max-targets",
+            help="Number of account/region targets to discover at the same time",
+        ),
+    ] = DEFAULT_MAX_TARGETS,
+    refresh: Annotated[
+        bool,
+        typer.Option("--refresh", help="Rescan resources and update the cache"),
+    ] = False,
+    no_cache: Annotated[
+        bool,
+        typer.Option("--no-cache", help="Neither read nor write the resource cache"),
+    ] = False,
 ):
     """Speculatively show a plan of all the resources that will be backed up."""
     try:
@@ -24,13 +45,22 @@ def plan(
     except FileNotFoundError:
         logger.error(f"Config file not found: {file_path}")
         raise typer.Exit(code=1)
-    except Exception as e:
+    except (OSError, ValueError, yaml.YAMLError) as e:
         logger.error(f"Failed to read config: {e}")
         raise typer.Exit(code=1)
 
     provider = config["provider"]["name"]
     auth = config["auth"]
 
+    try:
+        discovery_settings = get_discovery_settings(config)
+        api_settings = get_api_settings(config)
+    except ValueError as e:
+        logger.error(str(e))
+        raise typer.Exit(code=1)
+    discovery_settings["use_cache"] = not no_cache
+    discovery_settings["refresh_cache"] = refresh
+
     try:
         session = create_session(auth)
     except NoCredentialsError:
@@ -38,14 +68,19 @@ def plan(
             "No AWS credentials found. Configure with 'aws configure' or check your profile"
         )
         raise typer.Exit(code=1)
-    except Exception as e:
+    except (BotoCoreError, ClientError, ValueError) as e:
         logger.error(f"Failed to create AWS session: {e}")
         raise typer.Exit(code=1)
 
+    # Share each account and region's RDS call budget across discovery threads
+    client_pool.configure(rds_rate=api_settings["rds_rate"])
+
     match provider:
         case "aws":
             try:
-                aws_plan(config, session)
+                failed_targets = aws_plan(
+                    config, session, discovery_settings, max_targets
+                )
             except ClientError as e:
                 logger.error(f"AWS API error: {e}")
                 logger.error("Check your IAM permissions for RDS describe operations")
@@ -53,9 +88,12 @@ def plan(
             except KeyError as e:
                 logger.error(f"Missing required configuration key: {e}")
                 raise typer.Exit(code=1)
-            except Exception as e:
+            except (BotoCoreError, ValueError) as e:
                 logger.error(f"Unexpected error during plan: {e}")
                 raise typer.Exit(code=1)
+
+            if failed_targets:
+                raise typer.Exit(code=1)
         case _:
             logger.error(f"Provider {provider} is not supported yet.")
             raise typer.Exit(code=1)
@@ -0,0 +1,174 @@
+from typing import Annotated, Any
+
+import structlog
+import typer
+import yaml
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
+
+from cli.internal.aws.accounts import (
+    DEFAULT_MAX_TARGETS,
+    AccountSessions,
+    get_accounts,
+    get_targets,
+    run_targets,
+    target_label,
+)
+from cli.internal.aws.backup import get_client_pool_size
+from cli.internal.aws.client import client_pool
+from cli.internal.aws.discovery import get_discovery_settings
+from cli.internal.aws.pruning import DEFAULT_PRUNE_PARALLEL, prune_resource_groups
+from cli.internal.aws.rate_limit import get_api_settings
+from cli.internal.aws.session import create_session
+from cli.internal.utility.config import get_regions, read_config
+
+app = typer.Typer()
+
+logger = structlog.get_logger()
+
+
+@app.command()
+def prune(
+    file_path: Annotated[
+        str,
+        typer.Option("-c", "--config", help="Config file used for defining resources"),
+    ],
+    dry_run: Annotated[
+        bool,
+        typer.Option("--dry-run", help="Show the snapshots that would be deleted"),
+    ] = False,
+    parallel: Annotated[
+        int,
+        typer.Option(
+            "-p",
+            "--parallel",
+            help="Number of snapshots to delete in parallel per account and region",
+        ),
+    ] = DEFAULT_PRUNE_PARALLEL,
+    max_targets: Annotated[
+        int,
+        typer.Option(
+            "--max-targets",
+            help="Number of account/region targets to prune at the same time",
+        ),
+    ] = DEFAULT_MAX_TARGETS,
+    refresh: Annotated[
+        bool,
+        typer.Option("--refresh", help="Rescan resources and update the cache"),
+    ] = False,
+    no_cache: Annotated[
+        bool,
+        typer.Option("--no-cache", help="Neither read nor write the resource cache"),
+    ] = False,
+):
+    """Delete snapshots the retention policies of their groups no longer keep."""
+    try:
+        config = read_config(file_path)
+    except FileNotFoundError:
+        logger.error(f"Config file not found: {file_path}")
+        raise typer.Exit(code=1)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        logger.error(f"Failed to read config: {e}")
+        raise typer.Exit(code=1)
+
+    try:
+        discovery_settings = get_discovery_settings(config)
+        api_settings = get_api_settings(config)
+    except ValueError as e:
+        logger.error(str(e))
+        raise typer.Exit(code=1)
+    discovery_settings["use_cache"] = not no_cache
+    discovery_settings["refresh_cache"] = refresh
+
+    try:
+        session = create_session(config["auth"])
+    except NoCredentialsError:
+        logger.error(
+            "No AWS credentials found. Configure with 'aws configure' or check your profile"
+        )
+        raise typer.Exit(code=1)
+    except (BotoCoreError, ClientError, ValueError) as e:
+        logger.error(f"Failed to create AWS session: {e}")
+        raise typer.Exit(code=1)
+
+    match config["provider"]["name"]:
+        case "aws":
+            try:
+                regions = get_regions(config)
+                accounts = get_accounts(config)
+                resource_configs = config["backup"]["resources"]
+                sessions = AccountSessions(session, config["app"])
+                # Deletes share each account and region's RDS call budget
+                client_pool.configure(
+                    get_client_pool_size(parallel, discovery_settings["tag_workers"]),
+                    api_settings["rds_rate"],
+                )
+                target_results = run_targets(
+                    get_targets(accounts, regions),
+                    sessions,
+                    lambda target_session, region: prune_resource_groups(
+                        resource_configs,
+                        target_session,
+                        region,
+                        discovery_settings,
+                        parallel,
+                        dry_run,
+                    ),
+                    max_targets,
+                )
+            except KeyError as e:
+                logger.error(f"Missing required configuration key: {e}")
+                raise typer.Exit(code=1)
+            except (BotoCoreError, ClientError, ValueError) as e:
+                logger.error(f"Unexpected error during prune: {e}")
+                raise typer.Exit(code=1)
+
+            if report_prune_results(target_results, dry_run):
+                raise typer.Exit(code=1)
+
+        case provider:
+            logger.error(f"Provider {provider} is not supported yet.")
+            raise typer.Exit(code=1)
+
+
+def report_prune_results(
+    target_results: list[
+        tuple[dict[str, Any], dict[str, Any] | None, Exception | None]
+    ],
+    dry_run: bool = False,
+) -> bool:
+    """
+    Log the pruned snapshots of every account/region target and a summary.
+    Returns whether any target or delete failed.
+    """
+    failed = False
+    counts = {"deleted": 0, "failed": 0, "expired": 0, "kept": 0}
+
+    for target, result, error in target_results:
+        label = target_label(target)
+        if error is not None:
+            logger.error(f"Pruning {label} failed: {error}")
+            failed = True
+            continue
+
+        result = result or {"snapshots": [], "kept": 0}
+        counts["kept"] += result["kept"]
+        for snapshot in result["snapshots"]:
+            counts[snapshot["status"]] += 1
+            if snapshot["status"] == "failed":
+                failed = True
+        logger.info(
+            f"{label}: {len(result['snapshots'])} snapshot(s) expired, "
+            f"{result['kept']} kept"
+        )
+
+    if dry_run:
+        logger.info(
+            f"Dry run: {counts['expired']} snapshot(s) would be deleted, "
+            f"{counts['kept']} kept"
+        )
+    else:
+        logger.info(
+            f"Prune finished: {counts['deleted']} snapshot(s) deleted, "
+            f"{counts['failed']} failed, {counts['kept']} kept"
+        )
+    return failed
@@ -0,0 +1,259 @@
+from typing import Annotated, Any
+
+import structlog
+import typer
+import yaml
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
+
+from cli.internal.aws.accounts import (
+    DEFAULT_MAX_TARGETS,
+    AccountSessions,
+    get_accounts,
+    get_targets,
+    run_targets,
+    target_label,
+)
+from cli.internal.aws.backup import get_client_pool_size
+from cli.internal.aws.client import client_pool
+from cli.internal.aws.discovery import get_discovery_settings
+from cli.internal.aws.journal import RunJournal
+from cli.internal.aws.rate_limit import get_api_settings
+from cli.internal.aws.restore import (
+    DEFAULT_INSTANCE_CLASS,
+    DEFAULT_RESTORE_PARALLEL,
+    DEFAULT_RESTORE_SUFFIX,
+    get_group_clusters,
+    get_latest_restore_points,
+    get_run_restore_points,
+    restore_clusters,
+)
+from cli.internal.aws.session import create_session
+from cli.internal.utility.config import get_regions, read_config
+
+app = typer.Typer()
+
+logger = structlog.get_logger()
+
+
+@app.command()
+def restore(
+    file_path: Annotated[
+        str | None,
+        typer.Option(
+            "-c",
+            "--config",
+            help="Config file, defaults to the one the --run was started with",
+        ),
+    ] = None,
+    run_id: Annotated[
+        str | None,
+        typer.Option(
+            "--run",
+            help="Restore the snapshots of this backup run instead of the latest ones",
+        ),
+    ] = None,
+    clusters: Annotated[
+        list[str] | None,
+        typer.Option("--cluster", help="Only restore this cluster, repeatable"),
+    ] = None,
+    suffix: Annotated[
+        str,
+        typer.Option("--suffix", help="Appended to a cluster's id to name its restore"),
+    ] = DEFAULT_RESTORE_SUFFIX,
+    instance_class: Annotated[
+        str,
+        typer.Option("--instance-class", help="Class of each restored writer instance"),
+    ] = DEFAULT_INSTANCE_CLASS,
+    db_subnet_group: Annotated[
+        str | None,
+        typer.Option("--db-subnet-group", help="Subnet group of the restored clusters"),
+    ] = None,
+    security_groups: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--security-group",
+            help="VPC security group of the restored clusters, repeatable",
+        ),
+    ] = None,
+    parallel: Annotated[
+        int,
+        typer.Option(
+            "-p",
+            "--parallel",
+            help="Number of restores in flight per account and region",
+        ),
+    ] = DEFAULT_RESTORE_PARALLEL,
+    max_targets: Annotated[
+        int,
+        typer.Option(
+            "--max-targets",
+            help="Number of account/region targets to restore at the same time",
+        ),
+    ] = DEFAULT_MAX_TARGETS,
+    dry_run: Annotated[
+        bool,
+        typer.Option("--dry-run", help="Show the restore points without restoring"),
+    ] = False,
+):
+    """Restore clusters from their latest snapshots or those of a backup run."""
+    journal = None
+    if run_id is not None:
+        try:
+            journal = RunJournal.load(run_id)
+        except FileNotFoundError:
+            logger.error(f"No journal found for run {run_id}")
+            raise typer.Exit(code=1)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to read run journal: {e}")
+            raise typer.Exit(code=1)
+        file_path = file_path or journal.config_path
+
+    if file_path is None:
+        logger.error("Pass --config, or --run of a run that records its config")
+        raise typer.Exit(code=1)
+
+    try:
+        config = read_config(file_path)
+    except FileNotFoundError:
+        logger.error(f"Config file not found: {file_path}")
+        raise typer.Exit(code=1)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        logger.error(f"Failed to read config: {e}")
+        raise typer.Exit(code=1)
+
+    try:
+        discovery_settings = get_discovery_settings(config)
+        api_settings = get_api_settings(config)
+    except ValueError as e:
+        logger.error(str(e))
+        raise typer.Exit(code=1)
+
+    try:
+        session = create_session(config["auth"])
+    except NoCredentialsError:
+        logger.error(
+            "No AWS credentials found. Configure with 'aws configure' or check your profile"
+        )
+        raise typer.Exit(code=1)
+    except (BotoCoreError, ClientError, ValueError) as e:
+        logger.error(f"Failed to create AWS session: {e}")
+        raise typer.Exit(code=1)
+
+    options = {
+        "suffix": suffix,
+        "instance_class": instance_class,
+        "db_subnet_group": db_subnet_group,
+        "security_groups": security_groups or [],
+    }
+
+    def restore_target(target_session: Any, region: str) -> list[dict[str, Any]]:
+        if journal is not None:
+            points = get_run_restore_points(journal, target_session, region)
+            if clusters:
+                points = [p for p in points if p["cluster"] in clusters]
+        else:
+            # Only clusters the config's resource groups discover are restored
+            group_clusters = get_group_clusters(
+                config["backup"]["resources"],
+                target_session,
+                region,
+                discovery_settings,
+            )
+            for cluster_id in clusters or []:
+                if cluster_id not in group_clusters:
+                    logger.warning(f"{cluster_id} is in no resource group, skipping")
+            if clusters:
+                group_clusters = {
+                    cluster_id: group
+                    for cluster_id, group in group_clusters.items()
+                    if cluster_id in clusters
+                }
+            points = get_latest_restore_points(target_session, region, group_clusters)
+
+        if dry_run:
+            for point in points:
+                logger.info(
+                    f"Would restore {point['cluster']}{suffix} from "
+                    f"{point['snapshot_id']}"
+                )
+            return [{**point, "status": "planned"} for point in points]
+        return restore_clusters(points, options, target_session, region, parallel)
+
+    match config["provider"]["name"]:
+        case "aws":
+            try:
+                regions = get_regions(config)
+                accounts = get_accounts(config)
+                sessions = AccountSessions(session, config["app"])
+                client_pool.configure(
+                    get_client_pool_size(parallel, discovery_settings["tag_workers"]),
+                    api_settings["rds_rate"],
+                )
+                target_results = run_targets(
+                    get_targets(accounts, regions),
+                    sessions,
+                    restore_target,
+                    max_targets,
+                )
+            except KeyError as e:
+                logger.error(f"Missing required configuration key: {e}")
+                raise typer.Exit(code=1)
+            except (BotoCoreError, ClientError, ValueError) as e:
+                logger.error(f"Unexpected error during restore: {e}")
+                raise typer.Exit(code=1)
+
+            if report_restore_results(target_results, dry_run):
+                raise typer.Exit(code=1)
+
+        case provider:
+            logger.error(f"Provider {provider} is not supported yet.")
+            raise typer.Exit(code=1)
+
+
+def report_restore_results(
+    target_results: list[
+        tuple[dict[str, Any], list[dict[str, Any]] | None, Exception | None]
+    ],
+    dry_run: bool = False,
+) -> bool:
+    """
+    Log every restore with its time-to-available and a fleet summary. Targets
+    restore concurrently, so the fleet is available after its slowest restore.
+    Returns whether any target or restore failed.
+    """
+    failed = False
+    all_results: list[dict[str, Any]] = []
+
+    for target, results, error in target_results:
+        label = target_label(target)
+        if error is not None:
+            logger.error(f"Restore in {label} failed: {error}")
+            failed = True
+            continue
+
+        for result in results or []:
+            all_results.append(result)
+            if dry_run:
+                continue
+            line = f"{label} {result['target']}: {result['status']}"
+            if result["status"] == "available":
+                logger.info(
+                    f"{line}, available after {result['available_after']:.0f}s "
+                    f"(restore took {result['duration']:.0f}s)"
+                )
+            else:
+                failed = True
+                logger.error(f"{line} {result.get('error', '')}".rstrip())
+
+    if dry_run:
+        logger.info(f"Dry run: {len(all_results)} cluster(s) would be restored")
+        return failed
+
+    available = [r for r in all_results if r["status"] == "available"]
+    slowest = max((r["available_after"] for r in available), default=0)
+    logger.info(
+        f"Restore finished: {len(available)}/{len(all_results)} cluster(s) "
+        f"available, {len(target_results)} target(s), fleet available after "
+        f"{slowest:.0f}s"
+    )
+    return failed
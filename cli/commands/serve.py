@@ -0,0 +1,159 @@
+import json
+import os
+import signal
+import threading
+from typing import Annotated, Any
+
+import structlog
+import typer
+import yaml
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
+
+from cli.commands.backup import run_backup
+from cli.internal.aws.accounts import DEFAULT_MAX_TARGETS, AccountSessions
+from cli.internal.aws.backup import get_client_pool_size
+from cli.internal.aws.client import client_pool
+from cli.internal.aws.discovery import get_discovery_settings
+from cli.internal.aws.journal import RunJournal, new_run_id
+from cli.internal.aws.rate_limit import get_api_settings
+from cli.internal.aws.session import create_session
+from cli.internal.utility.config import get_schedule, read_config
+from cli.internal.utility.daemon import CronRunner
+
+app = typer.Typer()
+
+logger = structlog.get_logger()
+
+
+@app.command()
+def serve(
+    file_paths: Annotated[
+        list[str],
+        typer.Option(
+            "-c",
+            "--config",
+            help="Config file with a schedule, repeat for several configs",
+        ),
+    ],
+    parallel: Annotated[
+        int,
+        typer.Option(
+            "-p",
+            "--parallel",
+            help="Number of backups to run in parallel within each run",
+        ),
+    ] = 3,
+    max_targets: Annotated[
+        int,
+        typer.Option(
+            "--max-targets",
+            help="Number of account/region targets each run backs up at once",
+        ),
+    ] = DEFAULT_MAX_TARGETS,
+):
+    """Run backups of one or more configs on their cron schedules."""
+    jobs = []
+    for file_path in file_paths:
+        try:
+            jobs.append(load_job(file_path))
+        except FileNotFoundError:
+            logger.error(f"Config file not found: {file_path}")
+            raise typer.Exit(code=1)
+        except (KeyError, ValueError) as e:
+            logger.error(f"Invalid config {file_path}: {e}")
+            raise typer.Exit(code=1)
+        except (OSError, yaml.YAMLError) as e:
+            logger.error(f"Failed to read config {file_path}: {e}")
+            raise typer.Exit(code=1)
+
+    try:
+        sessions = get_job_sessions(jobs)
+    except NoCredentialsError:
+        logger.error(
+            "No AWS credentials found. Configure with 'aws configure' or check your profile"
+        )
+        raise typer.Exit(code=1)
+    except (BotoCoreError, ClientError, ValueError) as e:
+        logger.error(f"Failed to create AWS session: {e}")
+        raise typer.Exit(code=1)
+
+    # Runs of different configs may overlap and share clients, so size pools
+    # for all of them, and share the strictest RDS call budget between them
+    client_pool.configure(
+        sum(
+            get_client_pool_size(parallel, job["discovery_settings"]["tag_workers"])
+            for job in jobs
+        ),
+        min(job["api_settings"]["rds_rate"] for job in jobs),
+    )
+
+    def run_job(job: dict[str, Any]) -> None:
+        job_sessions = sessions[job["auth_key"]]
+        # A role that failed to assume last run may work again now
+        job_sessions.clear_errors()
+        journal = RunJournal.create(new_run_id(), job["name"])
+        logger.info(f"Backup run {journal.run_id} of {job['name']}")
+        failed_targets = run_backup(
+            job["config"],
+            job_sessions,
+            job["discovery_settings"],
+            parallel,
+            max_targets,
+            journal,
+        )
+        if failed_targets:
+            logger.error(
+                f"Run {journal.run_id} of {job['name']} failed for "
+                f"{len(failed_targets)} target(s), resume with "
+                f"sumi backup --resume {journal.run_id}"
+            )
+
+    runner = CronRunner(jobs, run_job)
+    for job in jobs:
+        logger.info(f"Scheduled {job['name']}: {job['schedule'].expression}")
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    try:
+        runner.serve(stop)
+    except KeyboardInterrupt:
+        logger.info("Interrupted, stopped after the running backups")
+    logger.info(f"Stopped after {runner.runs} run(s), {runner.skipped} skipped")
+
+
+def load_job(file_path: str) -> dict[str, Any]:
+    """
+    Read and check a config for serve and return its job.
+    Raises ValueError if it has no valid schedule or is not an AWS config.
+    """
+    config = read_config(file_path)
+    schedule = get_schedule(config)
+    if schedule is None:
+        raise ValueError("schedule is required to serve a config")
+    if config["provider"]["name"] != "aws":
+        raise ValueError(f"Provider {config['provider']['name']} is not supported yet")
+
+    discovery_settings = get_discovery_settings(config)
+    return {
+        "name": os.path.abspath(file_path),
+        "schedule": schedule,
+        "config": config,
+        "auth_key": json.dumps(config["auth"], sort_keys=True),
+        "discovery_settings": discovery_settings,
+        "api_settings": get_api_settings(config),
+    }
+
+
+def get_job_sessions(jobs: list[dict[str, Any]]) -> dict[str, AccountSessions]:
+    """
+    Create one session per distinct auth block, kept for the daemon's whole
+    life, so configs with the same credentials share their assumed roles,
+    clients and RDS rate limits.
+    """
+    sessions: dict[str, AccountSessions] = {}
+    for job in jobs:
+        if job["auth_key"] not in sessions:
+            sessions[job["auth_key"]] = AccountSessions(
+                create_session(job["config"]["auth"]), job["config"]["app"]
+            )
+    return sessions
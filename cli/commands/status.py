@@ -0,0 +1,159 @@
+from typing import Annotated, Any
+
+import structlog
+import typer
+import yaml
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
+
+from cli.internal.aws.accounts import (
+    DEFAULT_MAX_TARGETS,
+    AccountSessions,
+    get_accounts,
+    get_targets,
+    run_targets,
+    target_label,
+)
+from cli.internal.aws.client import client_pool
+from cli.internal.aws.journal import RunJournal
+from cli.internal.aws.rate_limit import get_api_settings
+from cli.internal.aws.session import create_session
+from cli.internal.aws.status import check_run_target
+from cli.internal.utility.config import get_regions, read_config
+
+app = typer.Typer()
+
+logger = structlog.get_logger()
+
+
+@app.command()
+def status(
+    run_id: Annotated[
+        str,
+        typer.Option("--run", help="Id of the backup run to check"),
+    ],
+    file_path: Annotated[
+        str | None,
+        typer.Option(
+            "-c",
+            "--config",
+            help="Config file of the run, defaults to the one it was started with",
+        ),
+    ] = None,
+    wait: Annotated[
+        bool,
+        typer.Option("--wait", help="Wait until every snapshot of the run finished"),
+    ] = False,
+    max_targets: Annotated[
+        int,
+        typer.Option(
+            "--max-targets",
+            help="Number of account/region targets to check at the same time",
+        ),
+    ] = DEFAULT_MAX_TARGETS,
+):
+    """Check the snapshots of a backup run, e.g. one started with --detach."""
+    try:
+        journal = RunJournal.load(run_id)
+    except FileNotFoundError:
+        logger.error(f"No journal found for run {run_id}")
+        raise typer.Exit(code=1)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to read run journal: {e}")
+        raise typer.Exit(code=1)
+
+    file_path = file_path or journal.config_path
+    if file_path is None:
+        logger.error(f"Run {run_id} does not record its config, pass --config")
+        raise typer.Exit(code=1)
+
+    try:
+        config = read_config(file_path)
+    except FileNotFoundError:
+        logger.error(f"Config file not found: {file_path}")
+        raise typer.Exit(code=1)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        logger.error(f"Failed to read config: {e}")
+        raise typer.Exit(code=1)
+
+    try:
+        api_settings = get_api_settings(config)
+    except ValueError as e:
+        logger.error(str(e))
+        raise typer.Exit(code=1)
+
+    try:
+        session = create_session(config["auth"])
+    except NoCredentialsError:
+        logger.error(
+            "No AWS credentials found. Configure with 'aws configure' or check your profile"
+        )
+        raise typer.Exit(code=1)
+    except (BotoCoreError, ClientError, ValueError) as e:
+        logger.error(f"Failed to create AWS session: {e}")
+        raise typer.Exit(code=1)
+
+    match config["provider"]["name"]:
+        case "aws":
+            try:
+                regions = get_regions(config)
+                accounts = get_accounts(config)
+                sessions = AccountSessions(session, config["app"])
+                client_pool.configure(rds_rate=api_settings["rds_rate"])
+                target_results = run_targets(
+                    get_targets(accounts, regions),
+                    sessions,
+                    lambda target_session, region: check_run_target(
+                        journal, target_session, region, wait
+                    ),
+                    max_targets,
+                )
+            except KeyError as e:
+                logger.error(f"Missing required configuration key: {e}")
+                raise typer.Exit(code=1)
+            except (BotoCoreError, ClientError, ValueError) as e:
+                logger.error(f"Unexpected error checking run {run_id}: {e}")
+                raise typer.Exit(code=1)
+
+            if report_run_status(run_id, target_results):
+                raise typer.Exit(code=1)
+
+        case provider:
+            logger.error(f"Provider {provider} is not supported yet.")
+            raise typer.Exit(code=1)
+
+
+def report_run_status(
+    run_id: str,
+    target_results: list[
+        tuple[dict[str, Any], list[dict[str, Any]] | None, Exception | None]
+    ],
+) -> bool:
+    """
+    Log every snapshot of a run and a summary by status.
+    Returns whether any snapshot or target failed.
+    """
+    failed = False
+    counts: dict[str, int] = {}
+
+    for target, results, error in target_results:
+        label = target_label(target)
+        if error is not None:
+            logger.error(f"Checking {label} failed: {error}")
+            failed = True
+            continue
+
+        for result in results or []:
+            status = result["status"]
+            counts[status] = counts.get(status, 0) + 1
+            line = f"{label} {result['group']}/{result['cluster']}: {status}"
+            if status not in ["available", "failed", "missing"]:
+                line += f" ({result['progress']}%)"
+            if status in ["failed", "missing"]:
+                failed = True
+                logger.error(f"{line} {result['snapshot_id']}")
+            else:
+                logger.info(f"{line} {result['snapshot_id']}")
+
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    logger.info(f"Run {run_id}: {summary or 'no snapshots started'}")
+    return failed
@@ -1,9 +1,25 @@
-import typer
-import structlog
 from typing import Annotated
-from botocore.exceptions import ClientError, NoCredentialsError, ProfileNotFound
-from cli.internal.utility.config import read_config
+
+import structlog
+import typer
+import yaml
+from botocore.exceptions import (
+    BotoCoreError,
+    ClientError,
+    NoCredentialsError,
+    ProfileNotFound,
+)
+
+from cli.internal.aws.accounts import get_accounts
+from cli.internal.aws.copying import get_copy_destinations
+from cli.internal.aws.discovery import get_discovery_settings
+from cli.internal.aws.pruning import get_retention_policy
+from cli.internal.aws.rate_limit import get_api_settings
+from cli.internal.aws.scheduling import get_group_schedule
 from cli.internal.aws.session import create_session
+from cli.internal.aws.sharing import get_share_accounts
+from cli.internal.aws.tag_filter import TagFilterError, compile_tag_filter
+from cli.internal.utility.config import get_regions, get_schedule, read_config
 
 app = typer.Typer()
 
@@ -26,7 +42,7 @@ def validate(
     except FileNotFoundError:
         logger.error(f"Config file not found: {file_path}")
         raise typer.Exit(code=1)
-    except Exception as e:
+    except (OSError, ValueError, yaml.YAMLError) as e:
         logger.error(f"Failed to read config: {e}")
         raise typer.Exit(code=1)
 
@@ -51,6 +67,12 @@ def validate(
         logger.error("Region key is required")
         raise typer.Exit(code=1)
 
+    try:
+        get_regions(config)
+    except ValueError as e:
+        logger.error(str(e))
+        raise typer.Exit(code=1)
+
     if backup is None:
         logger.error("Backup configuration is required")
         raise typer.Exit(code=1)
@@ -79,6 +101,30 @@ def validate(
             logger.error(f"Resource {idx}: discover is required")
             raise typer.Exit(code=1)
 
+        try:
+            compile_tag_filter(resource["discover"])
+        except TagFilterError as e:
+            logger.error(f"Resource {idx}: invalid discover filter: {e}")
+            raise typer.Exit(code=1)
+
+        try:
+            get_group_schedule(resource)
+            get_copy_destinations(resource)
+            get_share_accounts(resource)
+            get_retention_policy(resource)
+        except ValueError as e:
+            logger.error(str(e))
+            raise typer.Exit(code=1)
+
+    try:
+        get_discovery_settings(config)
+        get_api_settings(config)
+        get_accounts(config)
+        get_schedule(config)
+    except ValueError as e:
+        logger.error(str(e))
+        raise typer.Exit(code=1)
+
     logger.info("✓ Configuration structure is valid")
 
     # Optionally validate authentication
@@ -132,7 +178,7 @@ def validate_profile(auth: dict):
     except ClientError as e:
         logger.error(f"AWS API error: {e}")
         raise typer.Exit(code=1)
-    except Exception as e:
+    except BotoCoreError as e:
         logger.error(f"Unexpected error validating profile: {e}")
         raise typer.Exit(code=1)
 
@@ -155,6 +201,6 @@ def validate_role_arn(auth: dict):
         else:
             logger.error(f"Failed to assume role: {e}")
         raise typer.Exit(code=1)
-    except Exception as e:
+    except BotoCoreError as e:
         logger.error(f"Unexpected error validating role: {e}")
         raise typer.Exit(code=1)
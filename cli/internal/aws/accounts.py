@@ -0,0 +1,148 @@
+import threading
+from collections.abc import Callable
+from typing import Any
+
+import boto3
+import structlog
+
+from .fanout import run_concurrently
+from .session import create_session_with_profile, create_session_with_role
+
+logger = structlog.get_logger()
+
+# Default number of (account, region) targets worked on at the same time
+DEFAULT_MAX_TARGETS = 16
+
+
+def get_accounts(config: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Return the accounts to operate in from the optional `accounts` list.
+    Each entry needs a role_arn or a profile and may have a name; the name
+    defaults to the account ID of the role ARN, or to the profile.
+    Without the list, returns a single unnamed account (name None) that uses
+    the top-level auth session.
+    Raises ValueError for malformed entries or duplicate names.
+    """
+    accounts = config.get("accounts")
+    if accounts is None:
+        return [{"name": None}]
+
+    if not isinstance(accounts, list) or not accounts:
+        raise ValueError("accounts must be a non-empty list")
+
+    parsed = []
+    names = set()
+    for idx, account in enumerate(accounts):
+        if not isinstance(account, dict) or not (
+            account.get("role_arn") or account.get("profile")
+        ):
+            raise ValueError(f"accounts[{idx}]: role_arn or profile is required")
+
+        if account.get("role_arn"):
+            # arn:aws:iam::<account-id>:role/<name>
+            default_name = account["role_arn"].split(":")[4] or account["role_arn"]
+        else:
+            default_name = account["profile"]
+        name = str(account.get("name") or default_name)
+
+        if name in names:
+            raise ValueError(f"accounts[{idx}]: duplicate account name '{name}'")
+        names.add(name)
+        parsed.append({**account, "name": name})
+
+    return parsed
+
+
+class AccountSessions:
+    """
+    Creates one session per account on first use and reuses it afterwards.
+    Roles are assumed with the source session's credentials. Every account
+    has its own lock, so a slow AssumeRole only holds up that account's
+    targets; a failed assumption is remembered and raised again for them.
+    """
+
+    def __init__(self, source_session: boto3.Session, app_name: str) -> None:
+        self.source_session = source_session
+        self.app_name = app_name
+        self._sessions: dict[str, boto3.Session] = {}
+        self._errors: dict[str, Exception] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, account: dict[str, Any]) -> boto3.Session:
+        """Return the session of the account, creating it if needed."""
+        name = account["name"]
+        if name is None:
+            return self.source_session
+
+        with self._lock:
+            account_lock = self._locks.setdefault(name, threading.Lock())
+
+        with account_lock:
+            if name in self._errors:
+                raise self._errors[name]
+            if name not in self._sessions:
+                try:
+                    self._sessions[name] = self._create(account)
+                except Exception as e:
+                    self._errors[name] = e
+                    raise
+            return self._sessions[name]
+
+    def clear_errors(self) -> None:
+        """Forget failed role assumptions, so the next get() tries again."""
+        with self._lock:
+            self._errors.clear()
+
+    def _create(self, account: dict[str, Any]) -> boto3.Session:
+        if account.get("role_arn"):
+            logger.info(f"Assuming role {account['role_arn']}")
+            return create_session_with_role(
+                {"app": self.app_name, "role_arn": account["role_arn"]},
+                self.source_session,
+            )
+        return create_session_with_profile(account)
+
+
+def get_targets(
+    accounts: list[dict[str, Any]], regions: list[str]
+) -> list[dict[str, Any]]:
+    """Return one target per account and region, grouped by account."""
+    return [
+        {"account": account, "region": region}
+        for account in accounts
+        for region in regions
+    ]
+
+
+def target_label(target: dict[str, Any]) -> str:
+    """Return "account/region" for a target, or just the region without accounts."""
+    name = target["account"]["name"]
+    return target["region"] if name is None else f"{name}/{target['region']}"
+
+
+def target_context(target: dict[str, Any]) -> dict[str, Any]:
+    """Return the log fields identifying a target."""
+    name = target["account"]["name"]
+    fields = {"region": target["region"]}
+    return fields if name is None else {"account": name, **fields}
+
+
+def run_targets[R](
+    targets: list[dict[str, Any]],
+    sessions: AccountSessions,
+    func: Callable[[boto3.Session, str], R],
+    max_targets: int = DEFAULT_MAX_TARGETS,
+) -> list[tuple[dict[str, Any], R | None, Exception | None]]:
+    """
+    Call func(session, region) for every target, at most max_targets at once.
+    The account session is resolved inside the worker, so role assumption runs
+    concurrently too. Returns (target, result, error) tuples in target order;
+    an account whose role cannot be assumed fails only its own targets.
+    """
+    return run_concurrently(
+        targets,
+        lambda target: func(sessions.get(target["account"]), target["region"]),
+        max_workers=max_targets,
+        context=target_context,
+    )
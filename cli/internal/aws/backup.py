@@ -1,61 +1,771 @@
-import structlog
-import boto3
+import asyncio
 import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
-from .snapshotting import initiate_snapshot, check_snapshot_status
 
-POLL_INTERVAL = 30  # seconds
+import boto3
+import structlog
+from botocore.exceptions import BotoCoreError, ClientError
+
+from .client import client_pool
+from .copying import copy_lifecycle, get_copy_destinations
+from .discovery import stream_resource_groups
+from .durations import (
+    DurationEstimator,
+    get_history_cache_name,
+    load_duration_history,
+    save_duration_history,
+)
+from .freshness import FreshnessPolicy, load_freshness_policy
+from .journal import RunJournal
+from .resource_filtering import DESCRIBE_OPERATIONS
+from .scheduling import DEFAULT_PRIORITY, SnapshotScheduler, get_group_schedule
+from .sharing import SHARE_WORKERS, get_share_accounts, share_lifecycle
+from .snapshotting import describe_cluster_snapshots, initiate_snapshot
+from .throttling import is_capacity_error
+
+# Bounds of the delay between two status checks of one snapshot
+MIN_POLL_INTERVAL = 5  # seconds
+MAX_POLL_INTERVAL = 60  # seconds
+
+# Upper bound on threads running blocking boto3 calls for one snapshot engine
+ENGINE_WORKERS = 16
+
+# Creates RDS refuses for capacity are retried after a delay doubled each time
+CREATE_RETRY_DELAY = 30  # seconds
+MAX_CREATE_ATTEMPTS = 5
 
 logger = structlog.get_logger()
 
 
-def backup_rds_resources(
-    resources: list[dict[str, Any]], session: boto3.Session, region: str, parallel: int
+def get_client_pool_size(parallel: int, tag_workers: int) -> int:
+    """
+    Return the number of threads that may share one account/region's RDS
+    client during a backup: the snapshot engine's workers, plus discovery's
+    describe threads and the tag workers of the scan they share, since
+    discovery streams into the engine and both run at once.
+    """
+    engine_threads = min(parallel, ENGINE_WORKERS) + 1
+    discovery_threads = len(DESCRIBE_OPERATIONS["rds"]) + tag_workers
+    return engine_threads + discovery_threads
+
+
+def estimate_time_to_completion(
+    samples: list[tuple[float, float]], started: float
+) -> float:
+    """
+    Estimate the seconds until a snapshot completes from its (time,
+    PercentProgress) samples, oldest first.
+    Progress between samples is extrapolated at its observed rate; progress
+    without a second sample is extrapolated from the start time. Without any
+    progress, the snapshot is assumed to need as long again as it has run, so
+    checks back off exponentially. Without samples, returns 0.
+    """
+    if not samples:
+        return 0.0
+
+    now, progress = samples[-1]
+    elapsed = now - started
+    if progress >= 100:
+        return 0.0
+
+    first_time, first_progress = samples[0]
+    if progress > first_progress and now > first_time:
+        rate = (progress - first_progress) / (now - first_time)
+    elif progress > 0 and elapsed > 0:
+        rate = progress / elapsed
+    else:
+        return elapsed
+
+    return (100 - progress) / rate
+
+
+def next_poll_delay(samples: list[tuple[float, float]], started: float) -> float:
+    """Return when to check a snapshot next, clamped to the poll interval bounds."""
+    estimate = estimate_time_to_completion(samples, started)
+    return min(max(estimate, MIN_POLL_INTERVAL), MAX_POLL_INTERVAL)
+
+
+class SnapshotPoller:
+    """
+    Shared status poller for the in-flight snapshots of one session and region.
+    Snapshot tasks register with wait() and are resolved with the snapshot's
+    final describe record. A single polling task sleeps until the earliest
+    registered snapshot is due (see next_poll_delay), then describes all of
+    them in one batched call, so status calls do not grow with parallelism.
+    Snapshots registered with must_exist fail with LookupError if the first
+    successful check does not find them.
+    """
+
+    def __init__(
+        self, session: boto3.Session, region: str, executor: ThreadPoolExecutor
+    ) -> None:
+        self.session = session
+        self.region = region
+        self.executor = executor
+        self.status_calls = 0
+        self._waiting: dict[str, dict[str, Any]] = {}
+        self._wakeup = asyncio.Event()
+
+    async def wait(
+        self, snapshot_id: str, started: float, must_exist: bool = False
+    ) -> dict[str, Any]:
+        """Wait until the snapshot is available or failed and return its record."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._waiting[snapshot_id] = {
+            "future": future,
+            "started": started,
+            "samples": [],
+            # A snapshot known to exist is checked at once
+            "next_check": (
+                loop.time()
+                if must_exist
+                else loop.time() + next_poll_delay([], started)
+            ),
+            "must_exist": must_exist,
+        }
+        self._wakeup.set()
+        try:
+            snapshot: dict[str, Any] = await future
+            return snapshot
+        finally:
+            self._waiting.pop(snapshot_id, None)
+
+    async def run(self) -> None:
+        """Poll registered snapshots until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._waiting:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            # Sleep until the earliest check, or until a new snapshot registers
+            delay = min(w["next_check"] for w in self._waiting.values()) - loop.time()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except TimeoutError:
+                    pass
+                continue
+
+            waiting = dict(self._waiting)
+            try:
+                snapshots = await loop.run_in_executor(
+                    self.executor,
+                    describe_cluster_snapshots,
+                    list(waiting),
+                    self.session,
+                    self.region,
+                )
+                self.status_calls += 1
+                checked = True
+            except (ClientError, BotoCoreError) as e:
+                logger.warning(f"Failed to check snapshot status, will retry: {e}")
+                snapshots = {}
+                checked = False
+            checked_at = loop.time()
+
+            for snapshot_id, waiter in waiting.items():
+                snapshot = snapshots.get(snapshot_id)
+                if snapshot is None and checked and waiter["must_exist"]:
+                    self._waiting.pop(snapshot_id, None)
+                    if not waiter["future"].done():
+                        waiter["future"].set_exception(
+                            LookupError(f"Snapshot {snapshot_id} not found")
+                        )
+                    continue
+                if snapshot and snapshot["Status"] in ["available", "failed"]:
+                    # Stop polling it now, its task resumes on a later loop turn
+                    self._waiting.pop(snapshot_id, None)
+                    if not waiter["future"].done():
+                        waiter["future"].set_result(snapshot)
+                    continue
+                if snapshot:
+                    waiter["samples"].append(
+                        (checked_at, float(snapshot.get("PercentProgress", 0)))
+                    )
+                waiter["next_check"] = checked_at + next_poll_delay(
+                    waiter["samples"], waiter["started"]
+                )
+
+
+def verify_snapshot(snapshot: dict[str, Any], cluster_id: str) -> str:
+    """
+    Return the final status of a completed snapshot: "available" only if it
+    is available and was taken of the expected cluster, else "failed".
+    """
+    if snapshot["Status"] != "available":
+        return "failed"
+    if snapshot.get("DBClusterIdentifier", cluster_id) != cluster_id:
+        logger.error(
+            f"Snapshot {snapshot['DBClusterSnapshotIdentifier']} belongs to "
+            f"{snapshot['DBClusterIdentifier']}, expected {cluster_id}"
+        )
+        return "failed"
+    return "available"
+
+
+async def snapshot_lifecycle(
+    resource: dict[str, Any],
+    session: boto3.Session,
+    region: str,
+    executor: ThreadPoolExecutor,
+    poller: SnapshotPoller,
+    on_created: Callable[[dict[str, Any]], None] | None = None,
+    retry_create: bool = False,
+    resume: dict[str, Any] | None = None,
+    detach: bool = False,
+) -> dict[str, Any]:
+    """
+    Create, wait for and verify the snapshot of one cluster.
+    A failure is returned as a "failed" result with its error instead of
+    raised, so one snapshot cannot abort the others. The exception is when
+    retry_create is set and RDS refuses the create for capacity (see
+    is_capacity_error): it is raised so the caller can retry later.
+    on_created is called with the result once the create call succeeded.
+
+    resume is the journal entry of a snapshot an earlier process initiated:
+    it is waited for instead of created, with its duration counted from its
+    original start, and only created again if it no longer exists.
+
+    With detach, a created snapshot is returned as "initiated" without
+    waiting for it.
+    """
+    loop = asyncio.get_running_loop()
+    cluster_id = resource["DBClusterIdentifier"]
+    started = loop.time()
+    result: dict[str, Any] = {
+        "cluster": cluster_id,
+        "snapshot_id": None,
+        "snapshot_arn": None,
+        "allocated_storage": resource.get("AllocatedStorage"),
+    }
+    snapshot = None
+
+    try:
+        if resume is not None:
+            result["snapshot_id"] = resume["snapshot_id"]
+            result["snapshot_arn"] = resume["snapshot_arn"]
+            started -= max(time.time() - resume["initiated_at"], 0.0)
+            logger.info(f"Reattached to backup: {result['snapshot_id']}")
+            if detach:
+                return {**result, "status": "initiated", "duration": 0.0}
+            try:
+                snapshot = await poller.wait(
+                    result["snapshot_id"], started, must_exist=True
+                )
+            except LookupError:
+                logger.warning(
+                    f"Snapshot {result['snapshot_id']} no longer exists, "
+                    f"creating a new one"
+                )
+                result["snapshot_id"] = result["snapshot_arn"] = None
+                started = loop.time()
+
+        if snapshot is None:
+            snapshot_result = await loop.run_in_executor(
+                executor, initiate_snapshot, resource, session, region
+            )
+            result["snapshot_id"] = snapshot_result["DBClusterSnapshotIdentifier"]
+            result["snapshot_arn"] = snapshot_result["DBClusterSnapshotArn"]
+            logger.info(f"Started backup: {result['snapshot_id']}")
+            if on_created:
+                on_created(result)
+            if detach:
+                return {**result, "status": "initiated", "duration": 0.0}
+
+            snapshot = await poller.wait(result["snapshot_id"], started)
+        status = verify_snapshot(snapshot, cluster_id)
+        # Copies of encrypted snapshots need a key mapped from this one
+        if snapshot.get("StorageEncrypted"):
+            result["kms_key_id"] = snapshot.get("KmsKeyId")
+    except (ClientError, BotoCoreError, LookupError) as e:
+        if retry_create and result["snapshot_id"] is None and is_capacity_error(e):
+            raise
+        logger.error(f"Backup of {cluster_id} failed: {e}")
+        status = "failed"
+        result["error"] = str(e)
+
+    duration = loop.time() - started
+    logger.info(f"Backup {result['snapshot_id']}: {status} (took {duration:.0f}s)")
+    return {**result, "status": status, "duration": duration}
+
+
+async def feed_group(
+    scheduler: SnapshotScheduler,
+    group: dict[str, Any],
+    executor: ThreadPoolExecutor,
+    accept: Callable[[str, dict[str, Any]], bool] | None = None,
 ) -> None:
-    """Backup RDS resources with parallel execution and polling."""
-    available_clusters = [
-        resource for resource in resources if resource["Status"] == "available"
-    ]
+    """
+    Read a group's (possibly streaming) resources on the discovery executor
+    and submit the available ones to the scheduler as they arrive. A list is
+    submitted at once, so the scheduler can order all of it.
+    accept is called with the group name and each available resource, and
+    only the resources it returns True for are submitted.
+    A discovery error is logged and only ends this group's feed.
+    """
+    loop = asyncio.get_running_loop()
+    name = group["name"]
+    found = False
 
-    if not available_clusters:
-        logger.error("No available Aurora clusters found to backup")
-        return
+    def take(resource: dict[str, Any]) -> None:
+        nonlocal found
+        found = True
+        if resource.get("Status") == "available" and (
+            accept is None or accept(name, resource)
+        ):
+            scheduler.submit(name, resource)
+
+    try:
+        if isinstance(group["resources"], list):
+            # Already known in full, submit at once so all of it is ordered
+            for resource in group["resources"]:
+                take(resource)
+        else:
+            resources = iter(group["resources"])
+            while (
+                resource := await loop.run_in_executor(executor, next, resources, None)
+            ) is not None:
+                take(resource)
+    except ClientError as e:
+        logger.error(f"AWS API error discovering resources of {name}: {e}")
+    except (BotoCoreError, ValueError) as e:
+        logger.error(f"Failed to discover resources of {name}: {e}")
+    else:
+        if not found:
+            logger.error(f"No resources found for {name}")
+    finally:
+        scheduler.close_group(name)
+
+
+async def run_snapshots(
+    groups: list[dict[str, Any]],
+    session: boto3.Session,
+    region: str,
+    parallel: int,
+    estimate: Callable[[dict[str, Any]], float] | None = None,
+    journal: RunJournal | None = None,
+    freshness: FreshnessPolicy | None = None,
+    detach: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    Run the snapshot lifecycle of every available cluster of every group as
+    an asyncio task.
+    groups are dicts with a name, resources and optional max_parallel and
+    priority (see get_group_schedule). All groups share one SnapshotScheduler,
+    so at most parallel snapshots are in flight across groups and a slow
+    snapshot never holds up another group. Within a priority, the clusters
+    with the longest estimated duration start first. Blocking boto3 calls run on a
+    bounded thread pool, and one SnapshotPoller checks all in-flight
+    snapshots together.
+
+    With a journal, every snapshot's progress is recorded as it happens. A
+    cluster the journal already shows available is not snapshotted again
+    (its result is marked resumed), and one it shows initiated is reattached
+    to instead of created again.
 
-    logger.info(f"Starting backup for {len(available_clusters)} Aurora cluster(s)")
+    With a freshness policy, clusters whose latest snapshot is younger than
+    their group's min_interval are skipped before they take a slot.
 
-    in_progress: list[dict[str, Any]] = []
-    pending = list(available_clusters)
+    With detach, snapshots are only created: each frees its slot once RDS
+    accepted it and is returned as "initiated", to be checked later from the
+    journal (see check_run_target).
 
-    while pending or in_progress:
-        # Start new backups up to parallel limit
-        while len(in_progress) < parallel and pending:
-            resource = pending.pop(0)
-            snapshot_result = initiate_snapshot(resource, session, region)
-            in_progress.append(
+    Groups with copy_to destinations (see get_copy_destinations) hand each
+    snapshot to a copy stage as soon as it is available, while the rest of
+    the run goes on. Copies run on their own worker pool, capped per group
+    and destination by max_parallel, and one SnapshotPoller per destination
+    region checks all of its copies together. Each available result gets
+    the list of its copies.
+
+    Likewise, snapshots of groups with share_with are shared with those
+    accounts as soon as they are available, through a pool of SHARE_WORKERS
+    (see share_lifecycle), and get their share with its latency.
+
+    Returns one result per snapshot, in the order they started, each tagged
+    with its group name.
+    """
+    scheduler = SnapshotScheduler(parallel, estimate)
+    executor = ThreadPoolExecutor(
+        # One extra worker keeps the poller's describe call from waiting on creates
+        max_workers=min(parallel, ENGINE_WORKERS) + 1,
+        thread_name_prefix="snapshot",
+    )
+    # Each group's stream may block on discovery, so they get their own threads
+    discovery = ThreadPoolExecutor(
+        max_workers=max(len(groups), 1), thread_name_prefix="discovery"
+    )
+    poller = SnapshotPoller(session, region, executor)
+    polling = asyncio.create_task(poller.run())
+    feeds: list[asyncio.Task] = []
+    tasks: list[asyncio.Task] = []
+
+    destinations = {group["name"]: group.get("copy_to") or [] for group in groups}
+    if detach and any(destinations.values()):
+        logger.warning("Snapshots of a detached run are not copied, copy_to skipped")
+        destinations = {name: [] for name in destinations}
+    share_accounts = {group["name"]: group.get("share_with") or [] for group in groups}
+    if detach and any(share_accounts.values()):
+        logger.warning("Snapshots of a detached run are not shared, share_with skipped")
+        share_accounts = {name: [] for name in share_accounts}
+    sharer = ThreadPoolExecutor(max_workers=SHARE_WORKERS, thread_name_prefix="share")
+    shares: list[asyncio.Task] = []
+    copy_workers = sum(
+        destination["max_parallel"]
+        for group_destinations in destinations.values()
+        for destination in group_destinations
+    )
+    copier = ThreadPoolExecutor(
+        max_workers=min(copy_workers, ENGINE_WORKERS) + 1, thread_name_prefix="copy"
+    )
+    copy_pollers: dict[str, SnapshotPoller] = {}
+    copy_slots: dict[tuple[str, str], asyncio.Semaphore] = {}
+    copy_pollings: list[asyncio.Task] = []
+    copies: list[asyncio.Task] = []
+
+    async def copy_to(
+        result: dict[str, Any], destination: dict[str, Any], slots: asyncio.Semaphore
+    ) -> None:
+        copy = await copy_lifecycle(
+            result,
+            destination,
+            session,
+            region,
+            copier,
+            copy_pollers[destination["region"]],
+            slots,
+        )
+        result["copies"].append(copy)
+
+    async def share_with(result: dict[str, Any]) -> None:
+        result["share"] = await share_lifecycle(
+            result, share_accounts[result["group"]], session, region, sharer
+        )
+
+    def hand_off(result: dict[str, Any]) -> dict[str, Any]:
+        """Start the copies and share of an available snapshot."""
+        if result["status"] != "available":
+            return result
+        if share_accounts[result["group"]]:
+            shares.append(asyncio.create_task(share_with(result)))
+        if not destinations[result["group"]]:
+            return result
+        result["copies"] = []
+        for destination in destinations[result["group"]]:
+            target = destination["region"]
+            if target not in copy_pollers:
+                copy_pollers[target] = SnapshotPoller(session, target, copier)
+                copy_pollings.append(asyncio.create_task(copy_pollers[target].run()))
+            slots = copy_slots.setdefault(
+                (result["group"], target),
+                asyncio.Semaphore(destination["max_parallel"]),
+            )
+            copies.append(asyncio.create_task(copy_to(result, destination, slots)))
+        return result
+
+    attempts: dict[tuple[str, str], int] = {}
+    min_intervals = {group["name"]: group.get("min_interval") for group in groups}
+
+    def accept(group: str, resource: dict[str, Any]) -> bool:
+        if journal is not None and journal.get(group, resource) is not None:
+            # Already part of this run, finish it whatever its age
+            return True
+        if freshness is not None and freshness.is_fresh(
+            resource["DBClusterIdentifier"], min_intervals[group]
+        ):
+            return False
+        if journal is not None:
+            journal.record("pending", group, resource, region)
+        return True
+
+    async def run_in_slot(
+        group: str, resource: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        key = (group, resource["DBClusterIdentifier"])
+        attempts[key] = attempts.get(key, 0) + 1
+        entry = journal.get(group, resource) if journal is not None else None
+        if entry is not None and entry.get("status") == "available":
+            logger.info(f"Backup {entry['snapshot_id']} already available, skipping")
+            scheduler.release(group)
+            return hand_off(
                 {
-                    "cluster": resource["DBClusterIdentifier"],
-                    "snapshot_id": snapshot_result["DBClusterSnapshotIdentifier"],
-                    "snapshot_arn": snapshot_result["DBClusterSnapshotArn"],
-                    "started": time.time(),
+                    "cluster": entry["cluster"],
+                    "snapshot_id": entry["snapshot_id"],
+                    "snapshot_arn": entry["snapshot_arn"],
+                    "allocated_storage": resource.get("AllocatedStorage"),
+                    "kms_key_id": entry.get("kms_key_id"),
+                    "status": "available",
+                    "duration": entry["duration"],
+                    "group": group,
+                    "resumed": True,
                 }
             )
-            logger.info(
-                f"Started backup: {snapshot_result['DBClusterSnapshotIdentifier']}"
+        resume = entry if entry is not None and entry["event"] == "initiated" else None
+
+        def on_created(result: dict[str, Any]) -> None:
+            scheduler.record_success()
+            if journal is not None:
+                journal.record(
+                    "initiated",
+                    group,
+                    resource,
+                    region,
+                    snapshot_id=result["snapshot_id"],
+                    snapshot_arn=result["snapshot_arn"],
+                )
+
+        try:
+            result = await snapshot_lifecycle(
+                resource,
+                session,
+                region,
+                executor,
+                poller,
+                on_created=on_created,
+                retry_create=attempts[key] < MAX_CREATE_ATTEMPTS,
+                resume=resume,
+                detach=detach,
+            )
+            if journal is not None and result["status"] != "initiated":
+                journal.record(
+                    "completed",
+                    group,
+                    resource,
+                    region,
+                    snapshot_id=result["snapshot_id"],
+                    snapshot_arn=result["snapshot_arn"],
+                    status=result["status"],
+                    duration=result["duration"],
+                    kms_key_id=result.get("kms_key_id"),
+                    error=result.get("error"),
+                )
+            return hand_off({**result, "group": group})
+        except ClientError as e:
+            # RDS refused the create for capacity: run fewer at once, retry later
+            scheduler.record_backoff()
+            delay = CREATE_RETRY_DELAY * 2 ** (attempts[key] - 1)
+            logger.warning(
+                f"Snapshot of {key[1]} refused ({e}), retrying in {delay:.0f}s "
+                f"with at most {scheduler.limit} snapshot(s) in flight"
             )
+            scheduler.retry_later(group, resource, delay)
+            return None
+        finally:
+            scheduler.release(group)
 
-        # Poll for completion
-        if in_progress:
-            time.sleep(POLL_INTERVAL)
-
-            completed = []
-            for backup in in_progress:
-                status = check_snapshot_status(backup["snapshot_id"], session, region)
-                if status in ["available", "failed"]:
-                    duration = time.time() - backup["started"]
-                    logger.info(
-                        f"Backup {backup['snapshot_id']}: {status} (took {duration:.0f}s)"
-                    )
-                    completed.append(backup)
+    for group in groups:
+        scheduler.add_group(
+            group["name"],
+            group.get("max_parallel"),
+            group.get("priority", DEFAULT_PRIORITY),
+        )
+    try:
+        for group in groups:
+            feeds.append(
+                asyncio.create_task(feed_group(scheduler, group, discovery, accept))
+            )
+
+        while (admitted := await scheduler.next()) is not None:
+            tasks.append(asyncio.create_task(run_in_slot(*admitted)))
+
+        results = [r for r in await asyncio.gather(*tasks) if r is not None]
+        # Every snapshot is done, so every copy and share has been started
+        await asyncio.gather(*copies, *shares)
+    finally:
+        for task in tasks + feeds + copies + shares + copy_pollings:
+            task.cancel()
+        polling.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+        discovery.shutdown(wait=False, cancel_futures=True)
+        copier.shutdown(wait=False, cancel_futures=True)
+        sharer.shutdown(wait=False, cancel_futures=True)
+
+    if results and not detach:
+        logger.info(
+            f"Checked {len(results)} snapshot(s) with "
+            f"{poller.status_calls} status call(s)"
+        )
+    if copies:
+        copied = [copy for r in results for copy in r.get("copies", [])]
+        available = sum(1 for copy in copied if copy["status"] == "available")
+        logger.info(
+            f"Copied {available}/{len(copied)} snapshot(s) to "
+            f"{len(copy_pollers)} region(s) with "
+            f"{sum(p.status_calls for p in copy_pollers.values())} status call(s)"
+        )
+    if shares:
+        shared = [r["share"] for r in results if "share" in r]
+        done = [share for share in shared if share["status"] == "shared"]
+        slowest = max((share["latency"] for share in done), default=0)
+        logger.info(
+            f"Shared {len(done)}/{len(shared)} snapshot(s), "
+            f"slowest {slowest:.0f}s after its snapshot started"
+        )
+    if scheduler.backoffs:
+        logger.info(
+            f"Backed off {scheduler.backoffs} time(s) for RDS capacity, "
+            f"ending at {scheduler.limit} of {parallel} snapshot(s) in flight"
+        )
+    return results
+
+
+def backup_rds_groups(
+    groups: list[dict[str, Any]],
+    session: boto3.Session,
+    region: str,
+    parallel: int,
+    journal: RunJournal | None = None,
+    detach: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    Backup the RDS resources of several groups through one global scheduler.
+    Each group's resources may be a lazy stream (see stream_resource_groups):
+    they are read as discovery yields them, so snapshots start while discovery
+    of the rest of the fleet is still running.
+
+    Each snapshot's create, wait and verify steps run as one asyncio task (see
+    run_snapshots), so creates, status checks and completions of different
+    snapshots overlap and a finished snapshot frees its slot at once, for
+    whichever group is next in line.
+
+    Clusters are started longest first, estimated from the durations recorded
+    for this account and region by earlier runs or from AllocatedStorage, and
+    this run's durations are recorded for the next.
+
+    Clusters of groups with a min_interval are skipped while their latest
+    snapshot is younger than it, checked against one listing of the region's
+    recent snapshots (see load_freshness_policy).
+
+    With a journal, the run can be resumed after a crash, and with detach
+    it returns once every snapshot is created (see run_snapshots).
+
+    Returns one result per snapshot with its group, cluster, snapshot id and
+    ARN, allocated storage, final status and duration in seconds, and the
+    copies and share of groups with copy_to and share_with.
+    """
+    logger.info("Starting backup for available Aurora cluster(s) as they are found")
+
+    history_cache = get_history_cache_name(session, region)
+    history = load_duration_history(history_cache)
+    estimate = DurationEstimator(history)
+    freshness = load_freshness_policy(groups, session, region)
+    results = asyncio.run(
+        run_snapshots(
+            groups, session, region, parallel, estimate, journal, freshness, detach
+        )
+    )
+
+    skipped = freshness.skipped if freshness is not None else 0
+    if skipped:
+        logger.info(f"Skipped {skipped} cluster(s) with a recent enough snapshot")
+    elif not results:
+        logger.error("No available Aurora clusters found to backup")
+
+    save_duration_history(history_cache, history, results)
+
+    limiter = client_pool.rate_limiter(session, region)
+    if limiter is not None and limiter.throttles:
+        logger.info(
+            f"RDS throttled {limiter.throttles} call(s), API rate settled at "
+            f"{limiter.rate:.1f} call(s)/s"
+        )
+    return results
+
+
+def backup_rds_resources(
+    resources: Iterable[dict[str, Any]],
+    session: boto3.Session,
+    region: str,
+    parallel: int,
+) -> list[dict[str, Any]]:
+    """Backup RDS resources of a single group, see backup_rds_groups."""
+    return backup_rds_groups(
+        [{"name": "rds", "resources": resources}], session, region, parallel
+    )
+
+
+def backup_resource_groups(
+    resource_configs: list[dict[str, Any]],
+    session: boto3.Session,
+    region: str,
+    discovery_settings: dict[str, Any],
+    parallel: int,
+    journal: RunJournal | None = None,
+    detach: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    Discover and back up every configured resource group in one region.
+    Discovery streams from a single scan per service, and the snapshots of all
+    groups share one scheduler capped at parallel, honouring each group's
+    max_parallel and priority. A group that fails to discover is logged and
+    skipped without stopping the others. Progress is recorded in journal, if
+    given, so the run can be resumed. With detach, snapshots are created but
+    not waited for. Snapshots of groups with copy_to are copied to those
+    regions, and those of groups with share_with shared with those accounts,
+    as they become available.
+
+    Returns the snapshot results of all groups, each tagged with its group
+    name and region.
+    """
+    groups = []
+
+    # Stream every resource group from one scan of the fleet
+    resource_groups = stream_resource_groups(
+        resource_configs, session, region, discovery_settings
+    )
+
+    for resource_config, resource_group in zip(resource_configs, resource_groups):
+        service_type = resource_group["type"]
+        resource_name = resource_group["name"]
+
+        logger.info(f"\n=== Scheduling {resource_name} ({service_type}) ===")
+        logger.info(f"Resources discovered with: {resource_group['tags']}")
+
+        if "error" in resource_group:
+            logger.error(f"Failed to discover resources: {resource_group['error']}")
+            continue
+        if service_type != "rds":
+            logger.error(f"Resource type {service_type} is not supported yet.")
+            continue
+        try:
+            schedule = get_group_schedule(resource_config)
+            copy_to = get_copy_destinations(resource_config)
+            if any(destination["region"] == region for destination in copy_to):
+                logger.info(
+                    f"Snapshots of {resource_name} are already in {region}, "
+                    "not copying them there"
+                )
+                copy_to = [d for d in copy_to if d["region"] != region]
+            share_with = get_share_accounts(resource_config)
+        except ValueError as e:
+            logger.error(str(e))
+            continue
+
+        groups.append(
+            {
+                **resource_group,
+                **schedule,
+                "copy_to": copy_to,
+                "share_with": share_with,
+            }
+        )
+
+    if not groups:
+        return []
+
+    try:
+        results = backup_rds_groups(groups, session, region, parallel, journal, detach)
+    except ClientError as e:
+        logger.error(f"AWS API error during backup: {e}")
+        logger.error("Check IAM permissions for RDS snapshot creation")
+        return []
+    except BotoCoreError as e:
+        logger.error(f"Backup failed: {e}")
+        return []
 
-            for backup in completed:
-                in_progress.remove(backup)
+    return [{**result, "region": region} for result in results]
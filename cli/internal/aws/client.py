@@ -1,14 +1,143 @@
+import threading
+from typing import Any
+
 import boto3
-from typing import Any, Optional
+from botocore.config import Config
+
+from .rate_limit import RateLimiter, attach_rate_limiter
+
+
+class ClientPool:
+    """
+    Thread-safe cache of boto3 clients keyed by (session, service, region).
+    Sessions are keyed by identity, so every assumed-role session gets its own
+    clients. Counts cache hits and misses to show how many clients a run made.
+
+    Clients are built outside the pool lock, so a slow client creation never
+    blocks lookups of cached clients. boto3 sessions are not thread-safe when
+    creating clients, so creations from the same session are serialized by a
+    per-session lock, and re-check the cache under it so each key gets one client.
+
+    When an RDS rate is configured, all RDS clients of one session and region
+    share one adaptive RateLimiter, since RDS limits API calls per account
+    and region.
+    """
+
+    def __init__(self) -> None:
+        self._clients: dict[tuple[Any, str, str], Any] = {}
+        self._lock = threading.Lock()
+        self._session_locks: dict[Any, threading.Lock] = {}
+        self._rate_limiters: dict[tuple[Any, str], RateLimiter] = {}
+        self.max_pool_connections: int | None = None
+        self.rds_rate: float | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def configure(
+        self,
+        max_pool_connections: int | None = None,
+        rds_rate: float | None = None,
+    ) -> None:
+        """
+        Size the HTTP connection pool of clients created from now on, e.g. to
+        the number of threads that will share each client, and set the maximum
+        RDS API calls per second of each session and region (None for no
+        limit). Cached clients with a different configuration are dropped.
+        """
+        with self._lock:
+            if (max_pool_connections, rds_rate) != (
+                self.max_pool_connections,
+                self.rds_rate,
+            ):
+                self._clients.clear()
+                self._rate_limiters.clear()
+            self.max_pool_connections = max_pool_connections
+            self.rds_rate = rds_rate
+
+    def get(
+        self,
+        service_name: str,
+        session: boto3.Session | None = None,
+        region: str = "us-east-1",
+    ) -> Any:
+        """Return the cached client, creating it on first use."""
+        key = (session, service_name, region)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.hits += 1
+                return client
+            session_lock = self._session_locks.setdefault(session, threading.Lock())
+
+        with session_lock:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is not None:
+                    self.hits += 1
+                    return client
+                self.misses += 1
+                kwargs: dict[str, Any] = {"region_name": region}
+                if self.max_pool_connections is not None:
+                    kwargs["config"] = Config(
+                        max_pool_connections=self.max_pool_connections
+                    )
+                limiter = None
+                if service_name == "rds" and self.rds_rate is not None:
+                    limiter = self._rate_limiters.setdefault(
+                        (session, region), RateLimiter(self.rds_rate)
+                    )
+
+            if session:
+                client = session.client(service_name, **kwargs)  # type: ignore[call-overload]
+            else:
+                client = boto3.client(service_name, **kwargs)  # type: ignore[call-overload]
+            if limiter is not None:
+                attach_rate_limiter(client, limiter)
+
+            with self._lock:
+                self._clients[key] = client
+            return client
+
+    def rate_limiter(
+        self, session: boto3.Session | None, region: str
+    ) -> RateLimiter | None:
+        """Return the RDS rate limiter of a session and region, if any."""
+        with self._lock:
+            return self._rate_limiters.get((session, region))
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of cached clients, cache hits and cache misses."""
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def clear(self) -> None:
+        """Drop every cached client and reset the counters and configuration."""
+        with self._lock:
+            self._clients.clear()
+            self._session_locks.clear()
+            self._rate_limiters.clear()
+            self.max_pool_connections = None
+            self.rds_rate = None
+            self.hits = 0
+            self.misses = 0
+
+
+# Pool shared by every get_client call
+client_pool = ClientPool()
 
 
 def get_client(
     service_name: str,
-    session: Optional[boto3.Session] = None,
+    session: boto3.Session | None = None,
     region: str = "us-east-1",
 ) -> Any:
-    """Create and return a boto3 client for the specified AWS service."""
-    if session:
-        return session.client(service_name, region_name=region)  # type: ignore[call-overload]
-    else:
-        return boto3.client(service_name, region_name=region)  # type: ignore[call-overload]
+    """
+    Return a boto3 client for the specified AWS service.
+    Clients are reused from the shared client_pool for the same session,
+    service and region.
+    """
+    return client_pool.get(service_name, session, region)
@@ -0,0 +1,178 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import boto3
+import structlog
+from botocore.exceptions import BotoCoreError, ClientError
+
+from .snapshotting import (
+    COPY_ORIGIN,
+    copy_cluster_snapshot,
+    describe_cluster_snapshots,
+    get_copy_source,
+)
+
+logger = structlog.get_logger()
+
+# Default number of copies of one group in flight to one destination region
+DEFAULT_COPY_PARALLEL = 5
+
+
+def get_copy_destinations(resource_config: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Return the regions a resource group's snapshots are copied to.
+    copy_to is one destination or a list of them, each with a region, an
+    optional kms_key_id for encrypted snapshots, an optional kms_keys mapping
+    of source key ARN to destination key, and an optional max_parallel.
+    Raises ValueError for malformed destinations.
+    """
+    copy_to = resource_config.get("copy_to")
+    name = resource_config.get("name")
+    if copy_to is None:
+        return []
+    destinations = [copy_to] if isinstance(copy_to, dict) else copy_to
+    if not isinstance(destinations, list) or not destinations:
+        raise ValueError(f"Resource {name}: copy_to must be a destination or a list")
+
+    parsed = []
+    for idx, destination in enumerate(destinations):
+        where = f"Resource {name}: copy_to[{idx}]"
+        region = destination.get("region") if isinstance(destination, dict) else None
+        if not isinstance(region, str) or not region:
+            raise ValueError(f"{where}: region is required")
+        kms_keys = destination.get("kms_keys") or {}
+        if not isinstance(kms_keys, dict) or not all(
+            isinstance(key, str) for key in [*kms_keys, *kms_keys.values()]
+        ):
+            raise ValueError(f"{where}: kms_keys must map source keys to keys")
+        max_parallel = destination.get("max_parallel", DEFAULT_COPY_PARALLEL)
+        if (
+            not isinstance(max_parallel, int)
+            or isinstance(max_parallel, bool)
+            or max_parallel < 1
+        ):
+            raise ValueError(f"{where}: max_parallel must be a positive integer")
+        parsed.append(
+            {
+                "region": destination["region"],
+                "kms_key_id": destination.get("kms_key_id"),
+                "kms_keys": kms_keys,
+                "max_parallel": max_parallel,
+            }
+        )
+
+    regions = [destination["region"] for destination in parsed]
+    if len(set(regions)) != len(regions):
+        raise ValueError(f"Resource {name}: copy_to lists a region twice")
+    return parsed
+
+
+def get_copy_kms_key(
+    destination: dict[str, Any], source_kms_key: str | None
+) -> str | None:
+    """
+    Return the destination key to copy a snapshot with: the mapped key of its
+    source key, else the destination's kms_key_id. Unencrypted snapshots
+    (no source key) need none.
+    Raises ValueError if an encrypted snapshot has no destination key.
+    """
+    if source_kms_key is None:
+        return None
+    key = destination["kms_keys"].get(source_kms_key) or destination["kms_key_id"]
+    if key is None:
+        raise ValueError(
+            f"No KMS key for {destination['region']} to copy snapshots "
+            f"encrypted with {source_kms_key}"
+        )
+    return str(key)
+
+
+def get_copy_tags(result: dict[str, Any], source_region: str) -> list[dict[str, str]]:
+    """
+    Return the tags of a snapshot's copy. Copies are tagged apart from the
+    snapshots sumi takes, with their source snapshot, region and group, so
+    freshness, restore and prune in the destination region do not mistake
+    them for snapshots of a local cluster (see is_snapshot_copy).
+    """
+    tags = {
+        "origin": COPY_ORIGIN,
+        "resource": result["cluster"],
+        "group": result["group"],
+        "sourceRegion": source_region,
+        "sourceSnapshot": result["snapshot_arn"],
+    }
+    return [{"Key": key, "Value": value} for key, value in tags.items()]
+
+
+async def copy_lifecycle(
+    result: dict[str, Any],
+    destination: dict[str, Any],
+    session: boto3.Session,
+    source_region: str,
+    executor: ThreadPoolExecutor,
+    poller: Any,
+    slots: asyncio.Semaphore,
+) -> dict[str, Any]:
+    """
+    Copy an available snapshot to a destination region and wait for the copy
+    with poller, the SnapshotPoller of that region.
+    The copy keeps the snapshot's identifier, so a copy that already exists,
+    e.g. from a resumed run, is waited for instead of started again. A
+    snapshot of that name that is no copy of this one fails the copy. Holds
+    one of slots while copying. A failure is returned as a "failed" copy.
+    """
+    loop = asyncio.get_running_loop()
+    region = destination["region"]
+    snapshot_id = result["snapshot_id"]
+    copy: dict[str, Any] = {"region": region, "snapshot_id": snapshot_id}
+
+    async with slots:
+        started = loop.time()
+        try:
+            kms_key_id = get_copy_kms_key(destination, result.get("kms_key_id"))
+            try:
+                copied = await loop.run_in_executor(
+                    executor,
+                    copy_cluster_snapshot,
+                    result["snapshot_arn"],
+                    snapshot_id,
+                    session,
+                    source_region,
+                    region,
+                    kms_key_id,
+                    get_copy_tags(result, source_region),
+                )
+                copy["snapshot_arn"] = copied["DBClusterSnapshotArn"]
+                logger.info(f"Started copy of {snapshot_id} to {region}")
+                snapshot = await poller.wait(snapshot_id, started)
+            except ClientError as e:
+                if (
+                    e.response.get("Error", {}).get("Code")
+                    != "DBClusterSnapshotAlreadyExistsFault"
+                ):
+                    raise
+                existing = await loop.run_in_executor(
+                    executor, describe_cluster_snapshots, [snapshot_id], session, region
+                )
+                if snapshot_id in existing and (
+                    get_copy_source(existing[snapshot_id]) != result["snapshot_arn"]
+                ):
+                    raise ValueError(
+                        f"Another snapshot named {snapshot_id} exists in {region}"
+                    ) from e
+                logger.info(f"Copy of {snapshot_id} in {region} exists, waiting for it")
+                snapshot = await poller.wait(snapshot_id, started, must_exist=True)
+                copy["snapshot_arn"] = snapshot.get("DBClusterSnapshotArn")
+            copy["status"] = snapshot["Status"]
+        except (ClientError, BotoCoreError, ValueError, LookupError) as e:
+            logger.error(f"Copy of {snapshot_id} to {region} failed: {e}")
+            copy["status"] = "failed"
+            copy["error"] = str(e)
+
+    copy["duration"] = loop.time() - started
+    logger.info(
+        f"Copy of {snapshot_id} to {region}: {copy['status']} "
+        f"(took {copy['duration']:.0f}s)"
+    )
+    return copy
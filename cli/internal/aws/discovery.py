@@ -0,0 +1,352 @@
+import threading
+from collections import deque
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import boto3
+import structlog
+from botocore.exceptions import BotoCoreError, ClientError
+
+from cli.internal.utility.cache import DEFAULT_CACHE_TTL, read_cache, write_cache
+
+from .client import get_client
+from .resource_filtering import (
+    DESCRIBE_OPERATIONS,
+    iter_fleet,
+    list_resource_by_tag_pushdown,
+    log_discovery_stats,
+    scan_fleet,
+)
+from .session import get_account_id
+from .tag_filter import CompiledTagFilter, TagIndex, compile_tag_filter
+from .tag_resolution import DEFAULT_TAG_WORKERS
+
+logger = structlog.get_logger()
+
+# Supported values for the optional `discovery.mode` config key
+DISCOVERY_MODES = ("scan", "pushdown")
+
+
+def get_discovery_settings(config: dict[str, Any]) -> dict[str, Any]:
+    """
+    Return the optional `discovery` config block with defaults applied.
+    Raises ValueError for an unknown mode, a non-positive tag_workers or a
+    negative cache_ttl.
+
+    The returned settings also carry "use_cache" and "refresh_cache", which
+    commands set from their --no-cache / --refresh flags.
+    """
+    discovery = config.get("discovery") or {}
+    settings = {
+        "mode": discovery.get("mode", "scan"),
+        "tag_workers": discovery.get("tag_workers", DEFAULT_TAG_WORKERS),
+        "cache_ttl": discovery.get("cache_ttl", DEFAULT_CACHE_TTL),
+        "use_cache": True,
+        "refresh_cache": False,
+    }
+
+    if settings["mode"] not in DISCOVERY_MODES:
+        raise ValueError(f"Unsupported discovery mode: {settings['mode']}")
+    if not isinstance(settings["tag_workers"], int) or settings["tag_workers"] < 1:
+        raise ValueError("discovery.tag_workers must be a positive integer")
+    if not isinstance(settings["cache_ttl"], (int, float)) or settings["cache_ttl"] < 0:
+        raise ValueError("discovery.cache_ttl must be a non-negative number of seconds")
+
+    return settings
+
+
+def get_inventory_cache_name(
+    session: boto3.Session, region: str, service: str
+) -> str | None:
+    """
+    Return the on-disk cache name for a fleet, keyed by account, region and
+    service. Returns None when the account cannot be determined.
+    """
+    try:
+        account_id = get_account_id(session)
+    except (ClientError, BotoCoreError) as e:
+        logger.warning(f"Inventory cache disabled, could not resolve account: {e}")
+        return None
+    return f"inventory/{account_id}/{region}/{service}"
+
+
+def load_cached_fleet(
+    inventory: dict[tuple[str, str], TagIndex],
+    service: str,
+    session: boto3.Session,
+    region: str,
+    settings: dict[str, Any],
+) -> tuple[TagIndex | None, str | None]:
+    """
+    Look up a fleet in the in-memory inventory, then in the on-disk cache.
+    Returns the indexed fleet (None on a miss) and the cache name to store a
+    fresh scan under (None when caching is disabled).
+    """
+    key = (region, service)
+    if key in inventory:
+        return inventory[key], None
+
+    cache_name = None
+    if settings["use_cache"]:
+        cache_name = get_inventory_cache_name(session, region, service)
+
+    if cache_name and not settings["refresh_cache"]:
+        records = read_cache(cache_name, settings["cache_ttl"])
+        if records is not None:
+            logger.info(f"Using cached {service} inventory for {region}")
+            inventory[key] = TagIndex(records)
+            return inventory[key], None
+
+    return None, cache_name
+
+
+def store_fleet(
+    inventory: dict[tuple[str, str], TagIndex],
+    service: str,
+    region: str,
+    records: list[dict[str, Any]],
+    cache_name: str | None,
+) -> TagIndex:
+    """Keep a freshly scanned fleet in the inventory and the on-disk cache."""
+    if cache_name:
+        write_cache(cache_name, records)
+    inventory[(region, service)] = TagIndex(records)
+    return inventory[(region, service)]
+
+
+def get_fleet(
+    inventory: dict[tuple[str, str], TagIndex],
+    service: str,
+    session: boto3.Session,
+    region: str,
+    settings: dict[str, Any],
+    stats: dict[str, int],
+) -> TagIndex:
+    """
+    Return an indexed inventory of the service in the region, scanning it once.
+    The inventory maps (region, service) to the scanned fleet for one session.
+
+    Unless disabled by settings, scanned records are also kept in the on-disk
+    cache for cache_ttl seconds so later runs (e.g. backup right after plan)
+    can skip the scan. refresh_cache forces a new scan and rewrites the cache.
+    """
+    fleet, cache_name = load_cached_fleet(inventory, service, session, region, settings)
+    if fleet is not None:
+        return fleet
+
+    client = get_client(service, session, region)
+    records = scan_fleet(client, service, stats, settings["tag_workers"])
+    return store_fleet(inventory, service, region, records, cache_name)
+
+
+class FleetStream:
+    """
+    Splits one streaming fleet scan into a resource iterator per filter.
+    Pulling from any iterator advances the shared scan; records matching other
+    filters are buffered until their iterators are read. Iterators may be read
+    from different threads. on_complete receives every scanned record once the
+    scan is exhausted.
+    """
+
+    def __init__(
+        self,
+        records: Iterator[dict[str, Any]],
+        filters: list[CompiledTagFilter],
+        on_complete: Callable[[list[dict[str, Any]]], None] | None = None,
+    ) -> None:
+        self._source = records
+        self._filters = filters
+        self._buffers: list[deque[dict[str, Any]]] = [deque() for _ in filters]
+        self._scanned: list[dict[str, Any]] = []
+        self._on_complete = on_complete
+        self._lock = threading.Lock()
+        self._exhausted = False
+        self._error: Exception | None = None
+
+    def _pull(self) -> bool:
+        """Move one record from the scan into matching buffers, False when done."""
+        with self._lock:
+            if self._error is not None:
+                raise self._error
+            if self._exhausted:
+                return False
+
+            try:
+                record = next(self._source)
+            except StopIteration:
+                self._exhausted = True
+                if self._on_complete:
+                    self._on_complete(self._scanned)
+                return False
+            except Exception as e:
+                self._error = e
+                raise
+
+            self._scanned.append(record)
+            tags = {tag["Key"]: tag["Value"] for tag in record["TagList"]}
+            for buffer, compiled in zip(self._buffers, self._filters):
+                if compiled.matches_tag_dict(tags):
+                    buffer.append(record)
+            return True
+
+    def resources(self, position: int) -> Iterator[dict[str, Any]]:
+        """Yield the records matching the filter at position as they arrive."""
+        buffer = self._buffers[position]
+        while True:
+            if buffer:
+                yield buffer.popleft()
+            elif not self._pull() and not buffer:
+                return
+
+
+def stream_resource_groups(
+    resource_configs: list[dict[str, Any]],
+    session: boto3.Session,
+    region: str,
+    settings: dict[str, Any] | None = None,
+    inventory: dict[tuple[str, str], TagIndex] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Like discover_resource_groups, but each group's "resources" is an iterator
+    that yields matching resources as soon as their describe page (and tags)
+    is resolved, or a plain list when the fleet came from the cache. In scan mode all groups still share a single scan per service,
+    which also fills the inventory and on-disk cache once it completes.
+    """
+    settings = settings or get_discovery_settings({})
+    inventory = inventory if inventory is not None else {}
+    resource_groups: list[dict[str, Any]] = []
+    # Groups to resolve from a shared fleet, with their compiled filters
+    fleet_groups: dict[str, list[tuple[dict[str, Any], CompiledTagFilter]]] = {}
+
+    for resource_config in resource_configs:
+        service_type = resource_config["type"]
+        tags = resource_config["discover"]
+        resource_group: dict[str, Any] = {
+            "type": service_type,
+            "name": resource_config["name"],
+            "tags": tags,
+            "resources": iter(()),
+        }
+        resource_groups.append(resource_group)
+
+        try:
+            compiled = compile_tag_filter(tags)
+            if service_type not in DESCRIBE_OPERATIONS:
+                raise ValueError(f"Unsupported service: {service_type}")
+        except ValueError as e:
+            resource_group["error"] = e
+            continue
+
+        if settings["mode"] == "pushdown":
+            resource_group["resources"] = stream_pushdown(
+                service_type, tags, session, region, settings
+            )
+        else:
+            fleet_groups.setdefault(service_type, []).append((resource_group, compiled))
+
+    for service_type, groups in fleet_groups.items():
+        fleet, cache_name = load_cached_fleet(
+            inventory, service_type, session, region, settings
+        )
+        if fleet is not None:
+            for resource_group, compiled in groups:
+                resource_group["resources"] = fleet.select(compiled)
+            continue
+
+        stats: dict[str, int] = {}
+
+        def on_complete(
+            records, service_type=service_type, cache_name=cache_name, stats=stats
+        ):
+            store_fleet(inventory, service_type, region, records, cache_name)
+            log_discovery_stats(stats)
+
+        client = get_client(service_type, session, region)
+        stream = FleetStream(
+            iter_fleet(client, service_type, stats, settings["tag_workers"]),
+            [compiled for _, compiled in groups],
+            on_complete,
+        )
+        for position, (resource_group, _) in enumerate(groups):
+            resource_group["resources"] = stream.resources(position)
+
+    return resource_groups
+
+
+def stream_pushdown(
+    service: str,
+    tag_filter: str,
+    session: boto3.Session,
+    region: str,
+    settings: dict[str, Any],
+) -> Iterator[dict[str, Any]]:
+    """Run pushdown discovery for one group when its resources are first read."""
+    client = get_client(service, session, region)
+    tagging_client = get_client("resourcegroupstaggingapi", session, region)
+    yield from list_resource_by_tag_pushdown(
+        client, tagging_client, service, tag_filter, None, settings["tag_workers"]
+    )
+
+
+def discover_resource_groups(
+    resource_configs: list[dict[str, Any]],
+    session: boto3.Session,
+    region: str,
+    settings: dict[str, Any] | None = None,
+    inventory: dict[tuple[str, str], TagIndex] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Discover the resources of every configured resource group.
+    In scan mode the fleet of each service is described once, indexed by tag,
+    and every group's compiled filter is evaluated against that shared index.
+    In pushdown mode each group's filter is sent to the tagging API on its own.
+
+    Returns one dict per group with its type, name, tag filter and resources.
+    Groups whose discovery failed carry the exception under "error" and an
+    empty resource list, so one bad group does not hide the others.
+    """
+    settings = settings or get_discovery_settings({})
+    inventory = inventory if inventory is not None else {}
+    stats: dict[str, int] = {}
+    resource_groups = []
+
+    for resource_config in resource_configs:
+        service_type = resource_config["type"]
+        resource_name = resource_config["name"]
+        tags = resource_config["discover"]
+
+        logger.info(f"Discovering {service_type} resources: {resource_name}")
+
+        resource_group: dict[str, Any] = {
+            "type": service_type,
+            "name": resource_name,
+            "tags": tags,
+            "resources": [],
+        }
+        try:
+            if settings["mode"] == "pushdown":
+                client = get_client(service_type, session, region)
+                tagging_client = get_client("resourcegroupstaggingapi", session, region)
+                resource_group["resources"] = list_resource_by_tag_pushdown(
+                    client,
+                    tagging_client,
+                    service_type,
+                    tags,
+                    stats,
+                    settings["tag_workers"],
+                )
+            else:
+                compiled = compile_tag_filter(tags)
+                fleet = get_fleet(
+                    inventory, service_type, session, region, settings, stats
+                )
+                resource_group["resources"] = fleet.select(compiled)
+        except (ClientError, BotoCoreError, ValueError) as e:
+            resource_group["error"] = e
+
+        resource_groups.append(resource_group)
+
+    if settings["mode"] == "scan":
+        log_discovery_stats(stats)
+
+    return resource_groups
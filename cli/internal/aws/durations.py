@@ -0,0 +1,112 @@
+import math
+import statistics
+from typing import Any
+
+import boto3
+import structlog
+from botocore.exceptions import BotoCoreError, ClientError
+
+from cli.internal.utility.cache import read_cache, write_cache
+
+from .session import get_account_id
+
+logger = structlog.get_logger()
+
+# Weight of the latest run in a cluster's smoothed snapshot duration
+HISTORY_WEIGHT = 0.5
+
+# Assumed snapshot time per GiB of AllocatedStorage before any history exists
+DEFAULT_SECONDS_PER_GB = 3.0
+
+
+def get_history_cache_name(session: boto3.Session, region: str) -> str | None:
+    """
+    Return the on-disk cache name of the snapshot duration history of an
+    account and region. Returns None when the account cannot be determined.
+    """
+    try:
+        account_id = get_account_id(session)
+    except (ClientError, BotoCoreError) as e:
+        logger.warning(f"Duration history disabled, could not resolve account: {e}")
+        return None
+    return f"durations/{account_id}/{region}"
+
+
+def load_duration_history(cache_name: str | None) -> dict[str, dict[str, float]]:
+    """
+    Return the recorded snapshot durations keyed by resource identifier, each
+    with its smoothed duration in seconds and last known storage in GiB.
+    History never expires; it is only smoothed by newer runs.
+    """
+    if cache_name is None:
+        return {}
+    history = read_cache(cache_name, math.inf)
+    return history if isinstance(history, dict) else {}
+
+
+def save_duration_history(
+    cache_name: str | None,
+    history: dict[str, dict[str, float]],
+    results: list[dict[str, Any]],
+) -> None:
+    """
+    Fold the durations of this run's available snapshots into history and
+    store it, with the storage size each duration was measured at. Results
+    resumed from a journal are left out, as the earlier process may already
+    have recorded them.
+    """
+    for result in results:
+        if result["status"] != "available" or result.get("resumed"):
+            continue
+        identifier = result["cluster"]
+        previous = history.get(identifier)
+        duration = float(result["duration"])
+        if previous is not None:
+            duration = (
+                HISTORY_WEIGHT * duration + (1 - HISTORY_WEIGHT) * previous["duration"]
+            )
+        history[identifier] = {
+            "duration": duration,
+            "storage": float(result.get("allocated_storage") or 0),
+        }
+
+    if cache_name is None or not history:
+        return
+    try:
+        write_cache(cache_name, history)
+    except OSError as e:
+        logger.warning(f"Failed to save snapshot duration history: {e}")
+
+
+def get_resource_id(resource: dict[str, Any]) -> str:
+    """Return the identifier of a cluster or instance describe record."""
+    identifier: str = resource.get("DBClusterIdentifier") or resource.get(
+        "DBInstanceIdentifier", ""
+    )
+    return identifier
+
+
+class DurationEstimator:
+    """
+    Expected snapshot duration of a resource, for longest-first ordering.
+    Resources snapshotted before use their smoothed duration from history.
+    Others are estimated from AllocatedStorage at the median seconds per GiB
+    seen in history, or DEFAULT_SECONDS_PER_GB without any.
+    """
+
+    def __init__(self, history: dict[str, dict[str, float]]) -> None:
+        self.history = history
+        rates = [
+            entry["duration"] / entry["storage"]
+            for entry in history.values()
+            if entry.get("storage", 0) > 0
+        ]
+        self.seconds_per_gb = (
+            statistics.median(rates) if rates else DEFAULT_SECONDS_PER_GB
+        )
+
+    def __call__(self, resource: dict[str, Any]) -> float:
+        entry = self.history.get(get_resource_id(resource))
+        if entry is not None:
+            return float(entry["duration"])
+        return float(resource.get("AllocatedStorage") or 0) * self.seconds_per_gb
@@ -0,0 +1,38 @@
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import structlog
+from botocore.exceptions import BotoCoreError, ClientError
+
+
+def run_concurrently[T, R](
+    items: list[T],
+    func: Callable[[T], R],
+    max_workers: int | None = None,
+    context: Callable[[T], dict[str, Any]] | None = None,
+) -> list[tuple[T, R | None, Exception | None]]:
+    """
+    Call func for every item on a thread pool of up to max_workers threads.
+    An AWS failure of one item does not affect the others: each result is returned
+    as (item, result, None) or (item, None, exception), in the order of items.
+    If context is given, log lines emitted while handling an item are tagged
+    with the fields context(item) returns.
+    """
+    if not items:
+        return []
+
+    def run(item: T) -> tuple[T, R | None, Exception | None]:
+        fields = context(item) if context else {}
+        structlog.contextvars.bind_contextvars(**fields)
+        try:
+            return item, func(item), None
+        except (ClientError, BotoCoreError) as e:
+            return item, None, e
+        finally:
+            structlog.contextvars.unbind_contextvars(*fields)
+
+    workers = min(max_workers or len(items), len(items))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results: list[tuple[T, Any, Exception | None]] = list(executor.map(run, items))
+    return results
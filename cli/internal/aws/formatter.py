@@ -1,7 +1,10 @@
 from typing import Any
+
 from rich.console import Console
 from rich.tree import Tree
 
+from .resource_filtering import CLUSTER_MEMBER, READ_REPLICA, get_covered_identifiers
+
 console = Console()
 
 
@@ -11,6 +14,11 @@ def format_rds_resources(resource_group: dict[str, Any]):
     tags = resource_group["tags"]
     resources = resource_group["resources"]
 
+    if "account" in resource_group:
+        resource_name = f"{resource_name}, {resource_group['account']}"
+    if "region" in resource_group:
+        resource_name = f"{resource_name}, {resource_group['region']}"
+
     console.print(f"[bold]🗄️  RDS Resources[/bold] [dim]({resource_name})[/dim]")
 
     tree = Tree(f"[bold cyan]Filter:[/bold cyan] {tags}", guide_style="dim")
@@ -29,22 +37,34 @@ def format_rds_resources(resource_group: dict[str, Any]):
                 status = resource.get("DBInstanceStatus", "unknown")
 
                 status_color = "green" if status == "available" else "yellow"
-                found_branch.add(
+                branch = found_branch.add(
                     f"[cyan]Instance:[/cyan] {identifier} "
                     f"[dim]({instance_class}, {engine})[/dim] "
                     f"[{status_color}]{status}[/{status_color}]"
                 )
+                replicas = get_covered_identifiers(resource)[READ_REPLICA]
+                if replicas:
+                    branch.add(
+                        f"[dim]Skipped {len(replicas)} read replica(s): "
+                        f"{', '.join(replicas)}[/dim]"
+                    )
             elif "DBClusterIdentifier" in resource:
                 identifier = resource["DBClusterIdentifier"]
                 engine = resource.get("Engine", "unknown")
                 status = resource.get("Status", "unknown")
 
                 status_color = "green" if status == "available" else "yellow"
-                found_branch.add(
+                branch = found_branch.add(
                     f"[cyan]Cluster:[/cyan] {identifier} "
                     f"[dim]({engine})[/dim] "
                     f"[{status_color}]{status}[/{status_color}]"
                 )
+                members = get_covered_identifiers(resource)[CLUSTER_MEMBER]
+                if members:
+                    branch.add(
+                        f"[dim]Skipped {len(members)} member instance(s): "
+                        f"{', '.join(members)}[/dim]"
+                    )
 
     console.print(tree)
     console.print()
@@ -0,0 +1,65 @@
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+import boto3
+import structlog
+from botocore.exceptions import BotoCoreError, ClientError
+
+from .snapshotting import list_latest_snapshots
+
+logger = structlog.get_logger()
+
+
+class FreshnessPolicy:
+    """
+    Decides which clusters still have a recent enough snapshot to skip.
+    latest holds the creation time of each cluster's latest available sumi
+    snapshot (see list_latest_snapshots). A cluster is fresh when that
+    snapshot is younger than its group's min_interval. Counts skipped clusters.
+    """
+
+    def __init__(
+        self,
+        latest: dict[str, datetime],
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ) -> None:
+        self.latest = latest
+        self.skipped = 0
+        self._clock = clock
+
+    def is_fresh(self, cluster_id: str, min_interval: float | None) -> bool:
+        """Return whether the cluster can be skipped, logging why it is."""
+        taken = self.latest.get(cluster_id)
+        if min_interval is None or taken is None:
+            return False
+
+        age = (self._clock() - taken).total_seconds()
+        if age >= min_interval:
+            return False
+
+        logger.info(
+            f"Skipping {cluster_id}, its last snapshot is {age / 60:.0f} minute(s) "
+            f"old (min_interval {min_interval / 60:.0f} minute(s))"
+        )
+        self.skipped += 1
+        return True
+
+
+def load_freshness_policy(
+    groups: list[dict[str, Any]], session: boto3.Session, region: str
+) -> FreshnessPolicy | None:
+    """
+    Return the freshness policy of a region, or None if no group sets a
+    min_interval. Recent snapshots are listed once for every group.
+    If they cannot be listed, every cluster is snapshotted.
+    """
+    if not any(group.get("min_interval") for group in groups):
+        return None
+
+    try:
+        latest = list_latest_snapshots(session, region)
+    except (ClientError, BotoCoreError) as e:
+        logger.warning(f"Failed to list recent snapshots, not skipping any: {e}")
+        return None
+    return FreshnessPolicy(latest)
@@ -0,0 +1,156 @@
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from cli.internal.utility.cache import get_cache_dir
+
+# Characters allowed in a run id, so it is always a plain file name
+RUN_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+# Events whose loss would create a duplicate snapshot on resume are fsynced
+DURABLE_EVENTS = {"started", "initiated", "completed"}
+
+
+def new_run_id() -> str:
+    """Return a new, sortable run id, e.g. 20250101-120000-a1b2c3."""
+    timestamp = datetime.now(UTC).strftime("%Y%m%d-%H%M%S")
+    return f"{timestamp}-{secrets.token_hex(3)}"
+
+
+def get_journal_path(run_id: str) -> Path:
+    """
+    Return the journal file of a run under the cache directory.
+    Raises ValueError for a run id that is not a plain file name.
+    """
+    if not RUN_ID_PATTERN.match(run_id):
+        raise ValueError(f"Invalid run id: {run_id}")
+    return get_cache_dir() / "runs" / f"{run_id}.jsonl"
+
+
+def get_journal_key(group: str, resource: dict[str, Any]) -> str:
+    """Return the journal key of a resource of a group, unique across regions."""
+    identifier = resource.get("DBClusterArn") or resource["DBClusterIdentifier"]
+    return f"{group}/{identifier}"
+
+
+class RunJournal:
+    """
+    Write-ahead journal of one backup run, one JSON event per line.
+    Every snapshot moves through pending (discovered and queued), initiated
+    (created, with its snapshot id and ARN) and completed (with its final
+    status). initiated and completed events are flushed to disk before the
+    run goes on, so a run killed at any point can be resumed from its
+    journal without creating its snapshots again. It is also the manifest
+    of a detached run, checked later by the status command.
+    Safe to share between the threads of concurrent targets.
+    """
+
+    def __init__(
+        self,
+        run_id: str,
+        entries: dict[str, dict[str, Any]],
+        config_path: str | None = None,
+    ) -> None:
+        self.run_id = run_id
+        self.path = get_journal_path(run_id)
+        self.entries = entries
+        self.config_path = config_path
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, run_id: str, config_path: str) -> "RunJournal":
+        """Start the journal of a new run. Raises FileExistsError if it exists."""
+        journal = cls(run_id, {}, config_path)
+        journal.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(journal.path, "x"):
+            pass
+        journal._append({"event": "started", "config": config_path})
+        return journal
+
+    @classmethod
+    def load(cls, run_id: str) -> "RunJournal":
+        """
+        Replay the journal of an earlier run to continue it.
+        Each snapshot's entry holds the fields of all its events, latest
+        event last. A torn last line from a crash is ignored.
+        Raises FileNotFoundError if the run has no journal.
+        """
+        entries: dict[str, dict[str, Any]] = {}
+        config_path = None
+        with open(get_journal_path(run_id), "r") as file:
+            for line in file:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if event.get("event") == "started":
+                    config_path = event.get("config")
+                key = event.get("key")
+                if key is None:
+                    continue
+                entry = entries.setdefault(key, {})
+                if event["event"] == "initiated":
+                    entry["initiated_at"] = event["at"]
+                entry.update(event)
+        return cls(run_id, entries, config_path)
+
+    def get(self, group: str, resource: dict[str, Any]) -> dict[str, Any] | None:
+        """Return the journaled state of a resource of a group, if any."""
+        with self._lock:
+            return self.entries.get(get_journal_key(group, resource))
+
+    def record(
+        self,
+        event: str,
+        group: str,
+        resource: dict[str, Any],
+        region: str,
+        **fields: Any,
+    ) -> None:
+        """Append an event of a resource of a group and update its entry."""
+        self._record(
+            {
+                "event": event,
+                "key": get_journal_key(group, resource),
+                "group": group,
+                "cluster": resource["DBClusterIdentifier"],
+                "region": region,
+                **fields,
+            }
+        )
+
+    def update(self, entry: dict[str, Any], event: str, **fields: Any) -> None:
+        """Append an event of the resource of an existing entry."""
+        self._record(
+            {
+                "event": event,
+                "key": entry["key"],
+                "group": entry["group"],
+                "cluster": entry["cluster"],
+                "region": entry["region"],
+                **fields,
+            }
+        )
+
+    def _record(self, line: dict[str, Any]) -> None:
+        with self._lock:
+            line = self._append(line)
+            entry = self.entries.setdefault(line["key"], {})
+            if line["event"] == "initiated":
+                entry["initiated_at"] = line["at"]
+            entry.update(line)
+
+    def _append(self, line: dict[str, Any]) -> dict[str, Any]:
+        line = {**line, "at": time.time()}
+        with open(self.path, "a") as file:
+            file.write(json.dumps(line, default=str) + "\n")
+            file.flush()
+            if line["event"] in DURABLE_EVENTS:
+                os.fsync(file.fileno())
+        return line
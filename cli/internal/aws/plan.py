@@ -1,22 +1,47 @@
+from typing import Any
+
 import boto3
 import structlog
-from .client import get_client
+
+from cli.internal.utility.config import get_regions
+
+from .accounts import (
+    DEFAULT_MAX_TARGETS,
+    AccountSessions,
+    get_accounts,
+    get_targets,
+    run_targets,
+    target_label,
+)
+from .discovery import discover_resource_groups, get_discovery_settings
 from .formatter import format_rds_resources
-from .resource_filtering import list_resource_by_tag
+from .resource_filtering import CLUSTER_MEMBER, READ_REPLICA, get_covered_identifiers
 
 logger = structlog.get_logger()
 
 
-def aws_plan(config: dict, session: boto3.Session):
-    """Generate a backup plan showing all resources that will be backed up."""
-    region = config["provider"]["region"]
+def aws_plan(
+    config: dict,
+    session: boto3.Session,
+    discovery_settings: dict[str, Any] | None = None,
+    max_targets: int = DEFAULT_MAX_TARGETS,
+) -> list[str]:
+    """
+    Generate a backup plan showing all resources that will be backed up.
+    Returns the labels of the account/region targets and resource groups
+    whose discovery failed; they are reported without hiding the plan of the
+    others.
+    """
+    regions = get_regions(config)
+    accounts = get_accounts(config)
     app_name = config["app"]
     auth = config["auth"]
+    discovery_settings = discovery_settings or get_discovery_settings(config)
 
     # Display header once
+    from rich import box
     from rich.console import Console
     from rich.panel import Panel
-    from rich import box
 
     console = Console()
 
@@ -26,10 +51,18 @@ def aws_plan(config: dict, session: boto3.Session):
         else f"Role: {auth['role_arn']}"
     )
 
-    header = Panel(
+    details = (
         f"[bold cyan]App:[/bold cyan] {app_name}\n"
-        f"[bold cyan]Region:[/bold cyan] {region}\n"
-        f"[bold cyan]Auth:[/bold cyan] {auth_display}",
+        f"[bold cyan]{'Regions' if len(regions) > 1 else 'Region'}:[/bold cyan] "
+        f"{', '.join(regions)}\n"
+        f"[bold cyan]Auth:[/bold cyan] {auth_display}"
+    )
+    if "accounts" in config:
+        names = ", ".join(account["name"] for account in accounts)
+        details += f"\n[bold cyan]Accounts:[/bold cyan] {names}"
+
+    header = Panel(
+        details,
         title="[bold white]Backup Plan Preview[/bold white]",
         border_style="cyan",
         box=box.ROUNDED,
@@ -37,26 +70,38 @@ def aws_plan(config: dict, session: boto3.Session):
     console.print(header)
     console.print()
 
-    # Process each resource configuration
+    # Discover every account and region at once, each from one scan of its fleet
+    resource_configs = config["backup"]["resources"]
+    target_groups = run_targets(
+        get_targets(accounts, regions),
+        AccountSessions(session, app_name),
+        lambda target_session, region: discover_resource_groups(
+            resource_configs, target_session, region, discovery_settings
+        ),
+        max_targets,
+    )
+
     all_resources = []
-    for resource_config in config["backup"]["resources"]:
-        service_type = resource_config["type"]
-        resource_name = resource_config["name"]
-        tags = resource_config["discover"]
-
-        logger.info(f"Discovering {service_type} resources: {resource_name}")
-
-        client = get_client(service_type, session, region)
-        resources = list_resource_by_tag(client, service_type, tags)
-
-        all_resources.append(
-            {
-                "type": service_type,
-                "name": resource_name,
-                "tags": tags,
-                "resources": resources,
-            }
-        )
+    failed_targets = []
+    for target, resource_groups, error in target_groups:
+        label = target_label(target)
+        if error is not None:
+            logger.error(f"Discovery in {label} failed: {error}")
+            failed_targets.append(label)
+            continue
+        for resource_group in resource_groups or []:
+            if "error" in resource_group:
+                logger.error(
+                    f"Discovery of {resource_group['name']} in {label} failed: "
+                    f"{resource_group['error']}"
+                )
+                failed_targets.append(f"{resource_group['name']} ({label})")
+                continue
+            if len(regions) > 1:
+                resource_group["region"] = target["region"]
+            if target["account"]["name"] is not None:
+                resource_group["account"] = target["account"]["name"]
+            all_resources.append(resource_group)
 
     # Format output based on resource types
     for resource_group in all_resources:
@@ -72,8 +117,29 @@ def aws_plan(config: dict, session: boto3.Session):
 
     # Summary
     total_resources = sum(len(rg["resources"]) for rg in all_resources)
+    covered = [
+        get_covered_identifiers(resource)
+        for rg in all_resources
+        for resource in rg["resources"]
+    ]
+    members = sum(len(c[CLUSTER_MEMBER]) for c in covered)
+    replicas = sum(len(c[READ_REPLICA]) for c in covered)
     console.print()
-    if total_resources > 0:
+    if members or replicas:
+        console.print(
+            f"[dim]Deduplicated {members} cluster member instance(s) and "
+            f"{replicas} read replica(s) covered by their cluster or source.[/dim]"
+        )
+    if failed_targets:
+        console.print(
+            f"[bold red]✗[/bold red] Discovery failed for {len(failed_targets)} "
+            f"target(s) or group(s): {', '.join(failed_targets)}"
+        )
+        if total_resources > 0:
+            console.print(
+                f"[dim]Found {total_resources} resource(s) to backup in the others.[/dim]"
+            )
+    elif total_resources > 0:
         console.print(
             f"[bold green]✓[/bold green] Plan is valid. Found {total_resources} resource(s) to backup."
         )
@@ -84,3 +150,5 @@ def aws_plan(config: dict, session: boto3.Session):
         console.print(
             "[bold yellow]⚠[/bold yellow] No resources found matching the filters."
         )
+
+    return failed_targets
@@ -0,0 +1,302 @@
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import boto3
+import structlog
+from botocore.exceptions import BotoCoreError, ClientError
+
+from .discovery import discover_resource_groups
+from .snapshotting import (
+    delete_cluster_snapshot,
+    get_snapshot_tags,
+    is_snapshot_copy,
+    iter_sumi_snapshots,
+)
+
+logger = structlog.get_logger()
+
+# Retention rules that keep snapshots, and the period each periodic rule
+# keeps one snapshot of
+KEEP_RULES = ["keep_last", "daily", "weekly", "monthly"]
+PERIODS: dict[str, Callable[[datetime], tuple[int, ...]]] = {
+    "daily": lambda created: (created.year, created.month, created.day),
+    "weekly": lambda created: tuple(created.isocalendar())[:2],
+    "monthly": lambda created: (created.year, created.month),
+}
+RETENTION_KEYS = [*KEEP_RULES, "max_age_days"]
+
+DEFAULT_PRUNE_PARALLEL = 8
+
+
+def get_retention_policy(resource_config: dict[str, Any]) -> dict[str, int] | None:
+    """
+    Return a resource group's retention policy, or None if it has none.
+    retention holds keep_last, daily, weekly, monthly and max_age_days, each
+    a positive integer.
+    Raises ValueError for unknown keys or invalid counts.
+    """
+    retention = resource_config.get("retention")
+    name = resource_config.get("name")
+    if retention is None:
+        return None
+    if not isinstance(retention, dict) or not retention:
+        raise ValueError(f"Resource {name}: retention must set at least one rule")
+
+    for key, value in retention.items():
+        if key not in RETENTION_KEYS:
+            raise ValueError(
+                f"Resource {name}: unknown retention rule {key}, "
+                f"expected one of {', '.join(RETENTION_KEYS)}"
+            )
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            raise ValueError(f"Resource {name}: retention.{key} must be positive")
+    return dict(retention)
+
+
+def select_expired(
+    snapshots: list[dict[str, Any]], policy: dict[str, int], now: datetime
+) -> list[dict[str, Any]]:
+    """
+    Return the snapshots of one cluster that policy no longer keeps.
+    keep_last keeps the newest snapshots. daily, weekly and monthly keep the
+    newest snapshot of each of that many most recent days, ISO weeks and
+    months that have one. A snapshot no rule keeps expires, if any keep rule
+    is set. Snapshots older than max_age_days expire even if a periodic rule
+    keeps them, but keep_last always keeps the newest ones.
+    """
+    ordered = sorted(snapshots, key=lambda s: s["SnapshotCreateTime"], reverse=True)
+    protected = {
+        s["DBClusterSnapshotIdentifier"] for s in ordered[: policy.get("keep_last", 0)]
+    }
+    kept = set(protected)
+
+    for period, bucket in PERIODS.items():
+        count = policy.get(period)
+        if not count:
+            continue
+        seen: set[tuple[int, ...]] = set()
+        for snapshot in ordered:
+            key = bucket(snapshot["SnapshotCreateTime"])
+            if key in seen:
+                continue
+            if len(seen) == count:
+                break
+            seen.add(key)
+            kept.add(snapshot["DBClusterSnapshotIdentifier"])
+
+    has_keep_rules = any(policy.get(rule) for rule in KEEP_RULES)
+    max_age = policy.get("max_age_days")
+    expired = []
+    for snapshot in ordered:
+        snapshot_id = snapshot["DBClusterSnapshotIdentifier"]
+        if snapshot_id in protected:
+            continue
+        age = now - snapshot["SnapshotCreateTime"]
+        too_old = max_age is not None and age > timedelta(days=max_age)
+        if too_old or (has_keep_rules and snapshot_id not in kept):
+            expired.append(snapshot)
+    return expired
+
+
+def find_expired_snapshots(
+    groups: list[dict[str, Any]],
+    snapshots: Iterable[dict[str, Any]],
+    now: datetime,
+) -> tuple[list[dict[str, Any]], int]:
+    """
+    Sort a stream of sumi snapshots by cluster and return the ones the
+    retention policies of their groups no longer keep, and how many of the
+    snapshots they cover are kept.
+    groups carry their policy and the ids of their clusters. A cluster in
+    several groups only loses a snapshot that every one of its policies
+    expires, and snapshots of clusters in no group are kept.
+    """
+    policies: dict[str, list[tuple[str, dict[str, int]]]] = {}
+    for group in groups:
+        for cluster_id in group["clusters"]:
+            policies.setdefault(cluster_id, []).append(
+                (group["name"], group["retention"])
+            )
+
+    by_cluster: dict[str, list[dict[str, Any]]] = {}
+    for snapshot in snapshots:
+        cluster_id = snapshot["DBClusterIdentifier"]
+        if cluster_id in policies:
+            by_cluster.setdefault(cluster_id, []).append(snapshot)
+
+    expired = []
+    for cluster_id, cluster_snapshots in by_cluster.items():
+        expired_ids: set[str] | None = None
+        for _, policy in policies[cluster_id]:
+            ids = {
+                s["DBClusterSnapshotIdentifier"]
+                for s in select_expired(cluster_snapshots, policy, now)
+            }
+            expired_ids = ids if expired_ids is None else expired_ids & ids
+        group_name = policies[cluster_id][0][0]
+        for snapshot in cluster_snapshots:
+            if snapshot["DBClusterSnapshotIdentifier"] in (expired_ids or set()):
+                expired.append(
+                    {
+                        "group": group_name,
+                        "cluster": cluster_id,
+                        "snapshot_id": snapshot["DBClusterSnapshotIdentifier"],
+                        "created": snapshot["SnapshotCreateTime"],
+                    }
+                )
+    covered = sum(len(cluster_snapshots) for cluster_snapshots in by_cluster.values())
+    return expired, covered - len(expired)
+
+
+def find_expired_copies(
+    policies: dict[str, dict[str, int]],
+    copies: Iterable[dict[str, Any]],
+    now: datetime,
+) -> tuple[list[dict[str, Any]], int]:
+    """
+    Sort the copies sumi made into a region by their source region and
+    cluster and return the ones the retention policy of their group no
+    longer keeps, and how many of the copies they cover are kept.
+    policies map group names to their policy. A copy's group, source region
+    and cluster are read from its tags (see get_copy_tags), so copies are
+    pruned without discovering the clusters they came from. Copies of groups
+    without a policy are kept.
+    """
+    by_source: dict[tuple[str, str, str], list[dict[str, Any]]] = {}
+    for copy in copies:
+        tags = get_snapshot_tags(copy)
+        group_name = tags.get("group")
+        if group_name not in policies:
+            continue
+        source = (
+            group_name,
+            tags.get("sourceRegion", ""),
+            tags.get("resource", copy["DBClusterIdentifier"]),
+        )
+        by_source.setdefault(source, []).append(copy)
+
+    expired = []
+    for (group_name, source_region, cluster_id), source_copies in by_source.items():
+        for copy in select_expired(source_copies, policies[group_name], now):
+            expired.append(
+                {
+                    "group": group_name,
+                    "cluster": cluster_id,
+                    "source_region": source_region,
+                    "snapshot_id": copy["DBClusterSnapshotIdentifier"],
+                    "created": copy["SnapshotCreateTime"],
+                }
+            )
+    covered = sum(len(source_copies) for source_copies in by_source.values())
+    return expired, covered - len(expired)
+
+
+def delete_snapshot(
+    candidate: dict[str, Any], session: boto3.Session, region: str
+) -> dict[str, Any]:
+    """Delete one expired snapshot, returning it with its status."""
+    try:
+        delete_cluster_snapshot(candidate["snapshot_id"], session, region)
+    except (ClientError, BotoCoreError) as e:
+        logger.error(f"Failed to delete {candidate['snapshot_id']}: {e}")
+        return {**candidate, "status": "failed", "error": str(e)}
+    logger.info(f"Deleted {candidate['snapshot_id']}")
+    return {**candidate, "status": "deleted"}
+
+
+def prune_resource_groups(
+    resource_configs: list[dict[str, Any]],
+    session: boto3.Session,
+    region: str,
+    discovery_settings: dict[str, Any],
+    parallel: int = DEFAULT_PRUNE_PARALLEL,
+    dry_run: bool = False,
+    now: datetime | None = None,
+) -> dict[str, Any]:
+    """
+    Delete the snapshots sumi took in one region, and the copies it made
+    into it, that the retention policies of their groups no longer keep.
+    Groups are discovered to learn which clusters each policy covers, then
+    one paginated listing of the region's manual snapshots is sorted by
+    cluster (see find_expired_snapshots), and the copies among them by
+    their source (see find_expired_copies). Expired snapshots are
+    deleted on parallel threads, whose RDS calls share the account and
+    region's rate limiter. With dry_run nothing is deleted and every
+    expired snapshot is returned as "expired".
+
+    Returns the expired snapshots with their status and the number kept.
+    Raises ClientError if the snapshots cannot be listed.
+    """
+    retained = []
+    for resource_config in resource_configs:
+        try:
+            policy = get_retention_policy(resource_config)
+        except ValueError as e:
+            logger.error(str(e))
+            continue
+        if policy is not None and resource_config.get("type") == "rds":
+            retained.append((resource_config, policy))
+    if not retained:
+        logger.info("No resource group has a retention policy")
+        return {"snapshots": [], "kept": 0}
+
+    policies = {resource_config["name"]: policy for resource_config, policy in retained}
+    groups = []
+    resource_groups = discover_resource_groups(
+        [resource_config for resource_config, _ in retained],
+        session,
+        region,
+        discovery_settings,
+    )
+    for (_, policy), resource_group in zip(retained, resource_groups):
+        if "error" in resource_group:
+            # Without its clusters, none of the group's snapshots are pruned
+            logger.error(
+                f"Failed to discover resources of {resource_group['name']}: "
+                f"{resource_group['error']}"
+            )
+            continue
+        groups.append(
+            {
+                "name": resource_group["name"],
+                "retention": policy,
+                "clusters": {
+                    r["DBClusterIdentifier"]
+                    for r in resource_group["resources"]
+                    if "DBClusterIdentifier" in r
+                },
+            }
+        )
+
+    snapshots: list[dict[str, Any]] = []
+    copies: list[dict[str, Any]] = []
+    for snapshot in iter_sumi_snapshots(session, region, include_copies=True):
+        (copies if is_snapshot_copy(snapshot) else snapshots).append(snapshot)
+
+    now = now or datetime.now(UTC)
+    expired, kept = find_expired_snapshots(groups, snapshots, now)
+    expired_copies, kept_copies = find_expired_copies(policies, copies, now)
+    expired += expired_copies
+    kept += kept_copies
+    logger.info(f"{len(expired)} snapshot(s) expired, {kept} kept")
+
+    if dry_run:
+        for candidate in expired:
+            logger.info(
+                f"Would delete {candidate['snapshot_id']} of "
+                f"{candidate['group']}/{candidate['cluster']}"
+            )
+        return {
+            "snapshots": [{**c, "status": "expired"} for c in expired],
+            "kept": kept,
+        }
+
+    with ThreadPoolExecutor(
+        max_workers=max(parallel, 1), thread_name_prefix="prune"
+    ) as executor:
+        deleted = list(
+            executor.map(lambda c: delete_snapshot(c, session, region), expired)
+        )
+    return {"snapshots": deleted, "kept": kept}
@@ -0,0 +1,109 @@
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from .throttling import THROTTLING_ERROR_CODES
+
+# Default ceiling of RDS API calls per second, per account and region
+DEFAULT_RDS_RATE = 25.0
+
+# Floor the adaptive rate never drops below
+MIN_RATE = 1.0
+
+
+def get_api_settings(config: dict[str, Any]) -> dict[str, Any]:
+    """
+    Return the optional `api` config block with defaults applied.
+    Raises ValueError for a non-positive rds_rate.
+    """
+    api = config.get("api") or {}
+    settings = {"rds_rate": api.get("rds_rate", DEFAULT_RDS_RATE)}
+
+    rate = settings["rds_rate"]
+    if not isinstance(rate, (int, float)) or isinstance(rate, bool) or rate <= 0:
+        raise ValueError("api.rds_rate must be a positive number of calls per second")
+
+    return settings
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket whose refill rate adapts to throttling.
+    Every call takes a token; the bucket refills at rate tokens per second
+    and holds at most one second of tokens. The rate follows additive
+    increase, multiplicative decrease: each healthy call adds 1/rate (about
+    +1 call/s per second of healthy traffic), each throttled call halves it
+    and empties the bucket. The rate stays within [min_rate, max_rate].
+    """
+
+    def __init__(
+        self,
+        max_rate: float,
+        min_rate: float = MIN_RATE,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if max_rate <= 0:
+            raise ValueError("Maximum rate must be positive")
+        self.max_rate = float(max_rate)
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.rate = self.max_rate
+        self.calls = 0
+        self.throttles = 0
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.rate
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                elapsed = now - self._updated
+                self._tokens = min(self.rate, self._tokens + elapsed * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.calls += 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+    def record_success(self) -> None:
+        """Additively increase the rate after a healthy call."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + 1 / self.rate)
+
+    def record_throttle(self) -> None:
+        """Halve the rate and drain the bucket after a throttled call."""
+        with self._lock:
+            self.throttles += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+
+
+def attach_rate_limiter(client: Any, limiter: RateLimiter) -> None:
+    """
+    Route every HTTP attempt of a boto3 client, retries included, through
+    limiter, and feed each attempt's outcome back into its rate.
+    """
+    service = client.meta.service_model.endpoint_prefix
+
+    def before_send(**kwargs: Any) -> None:
+        limiter.acquire()
+
+    def after_attempt(response: Any = None, **kwargs: Any) -> None:
+        if response is None:
+            return
+        code = response[1].get("Error", {}).get("Code")
+        if code in THROTTLING_ERROR_CODES:
+            limiter.record_throttle()
+        elif code is None:
+            limiter.record_success()
+
+    # First, so the limiter also runs when another handler supplies the response
+    client.meta.events.register_first(f"before-send.{service}", before_send)
+    client.meta.events.register(f"needs-retry.{service}", after_attempt)
@@ -1,5 +1,50 @@
+import queue
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+import structlog
+
+from .tag_filter import TagFilterError, TagIndex, compile_tag_filter
+from .tag_resolution import DEFAULT_TAG_WORKERS, TagResolver
+
+logger = structlog.get_logger()
+
+# Describe operations paged through for each service, with the key holding the
+# records on a page and the key holding each record's ARN.
+RDS_DESCRIBE_OPERATIONS = [
+    ("describe_db_instances", "DBInstances", "DBInstanceArn"),
+    ("describe_db_clusters", "DBClusters", "DBClusterArn"),
+]
+
+DESCRIBE_OPERATIONS = {"rds": RDS_DESCRIBE_OPERATIONS}
+
+# Resource types requested from the Resource Groups Tagging API for RDS, mapped
+# to the describe operation and filter name used to fetch the full records.
+RDS_TAGGED_RESOURCE_TYPES = {
+    "db": ("describe_db_instances", "DBInstances", "DBInstanceArn", "db-instance-id"),
+    "cluster": ("describe_db_clusters", "DBClusters", "DBClusterArn", "db-cluster-id"),
+}
+
+# Maximum number of identifiers sent in a single describe filter
+DESCRIBE_FILTER_BATCH_SIZE = 100
+
+# Kinds of RDS describe records, see classify_rds_record
+STANDALONE_INSTANCE = "instance"
+CLUSTER = "cluster"
+CLUSTER_MEMBER = "cluster_member"
+READ_REPLICA = "read_replica"
+
+# Kinds whose data is already covered by another resource's backup, mapped to
+# the stats key counting how many of them discovery skipped
+REDUNDANT_KINDS = {
+    CLUSTER_MEMBER: "skipped_cluster_members",
+    READ_REPLICA: "skipped_read_replicas",
+}
+
+# Stats keys counting API calls, see count_api_call
+API_CALL_KINDS = ("tagging_calls", "describe_calls", "tag_calls")
+
 
 def parse_tag_filter(tag_string: str) -> list[list[tuple[str, str]]]:
     """
@@ -7,25 +52,22 @@ def parse_tag_filter(tag_string: str) -> list[list[tuple[str, str]]]:
     Example: "tag:Owner=devops AND tag:Backup=true OR tag:Critical=yes"
     Returns: [[("Owner", "devops"), ("Backup", "true")], [("Critical", "yes")]]
     (Owner=devops AND Backup=true) OR (Critical=yes)
-    """
-    or_groups = []
-    or_parts = tag_string.split(" OR ")
 
-    for or_part in or_parts:
-        and_conditions = []
-        and_parts = or_part.split(" AND ")
-
-        for and_part in and_parts:
-            and_part = and_part.strip()
-            if and_part.startswith("tag:"):
-                tag_part = and_part[4:]
-                key, value = tag_part.split("=", 1)
-                and_conditions.append((key.strip(), value.strip()))
+    Only plain equality filters can be expressed this way; use
+    compile_tag_filter for NOT, !=, key-exists, globs and regexes.
+    """
+    if not tag_string.strip():
+        return []
 
-        if and_conditions:
-            or_groups.append(and_conditions)
+    and_groups = compile_tag_filter(tag_string).to_and_groups()
+    if and_groups is None or any(
+        value is None for group in and_groups for _, value in group
+    ):
+        raise TagFilterError(
+            f"Tag filter cannot be expressed as AND/OR equalities: {tag_string}"
+        )
 
-    return or_groups
+    return [[(key, value or "") for key, value in group] for group in and_groups]
 
 
 def matches_tag_filter(
@@ -46,43 +88,335 @@ def matches_tag_filter(
     return False  # No OR group matched
 
 
+def count_api_call(stats: dict[str, int], kind: str) -> None:
+    """Increment the discovery API call counter for the given call kind."""
+    stats[kind] = stats.get(kind, 0) + 1
+
+
+def classify_rds_record(record: dict[str, Any]) -> str:
+    """
+    Classify an RDS describe record as a standalone DB instance, a cluster,
+    a cluster member (an instance with a DBClusterIdentifier) or a read
+    replica (an instance replicating from another instance or a cluster).
+    Replicas of a source in another region or account name it by ARN; they
+    are standalone instances here, since their source is not in this scan.
+    """
+    if "DBInstanceIdentifier" not in record:
+        return CLUSTER
+    if record.get("DBClusterIdentifier"):
+        return CLUSTER_MEMBER
+    for source_key in (
+        "ReadReplicaSourceDBInstanceIdentifier",
+        "ReadReplicaSourceDBClusterIdentifier",
+    ):
+        source = record.get(source_key)
+        if source and not is_arn(source):
+            return READ_REPLICA
+    return STANDALONE_INSTANCE
+
+
+def is_arn(identifier: str) -> bool:
+    return identifier.startswith("arn:")
+
+
+def prune_redundant_records(
+    records: list[dict[str, Any]], stats: dict[str, int]
+) -> list[dict[str, Any]]:
+    """
+    Drop cluster members and read replicas, whose data is backed up through
+    their cluster or source, counting each skipped kind in stats.
+    Runs before tag lookups so skipped records never cost an API call.
+    """
+    kept = []
+    for record in records:
+        stats_key = REDUNDANT_KINDS.get(classify_rds_record(record))
+        if stats_key is None:
+            kept.append(record)
+        else:
+            stats[stats_key] = stats.get(stats_key, 0) + 1
+    return kept
+
+
+def get_covered_identifiers(record: dict[str, Any]) -> dict[str, list[str]]:
+    """
+    Return the identifiers of the records pruned because this record covers
+    them: the member instances of a cluster and the read replicas of an instance.
+    """
+    return {
+        CLUSTER_MEMBER: [
+            member["DBInstanceIdentifier"]
+            for member in record.get("DBClusterMembers", [])
+        ],
+        READ_REPLICA: [
+            replica
+            for replica in record.get("ReadReplicaDBInstanceIdentifiers", [])
+            if not is_arn(replica)
+        ],
+    }
+
+
+def fill_missing_tags(
+    resolver: TagResolver,
+    records: list[dict[str, Any]],
+    arn_key: str,
+    stats: dict[str, int],
+) -> None:
+    """
+    Make sure every described record carries a TagList.
+    Records that already have one (the normal case for describe pages) are left
+    alone, the rest have their tags fetched concurrently by ARN through the
+    scan's shared resolver.
+    """
+    missing = [record for record in records if "TagList" not in record]
+    if not missing:
+        return
+
+    tag_lists = resolver.resolve([record[arn_key] for record in missing], stats)
+    for record, tags in zip(missing, tag_lists):
+        record["TagList"] = tags
+
+
+def log_discovery_stats(stats: dict[str, int]) -> None:
+    """
+    Log the number of API calls made by discovery, broken down by kind, and
+    the number of redundant records it skipped.
+    """
+    api_calls = sum(stats.get(kind, 0) for kind in API_CALL_KINDS)
+    logger.info(
+        f"Discovery made {api_calls} API call(s): "
+        f"{stats.get('tagging_calls', 0)} tagging page(s), "
+        f"{stats.get('describe_calls', 0)} describe page(s), "
+        f"{stats.get('tag_calls', 0)} tag lookup(s); "
+        f"skipped {stats.get('skipped_cluster_members', 0)} cluster member(s) "
+        f"and {stats.get('skipped_read_replicas', 0)} read replica(s)"
+    )
+
+
+def build_tag_filters(
+    and_conditions: list[tuple[str, str | None]],
+) -> list[dict[str, Any]] | None:
+    """
+    Convert one AND group into Resource Groups Tagging API TagFilters.
+    A None value only requires the key to be present.
+    Returns None when the group can never match (same key, different values).
+    """
+    values: dict[str, str | None] = {}
+    for key, value in and_conditions:
+        current = values.get(key)
+        if current is not None and value is not None and current != value:
+            return None
+        values[key] = current if value is None else value
+
+    return [
+        {"Key": key} if value is None else {"Key": key, "Values": [value]}
+        for key, value in values.items()
+    ]
+
+
+def describe_pages(
+    client: Any,
+    operation: str,
+    records_key: str,
+    arn_key: str,
+    resolver: TagResolver,
+    output: queue.Queue,
+    position: int,
+) -> None:
+    """
+    Page through one describe operation, putting each page on the output queue
+    as (position, page number, records, stats) once redundant records are
+    pruned and the tags of the rest are resolved.
+    """
+    paginator = client.get_paginator(operation)
+    for page_number, page in enumerate(paginator.paginate()):
+        page_stats = {"describe_calls": 1}
+        records = prune_redundant_records(page[records_key], page_stats)
+        fill_missing_tags(resolver, records, arn_key, page_stats)
+        output.put((position, page_number, records, page_stats))
+
+
+def iter_fleet_pages(
+    client: Any,
+    service: str,
+    stats: dict[str, int] | None = None,
+    tag_workers: int = DEFAULT_TAG_WORKERS,
+) -> Iterator[tuple[int, int, list[dict[str, Any]]]]:
+    """
+    Yield (operation position, page number, records) for every describe page of
+    the service as soon as it is fetched and its tags are resolved.
+    The describe operations (DB instances and DB clusters for RDS) are paged
+    through concurrently, so pages of different operations may interleave.
+    All of them share one TagResolver, so at most tag_workers tag lookups run
+    at once for the whole scan.
+    """
+    stats = stats if stats is not None else {}
+
+    operations = DESCRIBE_OPERATIONS.get(service)
+    if operations is None:
+        raise ValueError(f"Unsupported service: {service}")
+
+    output: queue.Queue = queue.Queue()
+    resolver = TagResolver(client, tag_workers)
+    executor = ThreadPoolExecutor(max_workers=len(operations))
+    futures = [
+        executor.submit(describe_pages, client, *operation, resolver, output, position)
+        for position, operation in enumerate(operations)
+    ]
+    # Wake the consumer when an operation finishes, so errors surface promptly
+    for future in futures:
+        future.add_done_callback(lambda _: output.put(None))
+
+    try:
+        finished = 0
+        while finished < len(futures):
+            item = output.get()
+            if item is None:
+                finished += 1
+                for future in futures:
+                    if future.done() and future.exception() is not None:
+                        future.result()
+                continue
+            position, page_number, records, page_stats = item
+            for kind, count in page_stats.items():
+                stats[kind] = stats.get(kind, 0) + count
+            yield position, page_number, records
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        resolver.close()
+
+
+def iter_fleet(
+    client: Any,
+    service: str,
+    stats: dict[str, int] | None = None,
+    tag_workers: int = DEFAULT_TAG_WORKERS,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield every resource of the service, with its TagList filled in, as soon as
+    the describe page holding it arrives.
+    For RDS: Yields both DB instances AND DB clusters, enumerated concurrently.
+    """
+    for _, _, records in iter_fleet_pages(client, service, stats, tag_workers):
+        yield from records
+
+
+def scan_fleet(
+    client: Any,
+    service: str,
+    stats: dict[str, int] | None = None,
+    tag_workers: int = DEFAULT_TAG_WORKERS,
+) -> list[dict[str, Any]]:
+    """
+    Describe every resource of the service, each with its TagList filled in.
+    For RDS: Returns both DB instances AND DB clusters, instances first, without
+    cluster members and read replicas (see prune_redundant_records).
+    """
+    pages = sorted(
+        iter_fleet_pages(client, service, stats, tag_workers),
+        key=lambda page: page[:2],
+    )
+    return [record for _, _, records in pages for record in records]
+
+
 def list_resource_by_tag(
-    client: Any, service: str, tag_filter: str
+    client: Any,
+    service: str,
+    tag_filter: str,
+    stats: dict[str, int] | None = None,
+    tag_workers: int = DEFAULT_TAG_WORKERS,
 ) -> list[dict[str, Any]]:
     """
     List resources matching the tag filter.
     tag_filter supports: "tag:Key=Value AND tag:Key2=Value2 OR tag:Key3=Value3"
+    and the rest of the compile_tag_filter grammar.
 
     For RDS: Returns both DB instances AND DB clusters.
+
+    If stats is given, it is updated with the number of describe page calls
+    ("describe_calls") and per-resource tag lookups ("tag_calls") made.
+    Tag lookups, when needed, run on up to tag_workers threads.
     """
-    matching_resources = []
-    or_groups = parse_tag_filter(tag_filter)
+    compiled = compile_tag_filter(tag_filter)
+    stats = stats if stats is not None else {}
+
+    records = scan_fleet(client, service, stats, tag_workers)
+    matching_resources = TagIndex(records).select(compiled)
+
+    log_discovery_stats(stats)
+
+    return matching_resources
+
+
+def list_resource_by_tag_pushdown(
+    client: Any,
+    tagging_client: Any,
+    service: str,
+    tag_filter: str,
+    stats: dict[str, int] | None = None,
+    tag_workers: int = DEFAULT_TAG_WORKERS,
+) -> list[dict[str, Any]]:
+    """
+    List resources matching the tag filter by pushing it down to AWS.
+    Each AND group is sent to resourcegroupstaggingapi.get_resources as
+    TagFilters, and only the matching ARNs are described, in batches.
+    Filters that cannot be pushed down (NOT, !=, globs, regexes) fall back to
+    list_resource_by_tag.
+
+    For RDS: Returns both DB instances AND DB clusters, like list_resource_by_tag.
+    """
+    compiled = compile_tag_filter(tag_filter)
+    and_groups = compiled.to_and_groups()
+    stats = stats if stats is not None else {}
+
+    if and_groups is None:
+        logger.info(f"Filter cannot be pushed down, scanning instead: {tag_filter}")
+        return list_resource_by_tag(client, service, tag_filter, stats, tag_workers)
 
     match service:
         case "rds":
-            # Get DB Instances
-            instance_paginator = client.get_paginator("describe_db_instances")
-            for page in instance_paginator.paginate():
-                for db in page["DBInstances"]:
-                    db_arn = db["DBInstanceArn"]
-                    tags_response = client.list_tags_for_resource(ResourceName=db_arn)
-
-                    if matches_tag_filter(tags_response["TagList"], or_groups):
-                        matching_resources.append(db)
-
-            # Get DB Clusters (Aurora, etc.)
-            cluster_paginator = client.get_paginator("describe_db_clusters")
-            for page in cluster_paginator.paginate():
-                for cluster in page["DBClusters"]:
-                    cluster_arn = cluster["DBClusterArn"]
-                    tags_response = client.list_tags_for_resource(
-                        ResourceName=cluster_arn
-                    )
-
-                    if matches_tag_filter(tags_response["TagList"], or_groups):
-                        matching_resources.append(cluster)
-
+            resource_types = RDS_TAGGED_RESOURCE_TYPES
         case _:
             raise ValueError(f"Unsupported service: {service}")
 
+    # Collect matching identifiers per resource type, keeping discovery order
+    identifiers: dict[str, dict[str, None]] = {kind: {} for kind in resource_types}
+    paginator = tagging_client.get_paginator("get_resources")
+    for and_conditions in and_groups:
+        tag_filters = build_tag_filters(and_conditions)
+        if tag_filters is None:
+            continue
+
+        for page in paginator.paginate(
+            TagFilters=tag_filters,
+            ResourceTypeFilters=[f"{service}:{kind}" for kind in resource_types],
+        ):
+            count_api_call(stats, "tagging_calls")
+            for mapping in page["ResourceTagMappingList"]:
+                # arn:aws:rds:<region>:<account>:<kind>:<identifier>
+                arn_parts = mapping["ResourceARN"].split(":", 6)
+                if arn_parts[5] in identifiers:
+                    identifiers[arn_parts[5]][arn_parts[6]] = None
+
+    matching_resources = []
+    with TagResolver(client, tag_workers) as resolver:
+        for kind, describe_spec in resource_types.items():
+            operation, records_key, arn_key, filter_name = describe_spec
+            ids = list(identifiers[kind])
+            describe_paginator = client.get_paginator(operation)
+            for start in range(0, len(ids), DESCRIBE_FILTER_BATCH_SIZE):
+                batch = ids[start : start + DESCRIBE_FILTER_BATCH_SIZE]
+                for page in describe_paginator.paginate(
+                    Filters=[{"Name": filter_name, "Values": batch}]
+                ):
+                    count_api_call(stats, "describe_calls")
+                    records = prune_redundant_records(page[records_key], stats)
+                    fill_missing_tags(resolver, records, arn_key, stats)
+
+                    # Re-check locally: the tagging index is eventually consistent
+                    for record in records:
+                        if compiled.matches(record["TagList"]):
+                            matching_resources.append(record)
+
+    log_discovery_stats(stats)
+
     return matching_resources
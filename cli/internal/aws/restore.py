@@ -0,0 +1,431 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import boto3
+import structlog
+from botocore.exceptions import BotoCoreError, ClientError
+
+from .client import get_client
+from .discovery import discover_resource_groups
+from .journal import RunJournal
+from .resource_filtering import DESCRIBE_FILTER_BATCH_SIZE
+from .session import get_account_id
+from .snapshotting import describe_cluster_snapshots, iter_sumi_snapshots
+from .status import get_target_entries
+
+logger = structlog.get_logger()
+
+# Delay between two batched status checks of the restores in flight
+RESTORE_POLL_INTERVAL = 30  # seconds
+
+DEFAULT_RESTORE_PARALLEL = 10
+DEFAULT_INSTANCE_CLASS = "db.r6g.large"
+DEFAULT_RESTORE_SUFFIX = "-restored"
+
+# Cluster and instance statuses a restore does not recover from
+RESTORE_FAILED_STATUSES = {
+    "failed",
+    "incompatible-restore",
+    "incompatible-parameters",
+    "incompatible-network",
+    "inaccessible-encryption-credentials",
+}
+
+
+class PartialRestoreError(Exception):
+    """A cluster was restored, but its instance failed and it was not removed."""
+
+    def __init__(self, cluster_id: str, error: Exception) -> None:
+        super().__init__(
+            f"{cluster_id} was restored without an instance and could not be "
+            f"deleted, delete it by hand: {error}"
+        )
+        self.cluster_id = cluster_id
+
+
+def get_restore_point(snapshot: dict[str, Any], group: str | None) -> dict[str, Any]:
+    """Return the restore point of an available cluster snapshot."""
+    return {
+        "group": group,
+        "cluster": snapshot["DBClusterIdentifier"],
+        "snapshot_id": snapshot["DBClusterSnapshotIdentifier"],
+        "engine": snapshot["Engine"],
+        "engine_version": snapshot.get("EngineVersion"),
+        "created": snapshot.get("SnapshotCreateTime"),
+    }
+
+
+def get_run_restore_points(
+    journal: RunJournal, session: boto3.Session, region: str
+) -> list[dict[str, Any]]:
+    """
+    Return a restore point for every snapshot a backup run took in this
+    account and region, checked with one batched describe call. Snapshots
+    that are not available (any more) are skipped.
+    """
+    entries = get_target_entries(journal, get_account_id(session), region)
+    snapshots = describe_cluster_snapshots(
+        [entry["snapshot_id"] for entry in entries], session, region
+    )
+
+    points = []
+    for entry in entries:
+        snapshot = snapshots.get(entry["snapshot_id"])
+        if snapshot is None or snapshot["Status"] != "available":
+            logger.warning(
+                f"Snapshot {entry['snapshot_id']} of {entry['cluster']} is not "
+                "available, skipping"
+            )
+            continue
+        points.append(get_restore_point(snapshot, entry["group"]))
+    return points
+
+
+def get_group_clusters(
+    resource_configs: list[dict[str, Any]],
+    session: boto3.Session,
+    region: str,
+    discovery_settings: dict[str, Any],
+) -> dict[str, str]:
+    """
+    Return the group of every cluster the config's RDS resource groups
+    discover in a region, keyed by cluster identifier. A cluster in several
+    groups is listed with the first. Groups that fail to discover are
+    logged and skipped.
+    """
+    clusters: dict[str, str] = {}
+    resource_groups = discover_resource_groups(
+        [r for r in resource_configs if r.get("type") == "rds"],
+        session,
+        region,
+        discovery_settings,
+    )
+    for resource_group in resource_groups:
+        if "error" in resource_group:
+            logger.error(
+                f"Failed to discover resources of {resource_group['name']}: "
+                f"{resource_group['error']}"
+            )
+            continue
+        for resource in resource_group["resources"]:
+            if "DBClusterIdentifier" in resource:
+                clusters.setdefault(
+                    resource["DBClusterIdentifier"], resource_group["name"]
+                )
+    return clusters
+
+
+def get_latest_restore_points(
+    session: boto3.Session, region: str, clusters: dict[str, str]
+) -> list[dict[str, Any]]:
+    """
+    Return a restore point for the latest available snapshot sumi took of
+    each of clusters, a mapping of cluster identifier to group (see
+    get_group_clusters), from one listing (see iter_sumi_snapshots).
+    """
+    latest: dict[str, dict[str, Any]] = {}
+    for snapshot in iter_sumi_snapshots(session, region):
+        cluster_id = snapshot["DBClusterIdentifier"]
+        if cluster_id not in clusters:
+            continue
+        current = latest.get(cluster_id)
+        if current is None or (
+            snapshot["SnapshotCreateTime"] > current["SnapshotCreateTime"]
+        ):
+            latest[cluster_id] = snapshot
+
+    for cluster_id in clusters:
+        if cluster_id not in latest:
+            logger.warning(f"No available snapshot of {cluster_id} found")
+    return [
+        get_restore_point(snapshot, clusters[cluster_id])
+        for cluster_id, snapshot in latest.items()
+    ]
+
+
+def start_restore(
+    point: dict[str, Any],
+    options: dict[str, Any],
+    session: boto3.Session,
+    region: str,
+) -> None:
+    """
+    Restore a cluster from its restore point and add its writer instance.
+    The instance is created right after the cluster restore is accepted, so
+    both come up together. options hold the target cluster's id, instance
+    class and optional subnet group and security groups.
+    If the instance cannot be created, the restored cluster is deleted again
+    so it is not left without one.
+    Raises ClientError, or PartialRestoreError if that delete fails too.
+    """
+    client = get_client("rds", session, region)
+    target_id = options["target_id"]
+    kwargs: dict[str, Any] = {
+        "DBClusterIdentifier": target_id,
+        "SnapshotIdentifier": point["snapshot_id"],
+        "Engine": point["engine"],
+        "Tags": [
+            {"Key": "origin", "Value": "snapctl"},
+            {"Key": "restoredFrom", "Value": point["snapshot_id"]},
+        ],
+    }
+    if point["engine_version"]:
+        kwargs["EngineVersion"] = point["engine_version"]
+    if options.get("db_subnet_group"):
+        kwargs["DBSubnetGroupName"] = options["db_subnet_group"]
+    if options.get("security_groups"):
+        kwargs["VpcSecurityGroupIds"] = options["security_groups"]
+
+    client.restore_db_cluster_from_snapshot(**kwargs)
+    try:
+        client.create_db_instance(
+            DBInstanceIdentifier=f"{target_id}-1",
+            DBClusterIdentifier=target_id,
+            Engine=point["engine"],
+            DBInstanceClass=options["instance_class"],
+        )
+    except ClientError as e:
+        logger.error(f"Failed to add an instance to {target_id}, deleting it: {e}")
+        try:
+            client.delete_db_cluster(
+                DBClusterIdentifier=target_id, SkipFinalSnapshot=True
+            )
+        except ClientError as delete_error:
+            raise PartialRestoreError(target_id, delete_error) from e
+        raise
+
+
+def describe_restores(
+    cluster_ids: list[str], session: boto3.Session, region: str
+) -> dict[str, dict[str, Any]]:
+    """
+    Return the status of many restored clusters and their instances, keyed
+    by cluster identifier. Clusters and instances are described with a
+    db-cluster-id filter, so one paginated call of each covers up to
+    DESCRIBE_FILTER_BATCH_SIZE clusters. Clusters AWS does not list yet are
+    missing from the result.
+    """
+    client = get_client("rds", session, region)
+    clusters = client.get_paginator("describe_db_clusters")
+    instances = client.get_paginator("describe_db_instances")
+    restores: dict[str, dict[str, Any]] = {}
+
+    for start in range(0, len(cluster_ids), DESCRIBE_FILTER_BATCH_SIZE):
+        batch = cluster_ids[start : start + DESCRIBE_FILTER_BATCH_SIZE]
+        filters = [{"Name": "db-cluster-id", "Values": batch}]
+        for page in clusters.paginate(Filters=filters):
+            for cluster in page["DBClusters"]:
+                restores[cluster["DBClusterIdentifier"]] = {
+                    "status": cluster["Status"],
+                    "instances": {},
+                }
+        for page in instances.paginate(Filters=filters):
+            for instance in page["DBInstances"]:
+                restore = restores.get(instance.get("DBClusterIdentifier", ""))
+                if restore is not None:
+                    restore["instances"][instance["DBInstanceIdentifier"]] = instance[
+                        "DBInstanceStatus"
+                    ]
+
+    return restores
+
+
+def get_restore_status(restore: dict[str, Any] | None) -> str:
+    """
+    Return "available" once a restored cluster and all of its (at least one)
+    instances are available, "failed" if any of them failed, else "creating".
+    """
+    if restore is None:
+        return "creating"
+    statuses = [restore["status"], *restore["instances"].values()]
+    if any(status in RESTORE_FAILED_STATUSES for status in statuses):
+        return "failed"
+    if restore["instances"] and all(status == "available" for status in statuses):
+        return "available"
+    return "creating"
+
+
+class RestorePoller:
+    """
+    Shared status poller for the restores in flight in one session and
+    region. Restore tasks register with wait() and are resolved once their
+    cluster is available or failed. Every RESTORE_POLL_INTERVAL a single
+    polling task checks all of them with one batched call (see
+    describe_restores), so status calls do not grow with the fleet.
+    """
+
+    def __init__(
+        self, session: boto3.Session, region: str, executor: ThreadPoolExecutor
+    ) -> None:
+        self.session = session
+        self.region = region
+        self.executor = executor
+        self.status_calls = 0
+        self._waiting: dict[str, asyncio.Future] = {}
+
+    async def wait(self, cluster_id: str) -> dict[str, Any]:
+        """Wait until the restored cluster is available or failed."""
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._waiting[cluster_id] = future
+        try:
+            restore: dict[str, Any] = await future
+            return restore
+        finally:
+            self._waiting.pop(cluster_id, None)
+
+    async def run(self) -> None:
+        """Poll registered restores until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(RESTORE_POLL_INTERVAL)
+            if not self._waiting:
+                continue
+
+            waiting = dict(self._waiting)
+            try:
+                restores = await loop.run_in_executor(
+                    self.executor,
+                    describe_restores,
+                    list(waiting),
+                    self.session,
+                    self.region,
+                )
+                self.status_calls += 1
+            except (ClientError, BotoCoreError) as e:
+                logger.warning(f"Failed to check restore status, will retry: {e}")
+                continue
+
+            for cluster_id, future in waiting.items():
+                restore = restores.get(cluster_id)
+                status = get_restore_status(restore)
+                if status != "creating" and not future.done():
+                    self._waiting.pop(cluster_id, None)
+                    future.set_result({**(restore or {}), "restore_status": status})
+
+
+async def restore_lifecycle(
+    point: dict[str, Any],
+    options: dict[str, Any],
+    session: boto3.Session,
+    region: str,
+    executor: ThreadPoolExecutor,
+    poller: RestorePoller,
+    slots: asyncio.Semaphore,
+    run_started: float,
+) -> dict[str, Any]:
+    """
+    Restore one cluster while holding one of slots, and wait for it with the
+    shared poller. A failure is returned as a "failed" result, or as a
+    "partial" one if it left a restored cluster behind (see start_restore).
+    Returns the result with the restore's duration and available_after, the
+    seconds since the run started, queueing included.
+    """
+    loop = asyncio.get_running_loop()
+    target_id = f"{point['cluster']}{options['suffix']}"
+    result: dict[str, Any] = {
+        "group": point["group"],
+        "cluster": point["cluster"],
+        "snapshot_id": point["snapshot_id"],
+        "target": target_id,
+    }
+
+    async with slots:
+        started = loop.time()
+        try:
+            await loop.run_in_executor(
+                executor,
+                start_restore,
+                point,
+                {**options, "target_id": target_id},
+                session,
+                region,
+            )
+            logger.info(f"Restoring {target_id} from {point['snapshot_id']}")
+            restore = await poller.wait(target_id)
+            result["status"] = restore["restore_status"]
+        except PartialRestoreError as e:
+            logger.error(str(e))
+            result["status"] = "partial"
+            result["error"] = str(e)
+        except (ClientError, BotoCoreError) as e:
+            logger.error(f"Restore of {target_id} failed: {e}")
+            result["status"] = "failed"
+            result["error"] = str(e)
+
+    result["duration"] = loop.time() - started
+    result["available_after"] = loop.time() - run_started
+    logger.info(
+        f"Restore of {target_id}: {result['status']} (took {result['duration']:.0f}s)"
+    )
+    return result
+
+
+async def run_restores(
+    points: list[dict[str, Any]],
+    options: dict[str, Any],
+    session: boto3.Session,
+    region: str,
+    parallel: int,
+) -> list[dict[str, Any]]:
+    """
+    Restore every point at once, at most parallel in flight, and poll all
+    restores together. With parallel at least the number of points, the
+    time until the whole fleet is available is that of the slowest restore.
+    Returns one result per point, in order.
+    """
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(
+        max_workers=min(parallel, len(points)) + 1, thread_name_prefix="restore"
+    )
+    poller = RestorePoller(session, region, executor)
+    polling = asyncio.create_task(poller.run())
+    slots = asyncio.Semaphore(parallel)
+    run_started = loop.time()
+
+    try:
+        results = await asyncio.gather(
+            *(
+                restore_lifecycle(
+                    point,
+                    options,
+                    session,
+                    region,
+                    executor,
+                    poller,
+                    slots,
+                    run_started,
+                )
+                for point in points
+            )
+        )
+    finally:
+        polling.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    logger.info(
+        f"Checked {len(results)} restore(s) with {poller.status_calls} status call(s)"
+    )
+    return list(results)
+
+
+def restore_clusters(
+    points: list[dict[str, Any]],
+    options: dict[str, Any],
+    session: boto3.Session,
+    region: str,
+    parallel: int = DEFAULT_RESTORE_PARALLEL,
+) -> list[dict[str, Any]]:
+    """
+    Restore clusters from their restore points in one account and region,
+    see run_restores. Each restored cluster is named after its source
+    cluster plus options["suffix"] and gets one writer instance of
+    options["instance_class"].
+
+    Returns one result per point with its group, cluster, snapshot id,
+    target cluster, status, duration and available_after in seconds.
+    """
+    if not points:
+        logger.info("No restore points found")
+        return []
+    return asyncio.run(run_restores(points, options, session, region, parallel))
@@ -0,0 +1,191 @@
+import asyncio
+import heapq
+import itertools
+from collections.abc import Callable
+from typing import Any
+
+from .throttling import AdaptiveConcurrency
+
+# Priority of resource groups without a priority key; higher runs first
+DEFAULT_PRIORITY = 0
+
+
+def get_group_schedule(resource_config: dict[str, Any]) -> dict[str, Any]:
+    """
+    Return the optional scheduling keys of a resource group.
+    max_parallel caps how many of the group's snapshots run at once (None for
+    no cap beyond --parallel) and priority orders groups, higher first.
+    min_interval is the age in seconds below which a cluster's latest snapshot
+    is fresh enough to skip it (None to always snapshot).
+    Raises ValueError for a non-positive max_parallel or min_interval, or a
+    non-integer priority.
+    """
+    max_parallel = resource_config.get("max_parallel")
+    priority = resource_config.get("priority", DEFAULT_PRIORITY)
+    min_interval = resource_config.get("min_interval")
+    name = resource_config.get("name")
+
+    if max_parallel is not None and (
+        not isinstance(max_parallel, int)
+        or isinstance(max_parallel, bool)
+        or max_parallel < 1
+    ):
+        raise ValueError(f"Resource {name}: max_parallel must be a positive integer")
+    if type(priority) is not int:
+        raise ValueError(f"Resource {name}: priority must be an integer")
+    if min_interval is not None and (
+        not isinstance(min_interval, (int, float))
+        or isinstance(min_interval, bool)
+        or min_interval <= 0
+    ):
+        raise ValueError(
+            f"Resource {name}: min_interval must be a positive number of seconds"
+        )
+
+    return {
+        "max_parallel": max_parallel,
+        "priority": priority,
+        "min_interval": min_interval,
+    }
+
+
+class SnapshotScheduler:
+    """
+    Global admission queue for the snapshots of every resource group of one
+    account and region.
+    Discovery feeds ready resources in with submit() as they stream in; next()
+    hands out the best ready resource whose group is below its max_parallel,
+    while fewer than parallel snapshots run in total. Finished snapshots hand
+    their slot back with release(), so a slow snapshot only holds its own
+    slot and never a whole group.
+
+    Ready resources are ordered by group priority, then longest expected
+    duration first (estimate, see DurationEstimator), then arrival. Starting
+    the longest snapshots first keeps one late large snapshot from stretching
+    the run's total time.
+
+    The number of snapshots in flight adapts between 1 and parallel: it is
+    halved by record_backoff() when RDS refuses a snapshot for capacity, and
+    grows again by record_success() as creates succeed, so it settles at what
+    the account sustains. Refused snapshots come back with retry_later().
+    """
+
+    def __init__(
+        self,
+        parallel: int,
+        estimate: Callable[[dict[str, Any]], float] | None = None,
+    ) -> None:
+        self.parallel = parallel
+        self.estimate = estimate
+        self.concurrency = AdaptiveConcurrency(parallel)
+        self.running = 0
+        self.backoffs = 0
+        self._delayed = 0
+        self._groups: dict[str, dict[str, Any]] = {}
+        self._ready: list[tuple[tuple, int, str, dict[str, Any]]] = []
+        self._sequence = itertools.count()
+        self._open_groups = 0
+        self._changed = asyncio.Event()
+
+    def add_group(
+        self,
+        name: str,
+        max_parallel: int | None = None,
+        priority: int = DEFAULT_PRIORITY,
+    ) -> None:
+        """Register a group whose resources will be submitted until close_group()."""
+        self._groups[name] = {
+            "max_parallel": max_parallel,
+            "priority": priority,
+            "running": 0,
+            "open": True,
+        }
+        self._open_groups += 1
+
+    def submit(self, group: str, resource: dict[str, Any]) -> None:
+        """Queue a resource of group for a snapshot."""
+        key = self.order_key(group, resource)
+        heapq.heappush(self._ready, (key, next(self._sequence), group, resource))
+        self._changed.set()
+
+    def order_key(self, group: str, resource: dict[str, Any]) -> tuple:
+        """Heap key of a ready resource, smallest first."""
+        expected = self.estimate(resource) if self.estimate else 0.0
+        return (-self._groups[group]["priority"], -expected)
+
+    def close_group(self, group: str) -> None:
+        """Mark that group will submit no more resources."""
+        if self._groups[group]["open"]:
+            self._groups[group]["open"] = False
+            self._open_groups -= 1
+            self._changed.set()
+
+    def release(self, group: str) -> None:
+        """Hand back the slot of a finished snapshot of group."""
+        self.running -= 1
+        self._groups[group]["running"] -= 1
+        self._changed.set()
+
+    def record_success(self) -> None:
+        """Additively raise the concurrency limit after a snapshot was created."""
+        self.concurrency.record_success()
+        self._changed.set()
+
+    def record_backoff(self) -> None:
+        """Halve the concurrency limit after RDS refused a snapshot for capacity."""
+        self.backoffs += 1
+        self.concurrency.record_throttle()
+
+    def retry_later(self, group: str, resource: dict[str, Any], delay: float) -> None:
+        """Submit a refused resource again after delay seconds."""
+        self._delayed += 1
+
+        def resubmit() -> None:
+            self._delayed -= 1
+            self.submit(group, resource)
+
+        asyncio.get_running_loop().call_later(delay, resubmit)
+
+    @property
+    def limit(self) -> int:
+        """Current number of snapshots allowed in flight."""
+        return self.concurrency.limit
+
+    async def next(self) -> tuple[str, dict[str, Any]] | None:
+        """
+        Wait for the next resource to snapshot and take a slot for it.
+        Returns (group, resource), or None once every group is closed and
+        nothing is running, waiting or due for a retry.
+        """
+        while True:
+            admitted = self._admit()
+            if admitted is not None:
+                return admitted
+            if not (self._ready or self._open_groups or self.running or self._delayed):
+                return None
+            self._changed.clear()
+            await self._changed.wait()
+
+    def _admit(self) -> tuple[str, dict[str, Any]] | None:
+        if self.running >= self.concurrency.limit:
+            return None
+
+        blocked = []
+        admitted = None
+        while self._ready:
+            entry = heapq.heappop(self._ready)
+            group = self._groups[entry[2]]
+            if (
+                group["max_parallel"] is not None
+                and group["running"] >= group["max_parallel"]
+            ):
+                blocked.append(entry)
+                continue
+            group["running"] += 1
+            self.running += 1
+            admitted = (entry[2], entry[3])
+            break
+
+        for entry in blocked:
+            heapq.heappush(self._ready, entry)
+        return admitted
@@ -1,7 +1,16 @@
-import boto3
 from datetime import datetime
+from functools import cache
 from typing import Any
-from typing import Optional
+
+import boto3
+import botocore.session
+from botocore.credentials import (
+    CredentialProvider,
+    CredentialResolver,
+    RefreshableCredentials,
+)
+
+from .client import get_client
 
 
 def generate_session_name(app_name: str) -> str:
@@ -10,28 +19,66 @@ def generate_session_name(app_name: str) -> str:
     return f"{app_name}-backup-{timestamp}"
 
 
-def create_session_with_role(auth_config: dict[str, Any]) -> boto3.Session:
-    """Create session by assuming role"""
-    app_name = auth_config["app"]
+class AssumedRoleProvider(CredentialProvider):
+    """Hands botocore the refreshable credentials of an assumed role."""
+
+    METHOD = "sts-assume-role"
+
+    def __init__(self, credentials: RefreshableCredentials) -> None:
+        super().__init__()
+        self.credentials = credentials
+
+    def load(self) -> RefreshableCredentials:
+        return self.credentials
+
 
-    if "profile" in auth_config:
+def create_session_with_role(
+    auth_config: dict[str, Any], source_session: boto3.Session | None = None
+) -> boto3.Session:
+    """
+    Create session by assuming role.
+    The role is assumed with source_session's credentials if given, else with
+    auth_config's profile, else with the default credential chain.
+    The session's credentials are refreshable: botocore assumes the role
+    again shortly before they expire, so long backups outlive the one hour
+    assume-role credentials.
+    """
+    app_name = auth_config.get("app", "snapctl")
+
+    if source_session is not None:
+        sts_client = get_client("sts", source_session)
+    elif "profile" in auth_config:
         session = boto3.Session(profile_name=auth_config["profile"])
         sts_client = session.client("sts")
     else:
         sts_client = boto3.client("sts")
 
-    # Assume the role
-    response = sts_client.assume_role(
-        RoleArn=auth_config["role_arn"], RoleSessionName=generate_session_name(app_name)
-    )
-
-    credentials = response["credentials"]
+    def assume_role() -> dict[str, str]:
+        response = sts_client.assume_role(
+            RoleArn=auth_config["role_arn"],
+            RoleSessionName=generate_session_name(app_name),
+        )
+        credentials = response["Credentials"]
+        return {
+            "access_key": credentials["AccessKeyId"],
+            "secret_key": credentials["SecretAccessKey"],
+            "token": credentials["SessionToken"],
+            "expiry_time": credentials["Expiration"].isoformat(),
+        }
 
-    return boto3.Session(
-        aws_access_key_id=credentials["AccessKeyId"],
-        aws_secret_access_key=credentials["SecretAccessKey"],
-        aws_session_token=credentials["SessionToken"],
+    # The first assume happens here, so a role that cannot be assumed fails now
+    credentials = RefreshableCredentials.create_from_metadata(
+        metadata=assume_role(),
+        refresh_using=assume_role,
+        method="sts-assume-role",
     )
+    botocore_session = botocore.session.get_session()
+    botocore_session.register_component(
+        "credential_provider",
+        CredentialResolver([AssumedRoleProvider(credentials)]),
+    )
+
+    return boto3.Session(botocore_session=botocore_session)
 
 
 def create_session_with_profile(auth_config: dict[str, Any]) -> boto3.Session:
@@ -40,7 +87,7 @@ def create_session_with_profile(auth_config: dict[str, Any]) -> boto3.Session:
 
 
 def create_session(auth_config: dict[str, Any]) -> boto3.Session:
-    session: Optional[boto3.Session] = None
+    session: boto3.Session | None = None
     if "role_arn" in auth_config:
         session = create_session_with_role(auth_config)
     elif "profile" in auth_config:
@@ -49,3 +96,11 @@ def create_session(auth_config: dict[str, Any]) -> boto3.Session:
         raise ValueError("No valid authentication method found in config")
 
     return session
+
+
+@cache
+def get_account_id(session: boto3.Session) -> str:
+    """Return the AWS account ID the session's credentials belong to."""
+    response = get_client("sts", session).get_caller_identity()
+    account_id: str = response["Account"]
+    return account_id
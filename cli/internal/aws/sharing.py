@@ -0,0 +1,109 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import boto3
+import structlog
+from botocore.exceptions import BotoCoreError, ClientError
+
+from .snapshotting import share_cluster_snapshot
+from .throttling import is_throttling_error
+
+logger = structlog.get_logger()
+
+# Share calls in flight at once, per account and region
+SHARE_WORKERS = 4
+MAX_SHARE_ATTEMPTS = 5
+SHARE_RETRY_DELAY = 1.0  # seconds, doubled on every retry
+
+# Accounts RDS lets one snapshot be shared with
+MAX_SHARE_ACCOUNTS = 20
+
+
+def get_share_accounts(resource_config: dict[str, Any]) -> list[str]:
+    """
+    Return the account ids a resource group's snapshots are shared with.
+    share_with is one 12-digit account id or a list of them; ids YAML read
+    as numbers are accepted.
+    Raises ValueError for malformed or too many account ids.
+    """
+    share_with = resource_config.get("share_with")
+    name = resource_config.get("name")
+    if share_with is None:
+        return []
+    accounts = share_with if isinstance(share_with, list) else [share_with]
+
+    account_ids = []
+    for account in accounts:
+        if isinstance(account, int) and not isinstance(account, bool):
+            account = str(account).zfill(12)
+        if not isinstance(account, str) or len(account) != 12 or not account.isdigit():
+            raise ValueError(
+                f"Resource {name}: share_with must list 12-digit account ids, "
+                f"got {account!r}"
+            )
+        if account not in account_ids:
+            account_ids.append(account)
+
+    if not account_ids:
+        raise ValueError(f"Resource {name}: share_with lists no accounts")
+    if len(account_ids) > MAX_SHARE_ACCOUNTS:
+        raise ValueError(
+            f"Resource {name}: snapshots can be shared with at most "
+            f"{MAX_SHARE_ACCOUNTS} accounts"
+        )
+    return account_ids
+
+
+async def share_lifecycle(
+    result: dict[str, Any],
+    account_ids: list[str],
+    session: boto3.Session,
+    region: str,
+    executor: ThreadPoolExecutor,
+) -> dict[str, Any]:
+    """
+    Share an available snapshot with account_ids on executor's workers,
+    retrying throttled calls with backoff. Sharing is idempotent, so a
+    resumed run simply shares again.
+
+    Returns the share with its accounts, status ("shared" or "failed"),
+    attempts and latency: seconds from the snapshot's start until it was
+    shared, the data-loss window the receiving accounts see.
+    """
+    loop = asyncio.get_running_loop()
+    available_at = loop.time()
+    snapshot_id = result["snapshot_id"]
+    share: dict[str, Any] = {"accounts": account_ids, "attempts": 0}
+
+    while True:
+        share["attempts"] += 1
+        try:
+            await loop.run_in_executor(
+                executor,
+                share_cluster_snapshot,
+                snapshot_id,
+                account_ids,
+                session,
+                region,
+            )
+        except (ClientError, BotoCoreError) as e:
+            if is_throttling_error(e) and share["attempts"] < MAX_SHARE_ATTEMPTS:
+                delay = SHARE_RETRY_DELAY * 2 ** (share["attempts"] - 1)
+                logger.warning(f"Sharing {snapshot_id} throttled, retry in {delay}s")
+                await asyncio.sleep(delay)
+                continue
+            logger.error(f"Sharing {snapshot_id} failed: {e}")
+            share["status"] = "failed"
+            share["error"] = str(e)
+        else:
+            share["status"] = "shared"
+        break
+
+    share["latency"] = result["duration"] + loop.time() - available_at
+    if share["status"] == "shared":
+        logger.info(
+            f"Shared {snapshot_id} with {len(account_ids)} account(s), "
+            f"{share['latency']:.0f}s after it started"
+        )
+    return share
@@ -1,15 +1,24 @@
-from typing import Dict, Any
-import structlog
-import boto3
+from collections.abc import Iterator
 from datetime import datetime
+from typing import Any
+
+import boto3
+import structlog
+
 from .client import get_client
+from .resource_filtering import DESCRIBE_FILTER_BATCH_SIZE
 
 logger = structlog.get_logger()
 
+# origin tag of the snapshots sumi takes, and of the copies it makes of them
+# in other regions
+SNAPSHOT_ORIGIN = "snapctl"
+COPY_ORIGIN = "snapctl-copy"
+
 
 def initiate_snapshot(
     resource: dict[str, Any], session: boto3.Session, region: str = "us-east-1"
-) -> Dict[str, Any]:
+) -> dict[str, Any]:
     snapshot_results = []
     resource_id = resource["DBClusterIdentifier"]
     prefix = "backup"
@@ -31,12 +40,173 @@ def initiate_snapshot(
         snapshot_results.append(
             {"cluster_id": resource_id, "status": "failed", "error": str(e)}
         )
-        logger.error(f"Failed to create snapshot for cluster {resource_id}: {str(e)}")
+        logger.error(f"Failed to create snapshot for cluster {resource_id}: {e!s}")
         raise
 
 
+def describe_cluster_snapshots(
+    snapshot_ids: list[str], session: boto3.Session, region: str
+) -> dict[str, dict[str, Any]]:
+    """
+    Return the describe records of many cluster snapshots keyed by identifier.
+    Identifiers are sent as a db-cluster-snapshot-id filter, so one paginated
+    call covers up to DESCRIBE_FILTER_BATCH_SIZE snapshots. Snapshots AWS
+    does not list yet are missing from the result.
+    """
+    client = get_client("rds", session, region)
+    paginator = client.get_paginator("describe_db_cluster_snapshots")
+    snapshots: dict[str, dict[str, Any]] = {}
+
+    for start in range(0, len(snapshot_ids), DESCRIBE_FILTER_BATCH_SIZE):
+        batch = snapshot_ids[start : start + DESCRIBE_FILTER_BATCH_SIZE]
+        for page in paginator.paginate(
+            Filters=[{"Name": "db-cluster-snapshot-id", "Values": batch}]
+        ):
+            for snapshot in page["DBClusterSnapshots"]:
+                snapshots[snapshot["DBClusterSnapshotIdentifier"]] = snapshot
+
+    return snapshots
+
+
+def get_snapshot_tags(snapshot: dict[str, Any]) -> dict[str, str]:
+    """Return the tags of a describe record as a dict."""
+    return {t["Key"]: t["Value"] for t in snapshot.get("TagList", [])}
+
+
+def is_snapshot_copy(snapshot: dict[str, Any]) -> bool:
+    """
+    Check whether a sumi snapshot is a copy from another region rather than
+    a snapshot of a cluster in its own region. Copies made before they were
+    tagged apart are recognised by their source snapshot.
+    """
+    return (
+        get_snapshot_tags(snapshot).get("origin") == COPY_ORIGIN
+        or "SourceDBClusterSnapshotArn" in snapshot
+    )
+
+
+def get_copy_source(snapshot: dict[str, Any]) -> str | None:
+    """
+    Return the ARN of the snapshot a copy was made from, as AWS records it
+    or, failing that, as sumi tagged it. None for snapshots that are no copy.
+    """
+    return snapshot.get("SourceDBClusterSnapshotArn") or get_snapshot_tags(
+        snapshot
+    ).get("sourceSnapshot")
+
+
+def iter_sumi_snapshots(
+    session: boto3.Session, region: str, include_copies: bool = False
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield the available cluster snapshots sumi took in a region, page by
+    page. One paginated listing of the region's manual cluster snapshots
+    covers every cluster; sumi's snapshots are recognised by their origin tag.
+    Copies from other regions (see is_snapshot_copy) are skipped, unless
+    include_copies is set.
+    """
+    client = get_client("rds", session, region)
+    paginator = client.get_paginator("describe_db_cluster_snapshots")
+
+    for page in paginator.paginate(SnapshotType="manual"):
+        for snapshot in page["DBClusterSnapshots"]:
+            origin = get_snapshot_tags(snapshot).get("origin")
+            if snapshot["Status"] != "available" or origin not in [
+                SNAPSHOT_ORIGIN,
+                COPY_ORIGIN,
+            ]:
+                continue
+            if include_copies or not is_snapshot_copy(snapshot):
+                yield snapshot
+
+
+def list_latest_snapshots(session: boto3.Session, region: str) -> dict[str, datetime]:
+    """
+    Return the creation time of the latest available snapshot sumi took of
+    each cluster, keyed by cluster identifier, from one listing (see
+    iter_sumi_snapshots).
+    """
+    latest: dict[str, datetime] = {}
+
+    for snapshot in iter_sumi_snapshots(session, region):
+        cluster_id = snapshot["DBClusterIdentifier"]
+        created = snapshot["SnapshotCreateTime"]
+        if cluster_id not in latest or created > latest[cluster_id]:
+            latest[cluster_id] = created
+
+    return latest
+
+
+def delete_cluster_snapshot(
+    snapshot_id: str, session: boto3.Session, region: str
+) -> None:
+    """Delete a manual cluster snapshot."""
+    client = get_client("rds", session, region)
+    client.delete_db_cluster_snapshot(DBClusterSnapshotIdentifier=snapshot_id)
+
+
+def copy_cluster_snapshot(
+    source_arn: str,
+    target_id: str,
+    session: boto3.Session,
+    source_region: str,
+    region: str,
+    kms_key_id: str | None = None,
+    tags: list[dict[str, str]] | None = None,
+) -> dict[str, Any]:
+    """
+    Start a copy of a cluster snapshot into region, tagged with tags instead
+    of the source's tags, so copies are told apart from local snapshots.
+    kms_key_id is the destination region's key for encrypted snapshots.
+    Cross-region copies are presigned by boto3 from source_region.
+    """
+    client = get_client("rds", session, region)
+    kwargs: dict[str, Any] = {
+        "SourceDBClusterSnapshotIdentifier": source_arn,
+        "TargetDBClusterSnapshotIdentifier": target_id,
+        "Tags": tags or [],
+    }
+    if kms_key_id:
+        kwargs["KmsKeyId"] = kms_key_id
+    if region != source_region:
+        kwargs["SourceRegion"] = source_region
+
+    response = client.copy_db_cluster_snapshot(**kwargs)
+    result: dict[str, Any] = response["DBClusterSnapshot"]
+    return result
+
+
+def share_cluster_snapshot(
+    snapshot_id: str, account_ids: list[str], session: boto3.Session, region: str
+) -> list[str]:
+    """
+    Allow accounts to restore a cluster snapshot, adding them to its restore
+    attribute. Accounts it is already shared with are kept.
+    Returns every account the snapshot is now shared with.
+    """
+    client = get_client("rds", session, region)
+    response = client.modify_db_cluster_snapshot_attribute(
+        DBClusterSnapshotIdentifier=snapshot_id,
+        AttributeName="restore",
+        ValuesToAdd=account_ids,
+    )
+    attributes = response["DBClusterSnapshotAttributesResult"][
+        "DBClusterSnapshotAttributes"
+    ]
+    return [
+        value
+        for attribute in attributes
+        if attribute["AttributeName"] == "restore"
+        for value in attribute["AttributeValues"]
+    ]
+
+
 def check_snapshot_status(snapshot_id: str, session: boto3.Session, region: str) -> str:
-    """Check the current status of a snapshot."""
+    """
+    Check the current status of a single snapshot.
+    Kept for ad-hoc callers; backup polls through describe_cluster_snapshots.
+    Raises ClientError if the snapshot does not exist.
+    """
     client = get_client("rds", session, region)
     response = client.describe_db_cluster_snapshots(
         DBClusterSnapshotIdentifier=snapshot_id
@@ -47,7 +217,7 @@ def check_snapshot_status(snapshot_id: str, session: boto3.Session, region: str)
 
 def create_cluster_snapshot(
     cluster_id: str, prefix: str, session: boto3.Session, region: str
-) -> Dict[str, Any]:
+) -> dict[str, Any]:
     timestamp = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
     snapshot_id = f"{prefix}-{cluster_id}-{timestamp}"
 
@@ -62,12 +232,12 @@ def create_cluster_snapshot(
                 {"Key": "createdAt", "Value": timestamp},
                 {"Key": "prefix", "Value": prefix},
                 {"Key": "version", "Value": "0.1.0"},
-                {"Key": "origin", "Value": "snapctl"},
+                {"Key": "origin", "Value": SNAPSHOT_ORIGIN},
             ],
         )
 
-        result: Dict[str, Any] = response["DBClusterSnapshot"]
+        result: dict[str, Any] = response["DBClusterSnapshot"]
         return result
     except Exception as e:
-        logger.error(f"Error creating snapshot for {cluster_id}: {str(e)}")
+        logger.error(f"Error creating snapshot for {cluster_id}: {e!s}")
         raise
@@ -0,0 +1,127 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import boto3
+import structlog
+
+from .backup import SnapshotPoller, verify_snapshot
+from .journal import RunJournal
+from .session import get_account_id
+from .snapshotting import describe_cluster_snapshots
+
+logger = structlog.get_logger()
+
+
+def get_target_entries(
+    journal: RunJournal, account_id: str, region: str
+) -> list[dict[str, Any]]:
+    """
+    Return the journal entries of the snapshots a run started in one account
+    and region, told apart by their snapshot ARN.
+    """
+    return [
+        entry
+        for entry in journal.entries.values()
+        if entry.get("snapshot_arn")
+        and entry["region"] == region
+        # arn:aws:rds:<region>:<account-id>:cluster-snapshot:<name>
+        and entry["snapshot_arn"].split(":")[4] == account_id
+    ]
+
+
+async def wait_for_snapshots(
+    entries: list[dict[str, Any]], session: boto3.Session, region: str
+) -> dict[str, dict[str, Any]]:
+    """
+    Wait until every snapshot of entries is available or failed, checking
+    all of them with one batched call per poll (see SnapshotPoller).
+    Returns their final describe records keyed by snapshot id; snapshots
+    that no longer exist are missing.
+    """
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="status")
+    poller = SnapshotPoller(session, region, executor)
+    polling = asyncio.create_task(poller.run())
+
+    async def wait(entry: dict[str, Any]) -> dict[str, Any] | None:
+        started = loop.time() - max(time.time() - entry["initiated_at"], 0.0)
+        try:
+            return await poller.wait(entry["snapshot_id"], started, must_exist=True)
+        except LookupError:
+            return None
+
+    try:
+        snapshots = await asyncio.gather(*(wait(entry) for entry in entries))
+    finally:
+        polling.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+    return {
+        entry["snapshot_id"]: snapshot
+        for entry, snapshot in zip(entries, snapshots)
+        if snapshot is not None
+    }
+
+
+def check_run_target(
+    journal: RunJournal, session: boto3.Session, region: str, wait: bool = False
+) -> list[dict[str, Any]]:
+    """
+    Check the snapshots a run started in one account and region.
+    Snapshots the journal does not show completed are described in one
+    batched call, or with wait polled until they finish. Finished ones are
+    recorded as completed in the journal, so later checks skip them.
+
+    Returns one result per snapshot with its group, cluster, snapshot id,
+    status (available, failed, missing or the current RDS status) and
+    progress in percent.
+    """
+    entries = get_target_entries(journal, get_account_id(session), region)
+    open_entries = [entry for entry in entries if entry["event"] != "completed"]
+
+    if not open_entries:
+        snapshots = {}
+    elif wait:
+        snapshots = asyncio.run(wait_for_snapshots(open_entries, session, region))
+    else:
+        snapshots = describe_cluster_snapshots(
+            [entry["snapshot_id"] for entry in open_entries], session, region
+        )
+
+    results = []
+    for entry in entries:
+        result = {
+            "group": entry["group"],
+            "cluster": entry["cluster"],
+            "snapshot_id": entry["snapshot_id"],
+        }
+        if entry["event"] == "completed":
+            results.append({**result, "status": entry["status"], "progress": 100})
+            continue
+
+        snapshot = snapshots.get(entry["snapshot_id"])
+        if snapshot is None:
+            results.append({**result, "status": "missing", "progress": 0})
+            continue
+
+        status = snapshot["Status"]
+        if status in ["available", "failed"]:
+            status = verify_snapshot(snapshot, entry["cluster"])
+            journal.update(
+                entry,
+                "completed",
+                snapshot_id=entry["snapshot_id"],
+                snapshot_arn=entry["snapshot_arn"],
+                status=status,
+                duration=time.time() - entry["initiated_at"],
+            )
+        results.append(
+            {
+                **result,
+                "status": status,
+                "progress": int(snapshot.get("PercentProgress", 0)),
+            }
+        )
+
+    return results
@@ -0,0 +1,356 @@
+import fnmatch
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+# Keywords of the filter grammar, matched case-sensitively like the original
+# " AND " / " OR " splitting
+KEYWORDS = {"AND", "OR", "NOT"}
+
+# Largest number of AND groups a filter may expand to for tag pushdown
+MAX_PUSHDOWN_GROUPS = 32
+
+# A condition key may contain spaces ("tag:Cost Center=x") but ends at the
+# operator, spaces around which are ignored like in the original parser
+TOKEN_PATTERN = re.compile(
+    r"""
+    \s*(?:
+        (?P<lparen>\()
+      | (?P<rparen>\))
+      | tag:(?P<key>(?:(?!\s+(?:AND|OR)\s)[^=!~*()"])+?)\s*(?P<op>!=|~=|\*=|=)
+      | tag:(?P<bare>[^\s=!~*()"]+)
+      | (?P<word>[A-Za-z]+)
+    )
+    """,
+    re.VERBOSE,
+)
+
+QUOTED_VALUE = re.compile(r'\s*"(?P<quoted>(?:[^"\\]|\\.)*)"')
+
+# An unquoted value runs to the next AND / OR, as with the original
+# " AND " / " OR " splitting
+VALUE_SEPARATOR = re.compile(r"\s+(?:AND|OR)(?:\s|$)")
+
+
+class TagFilterError(ValueError):
+    """Raised when a tag filter string cannot be parsed."""
+
+
+@dataclass(frozen=True)
+class Condition:
+    """
+    A single tag condition.
+    op is "=" (equals), "!=" (does not equal, including resources without the
+    key), "*=" (glob match), "~=" (regex full match) or "exists" (key present
+    with any value).
+    """
+
+    key: str
+    op: str
+    value: str | None = None
+
+    @property
+    def is_glob(self) -> bool:
+        return self.op == "*="
+
+    @property
+    def pattern(self) -> re.Pattern[str]:
+        return compile_value_pattern(self.op, self.value or "")
+
+
+@dataclass(frozen=True)
+class Not:
+    operand: "Node"
+
+
+@dataclass(frozen=True)
+class And:
+    operands: tuple["Node", ...]
+
+
+@dataclass(frozen=True)
+class Or:
+    operands: tuple["Node", ...]
+
+
+Node = Condition | Not | And | Or
+
+
+@lru_cache(maxsize=1024)
+def compile_value_pattern(op: str, value: str) -> re.Pattern[str]:
+    """Compile a glob (for "*=") or regex (for "~=") tag value."""
+    if op == "~=":
+        try:
+            return re.compile(value)
+        except re.error as e:
+            raise TagFilterError(f"Invalid regex '{value}': {e}") from e
+    return re.compile(fnmatch.translate(value))
+
+
+def scan_value(tag_string: str, position: int) -> tuple[str, int]:
+    """
+    Read a condition value starting at position.
+    Returns the value and the position after it. Unquoted values end at the
+    next AND / OR or at a closing parenthesis that does not belong to the
+    value, so "tag:Name=My App" and "tag:Team~=pay(ments|outs)" read whole.
+    """
+    match = QUOTED_VALUE.match(tag_string, position)
+    if match:
+        return re.sub(r"\\(.)", r"\1", match["quoted"]), match.end()
+
+    depth = 0
+    end = position
+    while end < len(tag_string) and not VALUE_SEPARATOR.match(tag_string, end):
+        if tag_string[end] == "(":
+            depth += 1
+        elif tag_string[end] == ")":
+            if depth == 0:
+                break
+            depth -= 1
+        end += 1
+    return tag_string[position:end].strip(), end
+
+
+def tokenize(tag_string: str) -> list[tuple[str, Any]]:
+    """Split a tag filter string into (kind, value) tokens."""
+    tokens: list[tuple[str, Any]] = []
+    position = 0
+    tag_string = tag_string.rstrip()
+
+    while position < len(tag_string):
+        match = TOKEN_PATTERN.match(tag_string, position)
+        if match is None or match.end() == position:
+            raise TagFilterError(
+                f"Unexpected input at position {position}: '{tag_string[position:]}'"
+            )
+        position = match.end()
+
+        if match["lparen"]:
+            tokens.append(("(", None))
+        elif match["rparen"]:
+            tokens.append((")", None))
+        elif match["key"]:
+            value, position = scan_value(tag_string, position)
+            tokens.append(("condition", Condition(match["key"], match["op"], value)))
+        elif match["bare"]:
+            tokens.append(("condition", Condition(match["bare"], "exists")))
+        elif match["word"] in KEYWORDS:
+            tokens.append((match["word"], None))
+        else:
+            raise TagFilterError(f"Unknown keyword '{match['word']}'")
+
+    return tokens
+
+
+class Parser:
+    """Recursive descent parser: OR binds loosest, then AND, then NOT."""
+
+    def __init__(self, tokens: list[tuple[str, Any]]) -> None:
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self) -> str | None:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][0]
+        return None
+
+    def take(self, kind: str) -> Any:
+        if self.peek() != kind:
+            found = self.peek() or "end of filter"
+            raise TagFilterError(f"Expected {kind}, found {found}")
+        value = self.tokens[self.position][1]
+        self.position += 1
+        return value
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            raise TagFilterError("Tag filter is empty")
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise TagFilterError(f"Unexpected {self.peek()} in tag filter")
+        return node
+
+    def parse_or(self) -> Node:
+        operands = [self.parse_and()]
+        while self.peek() == "OR":
+            self.take("OR")
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else Or(tuple(operands))
+
+    def parse_and(self) -> Node:
+        operands = [self.parse_not()]
+        while self.peek() == "AND":
+            self.take("AND")
+            operands.append(self.parse_not())
+        return operands[0] if len(operands) == 1 else And(tuple(operands))
+
+    def parse_not(self) -> Node:
+        if self.peek() == "NOT":
+            self.take("NOT")
+            return Not(self.parse_not())
+        if self.peek() == "(":
+            self.take("(")
+            node = self.parse_or()
+            self.take(")")
+            return node
+        condition: Condition = self.take("condition")
+        if condition.op == "~=" or condition.is_glob:
+            # Compile now so bad patterns fail at parse time
+            compile_value_pattern(condition.op, condition.value or "")
+        return condition
+
+
+class TagIndex:
+    """
+    Inverted index over a list of tagged records.
+    Maps (key, value) and key to the positions of the records carrying them,
+    so equality and key-exists conditions resolve by set lookups and
+    AND/OR/NOT by set intersection, union and difference.
+    """
+
+    def __init__(self, records: list[dict[str, Any]]) -> None:
+        self.records = records
+        self.all_ids = frozenset(range(len(records)))
+        self.by_pair: dict[tuple[str, str], set[int]] = {}
+        self.by_key: dict[str, set[int]] = {}
+
+        for position, record in enumerate(records):
+            for tag in record.get("TagList", []):
+                self.by_pair.setdefault((tag["Key"], tag["Value"]), set()).add(position)
+                self.by_key.setdefault(tag["Key"], set()).add(position)
+
+        self.values_by_key: dict[str, list[str]] = {}
+        for key, value in self.by_pair:
+            self.values_by_key.setdefault(key, []).append(value)
+
+    def select(self, compiled: "CompiledTagFilter") -> list[dict[str, Any]]:
+        """Return the records matching the filter, in their original order."""
+        return [self.records[i] for i in sorted(compiled.evaluate(self))]
+
+
+@dataclass(frozen=True)
+class CompiledTagFilter:
+    """A parsed tag filter that can be evaluated per resource or on an index."""
+
+    source: str
+    root: Node
+
+    def matches(self, resource_tags: list[dict[str, str]]) -> bool:
+        """Check a single resource's TagList against the filter."""
+        tags = {tag["Key"]: tag["Value"] for tag in resource_tags}
+        return match_node(self.root, tags)
+
+    def matches_tag_dict(self, tags: dict[str, str]) -> bool:
+        """Check tags already collected into a {key: value} dict."""
+        return match_node(self.root, tags)
+
+    def evaluate(self, index: TagIndex) -> frozenset[int] | set[int]:
+        """Return the positions of all indexed records matching the filter."""
+        return evaluate_node(self.root, index)
+
+    def to_and_groups(self) -> list[list[tuple[str, str | None]]] | None:
+        """
+        Expand the filter into OR groups of AND conditions for tag pushdown.
+        Conditions are (key, value) pairs, with value None for key-exists.
+        Returns None when the filter uses NOT, !=, globs or regexes, or
+        expands to more than MAX_PUSHDOWN_GROUPS groups.
+        """
+        return expand_and_groups(self.root)
+
+
+def match_node(node: Node, tags: dict[str, str]) -> bool:
+    match node:
+        case Condition(key=key, op="exists"):
+            return key in tags
+        case Condition(key=key, op="!=", value=value):
+            return tags.get(key) != value
+        case Condition(key=key) if node.op == "~=" or node.is_glob:
+            return key in tags and node.pattern.fullmatch(tags[key]) is not None
+        case Condition(key=key, value=value):
+            return tags.get(key) == value
+        case Not(operand=operand):
+            return not match_node(operand, tags)
+        case And(operands=operands):
+            return all(match_node(operand, tags) for operand in operands)
+        case Or(operands=operands):
+            return any(match_node(operand, tags) for operand in operands)
+    raise TypeError(f"Unknown tag filter node: {node!r}")
+
+
+def evaluate_node(node: Node, index: TagIndex) -> frozenset[int] | set[int]:
+    match node:
+        case Condition(key=key, op="exists"):
+            return index.by_key.get(key, set())
+        case Condition(key=key, op="!=", value=value):
+            return index.all_ids - index.by_pair.get((key, value or ""), set())
+        case Condition(key=key) if node.op == "~=" or node.is_glob:
+            # Match each distinct value once instead of every resource
+            matched: set[int] = set()
+            for value in index.values_by_key.get(key, []):
+                if node.pattern.fullmatch(value):
+                    matched |= index.by_pair[(key, value)]
+            return matched
+        case Condition(key=key, value=value):
+            return index.by_pair.get((key, value or ""), set())
+        case Not(operand=operand):
+            return index.all_ids - evaluate_node(operand, index)
+        case And(operands=operands):
+            # Intersect the smallest sets first
+            sets = sorted((evaluate_node(o, index) for o in operands), key=len)
+            result = set(sets[0])
+            for other in sets[1:]:
+                if not result:
+                    break
+                result &= other
+            return result
+        case Or(operands=operands):
+            union: set[int] = set()
+            for operand in operands:
+                union |= evaluate_node(operand, index)
+            return union
+    raise TypeError(f"Unknown tag filter node: {node!r}")
+
+
+def expand_and_groups(node: Node) -> list[list[tuple[str, str | None]]] | None:
+    match node:
+        case Condition(key=key, op="exists"):
+            return [[(key, None)]]
+        case Condition(key=key, op="=", value=value):
+            return [[(key, value)]]
+        case Or(operands=operands):
+            groups: list[list[tuple[str, str | None]]] = []
+            for operand in operands:
+                expanded = expand_and_groups(operand)
+                if expanded is None:
+                    return None
+                groups.extend(expanded)
+            return groups if len(groups) <= MAX_PUSHDOWN_GROUPS else None
+        case And(operands=operands):
+            product: list[list[tuple[str, str | None]]] = [[]]
+            for operand in operands:
+                expanded = expand_and_groups(operand)
+                if expanded is None:
+                    return None
+                product = [left + right for left in product for right in expanded]
+                if len(product) > MAX_PUSHDOWN_GROUPS:
+                    return None
+            return product
+    return None
+
+
+@lru_cache(maxsize=1024)
+def compile_tag_filter(tag_string: str) -> CompiledTagFilter:
+    """
+    Compile a tag filter string into a predicate.
+    Grammar (OR binds loosest, then AND, then NOT; parentheses group):
+      tag:Key=Value      equals
+      tag:Key!=Value     does not equal, also true when Key is missing
+      tag:Key*=Glob      value matches the glob (* ? and [...])
+      tag:Key~=Regex     value fully matches the regular expression
+      tag:Key            Key is present with any value
+    Unquoted values run to the next AND / OR, so they may contain spaces.
+    Values can be double quoted to hold AND, OR or unbalanced parentheses.
+    Raises TagFilterError (a ValueError) for invalid filters.
+    """
+    return CompiledTagFilter(tag_string, Parser(tokenize(tag_string)).parse())
@@ -0,0 +1,109 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Self
+
+import structlog
+
+from .throttling import AdaptiveConcurrency, is_throttling_error
+
+DEFAULT_TAG_WORKERS = 8
+MAX_THROTTLE_RETRIES = 5
+THROTTLE_BACKOFF = 0.5  # seconds, doubled on every retry
+
+logger = structlog.get_logger()
+
+
+def fetch_tags(
+    client: Any, arn: str, limiter: AdaptiveConcurrency
+) -> tuple[list[dict[str, str]], int]:
+    """
+    Fetch the tags of one resource, retrying throttled calls with backoff.
+    Returns the tag list and the number of API calls it took.
+    """
+    calls = 0
+    while True:
+        limiter.acquire()
+        calls += 1
+        try:
+            response = client.list_tags_for_resource(ResourceName=arn)
+        except Exception as e:
+            if not is_throttling_error(e) or calls > MAX_THROTTLE_RETRIES:
+                raise
+            limiter.record_throttle()
+            logger.debug(
+                f"Throttled fetching tags for {arn}, concurrency now {limiter.limit}"
+            )
+        else:
+            limiter.record_success()
+            tags: list[dict[str, str]] = response["TagList"]
+            return tags, calls
+        finally:
+            limiter.release()
+
+        time.sleep(THROTTLE_BACKOFF * 2 ** (calls - 1))
+
+
+class TagResolver:
+    """
+    Fetches tags for one client through a single thread pool and AIMD limiter.
+    Share one resolver across every page and describe operation of a scan, so
+    throttling back-off lasts for the whole scan and concurrent describe
+    streams never exceed max_workers tag lookups together.
+    """
+
+    def __init__(self, client: Any, max_workers: int = DEFAULT_TAG_WORKERS) -> None:
+        self.client = client
+        self.limiter = AdaptiveConcurrency(max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="tags"
+        )
+
+    def resolve(
+        self, arns: list[str], stats: dict[str, int] | None = None
+    ) -> list[list[dict[str, str]]]:
+        """
+        Fetch tags for many resources concurrently, in the same order as arns.
+        If stats is given, "tag_calls" is increased by the API calls made.
+        """
+        if not arns:
+            return []
+
+        results = list(
+            self._executor.map(
+                lambda arn: fetch_tags(self.client, arn, self.limiter), arns
+            )
+        )
+
+        if stats is not None:
+            stats["tag_calls"] = stats.get("tag_calls", 0) + sum(c for _, c in results)
+
+        return [tags for tags, _ in results]
+
+    def close(self) -> None:
+        """Shut down the thread pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def resolve_tags(
+    client: Any,
+    arns: list[str],
+    max_workers: int = DEFAULT_TAG_WORKERS,
+    stats: dict[str, int] | None = None,
+) -> list[list[dict[str, str]]]:
+    """
+    Fetch tags for many resources concurrently with a one-off TagResolver.
+    Uses a pool of max_workers threads whose effective concurrency is lowered
+    when RDS throttles and raised again as calls succeed. Tag lists are
+    returned in the same order as arns.
+    """
+    if not arns:
+        return []
+
+    with TagResolver(client, min(max_workers, len(arns))) as resolver:
+        return resolver.resolve(arns, stats)
@@ -0,0 +1,86 @@
+import threading
+
+from botocore.exceptions import ClientError
+
+# Error codes AWS returns when a caller exceeds an API rate limit
+THROTTLING_ERROR_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+    "TooManyRequestsException",
+}
+
+# Error codes RDS returns when it cannot take on another snapshot right now.
+# InvalidDBClusterStateFault is not one of them: a stopped or modifying
+# cluster will not accept a snapshot on retry, so it fails on its own
+CAPACITY_ERROR_CODES = {
+    "SnapshotQuotaExceeded",
+    "SnapshotQuotaExceededFault",
+}
+
+
+def get_error_code(error: Exception) -> str | None:
+    """Return the AWS error code of a ClientError, or None for other errors."""
+    if isinstance(error, ClientError):
+        code: str | None = error.response.get("Error", {}).get("Code")
+        return code
+    return None
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Check whether an exception is an AWS API throttling error."""
+    return get_error_code(error) in THROTTLING_ERROR_CODES
+
+
+def is_capacity_error(error: Exception) -> bool:
+    """
+    Check whether an exception means RDS is at its limit of snapshots or API
+    calls, so the operation may succeed later with less concurrency.
+    """
+    return get_error_code(error) in CAPACITY_ERROR_CODES or is_throttling_error(error)
+
+
+class AdaptiveConcurrency:
+    """
+    Concurrency limit adjusted with additive increase, multiplicative decrease.
+    Every successful call grows the limit by 1/limit (about +1 per full window),
+    every throttled call halves it. The limit stays within [minimum, maximum].
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1) -> None:
+        if maximum < 1:
+            raise ValueError("Maximum concurrency must be at least 1")
+        self.maximum = maximum
+        self.minimum = min(minimum, maximum)
+        self._limit = float(maximum)
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Current number of calls allowed in flight."""
+        return max(self.minimum, int(self._limit))
+
+    def acquire(self) -> None:
+        """Block until a slot is free under the current limit."""
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        """Free a slot taken by acquire."""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def record_success(self) -> None:
+        """Additively increase the limit after a healthy call."""
+        with self._condition:
+            self._limit = min(self.maximum, self._limit + 1 / self._limit)
+            self._condition.notify_all()
+
+    def record_throttle(self) -> None:
+        """Multiplicatively decrease the limit after a throttled call."""
+        with self._condition:
+            self._limit = max(self.minimum, self._limit / 2)
@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+DEFAULT_CACHE_TTL = 300  # seconds
+
+
+def get_cache_dir() -> Path:
+    """
+    Return the directory used for sumi's on-disk caches.
+    Uses SUMI_CACHE_DIR if set, otherwise $XDG_CACHE_HOME/sumi or ~/.cache/sumi.
+    """
+    if "SUMI_CACHE_DIR" in os.environ:
+        return Path(os.environ["SUMI_CACHE_DIR"])
+
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "sumi"
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """
+    Write data as JSON so readers never see a partially written file.
+    The data is written to a temporary file in the same directory, flushed to
+    disk and then renamed over the destination.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump(data, file, default=str)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def read_cache(name: str, ttl: float) -> Any | None:
+    """
+    Return the cached value stored under name, or None if it is missing,
+    unreadable or older than ttl seconds.
+    """
+    path = get_cache_dir() / f"{name}.json"
+    try:
+        with open(path, "r") as file:
+            entry = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    if time.time() - entry.get("created_at", 0) > ttl:
+        return None
+    return entry.get("data")
+
+
+def write_cache(name: str, data: Any) -> None:
+    """Store a JSON-serializable value under name, stamped with the current time."""
+    path = get_cache_dir() / f"{name}.json"
+    write_json_atomic(path, {"created_at": time.time(), "data": data})
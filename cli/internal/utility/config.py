@@ -1,6 +1,10 @@
-import yaml
+from datetime import UTC, datetime
 from typing import Any
 
+import yaml
+
+from .cron import CronSchedule
+
 
 def read_config(file_path: str) -> dict[str, Any]:
     if file_path is None:
@@ -9,3 +13,42 @@ def read_config(file_path: str) -> dict[str, Any]:
     with open(file_path, "r") as file:
         config: dict[str, Any] = yaml.safe_load(file)
     return config
+
+
+def get_regions(config: dict[str, Any]) -> list[str]:
+    """
+    Return the regions to operate in.
+    provider.region may be a single region name or a list of them.
+    """
+    region = config["provider"]["region"]
+    regions = [region] if isinstance(region, str) else region
+
+    if (
+        not isinstance(regions, list)
+        or not regions
+        or not all(isinstance(name, str) and name for name in regions)
+    ):
+        raise ValueError(
+            "provider.region must be a region name or a list of region names"
+        )
+
+    return list(dict.fromkeys(regions))
+
+
+def get_schedule(config: dict[str, Any]) -> CronSchedule | None:
+    """
+    Return the optional top-level `schedule` cron expression used by serve,
+    or None without one. Raises ValueError for an invalid expression or one
+    that never runs, e.g. on February 30.
+    """
+    schedule = config.get("schedule")
+    if schedule is None:
+        return None
+    if not isinstance(schedule, str) or not schedule.strip():
+        raise ValueError("schedule must be a cron expression string")
+    try:
+        cron = CronSchedule(schedule)
+        cron.next_after(datetime.now(UTC))
+    except ValueError as e:
+        raise ValueError(f"Invalid schedule: {e}") from None
+    return cron
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+# Shorthands accepted in place of the five fields
+CRON_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+    "@yearly": "0 0 1 1 *",
+}
+
+# (name, lowest, highest) of minute, hour, day of month, month and day of week
+CRON_FIELDS = [
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day of month", 1, 31),
+    ("month", 1, 12),
+    ("day of week", 0, 7),
+]
+
+# Days searched for a next run before a schedule is considered impossible
+MAX_SEARCH_DAYS = 366 * 5
+
+
+def parse_cron_field(field: str, name: str, low: int, high: int) -> set[int]:
+    """
+    Return the values a cron field matches. Supports *, numbers, ranges
+    (a-b), steps (*/n, a-b/n) and comma separated lists of them.
+    Raises ValueError for malformed fields or values out of range.
+    """
+    values: set[int] = set()
+    for part in field.split(","):
+        base, _, step_text = part.partition("/")
+        try:
+            step = int(step_text) if step_text else 1
+            if base == "*":
+                start, end = low, high
+            elif "-" in base:
+                start_text, end_text = base.split("-", 1)
+                start, end = int(start_text), int(end_text)
+            else:
+                start = end = int(base)
+                if step_text:
+                    end = high
+        except ValueError:
+            raise ValueError(f"Invalid {name} field: {field}") from None
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"Invalid {name} field: {field}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """
+    Five-field cron expression (minute hour day-of-month month day-of-week)
+    or one of CRON_ALIASES. Like cron, when both day fields are restricted a
+    day matching either of them matches, and Sunday is 0 or 7.
+    Raises ValueError for invalid expressions.
+    """
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        fields = CRON_ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(f"Cron expression must have 5 fields: {expression}")
+
+        parsed = [
+            parse_cron_field(field, name, low, high)
+            for field, (name, low, high) in zip(fields, CRON_FIELDS)
+        ]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {day % 7 for day in weekdays}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def matches_day(self, day: datetime) -> bool:
+        """Return whether the schedule runs on the date of day."""
+        if day.month not in self.months:
+            return False
+        in_days = day.day in self.days
+        # datetime counts Monday as 0, cron counts Sunday as 0
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+
+    def next_after(self, after: datetime) -> datetime:
+        """
+        Return the first run time strictly after after, in after's timezone.
+        Raises ValueError if the schedule never runs, e.g. on February 30.
+        """
+        start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.replace(hour=0, minute=0)
+        for _ in range(MAX_SEARCH_DAYS):
+            if self.matches_day(day):
+                for hour in sorted(self.hours):
+                    for minute in sorted(self.minutes):
+                        candidate = day.replace(hour=hour, minute=minute)
+                        if candidate >= start:
+                            return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"Cron expression never runs: {self.expression}")
@@ -0,0 +1,86 @@
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import UTC, datetime
+from typing import Any
+
+import structlog
+from botocore.exceptions import BotoCoreError, ClientError
+
+logger = structlog.get_logger()
+
+
+class CronRunner:
+    """
+    Runs jobs on their cron schedules until stopped.
+    jobs are dicts with a unique name and a CronSchedule. Every due job
+    runs on its own thread, so jobs of different schedules overlap. A job
+    still running when it is due again is skipped for that slot rather than
+    run twice at once. A failing run is logged and the job stays scheduled.
+    Schedules are evaluated in UTC.
+    """
+
+    def __init__(
+        self,
+        jobs: list[dict[str, Any]],
+        run: Callable[[dict[str, Any]], Any],
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ) -> None:
+        self.jobs = jobs
+        self.run = run
+        self.clock = clock
+        self.runs = 0
+        self.skipped = 0
+        self._running: dict[str, Future] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(len(jobs), 1), thread_name_prefix="job"
+        )
+        now = clock()
+        self._next_run = {job["name"]: job["schedule"].next_after(now) for job in jobs}
+
+    def next_run(self) -> datetime | None:
+        """Return when the earliest job is due next."""
+        return min(self._next_run.values(), default=None)
+
+    def run_due(self) -> list[str]:
+        """Start every job that is due, return the names of those started."""
+        now = self.clock()
+        started = []
+        for job in self.jobs:
+            name = job["name"]
+            if self._next_run[name] > now:
+                continue
+            self._next_run[name] = job["schedule"].next_after(now)
+
+            running = self._running.get(name)
+            if running is not None and not running.done():
+                logger.warning(f"Previous run of {name} is still running, skipping")
+                self.skipped += 1
+                continue
+
+            logger.info(f"Starting scheduled run of {name}")
+            self._running[name] = self._executor.submit(self._run_job, job)
+            self.runs += 1
+            started.append(name)
+        return started
+
+    def serve(self, stop: threading.Event) -> None:
+        """Start due jobs until stop is set, then wait for running jobs."""
+        try:
+            while not stop.is_set():
+                self.run_due()
+                next_run = self.next_run()
+                if next_run is None:
+                    break
+                stop.wait(max((next_run - self.clock()).total_seconds(), 0.0))
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def _run_job(self, job: dict[str, Any]) -> None:
+        structlog.contextvars.bind_contextvars(job=job["name"])
+        try:
+            self.run(job)
+        except (ClientError, BotoCoreError, OSError, ValueError) as e:
+            logger.error(f"Scheduled run of {job['name']} failed: {e}")
+        finally:
+            structlog.contextvars.unbind_contextvars("job")
@@ -0,0 +1,19 @@
+import pytest
+
+from cli.internal.aws.client import client_pool
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep on-disk caches of every test in its own temporary directory."""
+    cache_dir = tmp_path / "sumi-cache"
+    monkeypatch.setenv("SUMI_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture(autouse=True)
+def isolated_client_pool():
+    """Start every test with an empty client pool."""
+    client_pool.clear()
+    yield client_pool
+    client_pool.clear()
@@ -0,0 +1,484 @@
+"""Integration tests for the backup command."""
+
+from unittest.mock import patch
+
+import boto3
+from botocore.exceptions import EndpointConnectionError
+from moto import mock_aws
+from typer.testing import CliRunner
+
+from cli.commands.backup import app
+from cli.internal.aws.client import client_pool
+from cli.internal.aws.journal import RunJournal
+from cli.internal.aws.resource_filtering import iter_fleet
+from cli.internal.aws.snapshotting import (
+    create_cluster_snapshot,
+    iter_sumi_snapshots,
+    list_latest_snapshots,
+)
+
+runner = CliRunner()
+
+CONFIG = """
+app: "backup-app"
+
+provider:
+  name: aws
+  region: us-east-1
+
+auth:
+  profile: "test-profile"
+
+backup:
+  resources:
+    - type: rds
+      name: payments
+      discover: "tag:Team=payments"
+    - type: rds
+      name: search
+      discover: "tag:Team=search"
+"""
+
+
+def create_cluster(client, name, team):
+    client.create_db_cluster(
+        DBClusterIdentifier=name,
+        Engine="aurora-postgresql",
+        MasterUsername="admin",
+        MasterUserPassword="password123",
+        Tags=[{"Key": "Team", "Value": team}],
+    )
+
+
+def backup_snapshots(client):
+    return sorted(
+        s["DBClusterIdentifier"]
+        for s in client.describe_db_cluster_snapshots()["DBClusterSnapshots"]
+        if s["DBClusterSnapshotIdentifier"].startswith("backup-")
+    )
+
+
+@mock_aws
+@patch("cli.commands.backup.create_session")
+def test_backup_all_groups(mock_session, mock_aws_credentials, tmp_path):
+    """Every group's clusters are backed up from one streamed scan."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+    client = boto3.client("rds", region_name="us-east-1")
+    create_cluster(client, "payments-1", "payments")
+    create_cluster(client, "payments-2", "payments")
+    create_cluster(client, "search-1", "search")
+
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(CONFIG)
+
+    with (
+        patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1),
+        patch(
+            "cli.internal.aws.discovery.iter_fleet",
+            wraps=iter_fleet,
+        ) as fleet_scan,
+    ):
+        result = runner.invoke(app, ["--config", str(config_path), "--parallel", "2"])
+
+    assert result.exit_code == 0
+    assert fleet_scan.call_count == 1
+    assert backup_snapshots(client) == ["payments-1", "payments-2", "search-1"]
+
+
+@mock_aws
+@patch("cli.commands.backup.create_session")
+def test_backup_group_without_matches(mock_session, mock_aws_credentials, tmp_path):
+    """A group without matches does not stop the others."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+    client = boto3.client("rds", region_name="us-east-1")
+    create_cluster(client, "search-1", "search")
+
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(CONFIG)
+
+    with patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1):
+        result = runner.invoke(app, ["--config", str(config_path)])
+
+    assert result.exit_code == 0
+    assert backup_snapshots(client) == ["search-1"]
+
+
+@mock_aws
+@patch("cli.commands.backup.create_session")
+def test_backup_schedules_groups_together(mock_session, mock_aws_credentials, tmp_path):
+    """Groups share --parallel, honouring priority and max_parallel."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+    client = boto3.client("rds", region_name="us-east-1")
+    for i in range(3):
+        create_cluster(client, f"payments-{i}", "payments")
+    create_cluster(client, "search-1", "search")
+
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(
+        CONFIG.replace(
+            'discover: "tag:Team=search"',
+            'discover: "tag:Team=search"\n      priority: 10',
+        ).replace(
+            'discover: "tag:Team=payments"',
+            'discover: "tag:Team=payments"\n      max_parallel: 1',
+        )
+    )
+
+    with patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1):
+        result = runner.invoke(app, ["--config", str(config_path), "--parallel", "4"])
+
+    assert result.exit_code == 0
+    assert backup_snapshots(client) == [
+        "payments-0",
+        "payments-1",
+        "payments-2",
+        "search-1",
+    ]
+
+
+@mock_aws
+@patch("cli.commands.backup.create_session")
+def test_backup_multiple_regions(mock_session, mock_aws_credentials, tmp_path):
+    """Every listed region is discovered and backed up."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+    east = boto3.client("rds", region_name="us-east-1")
+    west = boto3.client("rds", region_name="eu-west-1")
+    create_cluster(east, "payments-east", "payments")
+    create_cluster(west, "payments-west", "payments")
+
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(
+        CONFIG.replace("region: us-east-1", "region: [us-east-1, eu-west-1]")
+    )
+
+    with patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1):
+        result = runner.invoke(app, ["--config", str(config_path)])
+
+    assert result.exit_code == 0
+    assert backup_snapshots(east) == ["payments-east"]
+    assert backup_snapshots(west) == ["payments-west"]
+
+
+@mock_aws
+@patch("cli.commands.backup.backup_resource_groups")
+@patch("cli.commands.backup.create_session")
+def test_backup_region_failure_is_isolated(
+    mock_session, mock_backup, mock_aws_credentials, tmp_path
+):
+    """A failing region is reported without stopping the others."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+
+    def backup_region(resource_configs, session, region, *args):
+        if region == "eu-west-1":
+            raise EndpointConnectionError(endpoint_url="https://rds.eu-west-1")
+        return []
+
+    mock_backup.side_effect = backup_region
+
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(
+        CONFIG.replace("region: us-east-1", "region: [us-east-1, eu-west-1]")
+    )
+
+    result = runner.invoke(app, ["--config", str(config_path)])
+
+    assert result.exit_code == 1
+    assert sorted(call.args[2] for call in mock_backup.call_args_list) == [
+        "eu-west-1",
+        "us-east-1",
+    ]
+
+
+def assume_role_session(role_arn):
+    credentials = boto3.client("sts", region_name="us-east-1").assume_role(
+        RoleArn=role_arn, RoleSessionName="test"
+    )["Credentials"]
+    return boto3.Session(
+        aws_access_key_id=credentials["AccessKeyId"],
+        aws_secret_access_key=credentials["SecretAccessKey"],
+        aws_session_token=credentials["SessionToken"],
+        region_name="us-east-1",
+    )
+
+
+ACCOUNTS_CONFIG = CONFIG.replace(
+    "backup:",
+    """accounts:
+  - name: payments-prod
+    role_arn: arn:aws:iam::111111111111:role/SnapctlBackup
+  - name: search-prod
+    role_arn: arn:aws:iam::222222222222:role/SnapctlBackup
+  - name: broken
+    profile: does-not-exist
+
+backup:""",
+)
+
+
+@mock_aws
+@patch("cli.commands.backup.create_session")
+def test_backup_multiple_accounts(mock_session, mock_aws_credentials, tmp_path):
+    """Each account is backed up with its assumed role; a broken one is isolated."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+    payments = assume_role_session("arn:aws:iam::111111111111:role/SnapctlBackup")
+    search = assume_role_session("arn:aws:iam::222222222222:role/SnapctlBackup")
+    payments_rds = payments.client("rds")
+    search_rds = search.client("rds")
+    create_cluster(payments_rds, "payments-1", "payments")
+    create_cluster(search_rds, "search-1", "search")
+
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(ACCOUNTS_CONFIG)
+
+    with patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1):
+        result = runner.invoke(app, ["--config", str(config_path)])
+
+    # The broken account fails the run without stopping the others
+    assert result.exit_code == 1
+    assert backup_snapshots(payments_rds) == ["payments-1"]
+    assert backup_snapshots(search_rds) == ["search-1"]
+
+
+@mock_aws
+@patch("cli.commands.backup.create_session")
+def test_backup_creates_constant_number_of_clients(
+    mock_session, mock_aws_credentials, tmp_path
+):
+    """Clients are created once per service, whatever the number of snapshots."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+    client = boto3.client("rds", region_name="us-east-1")
+    for i in range(6):
+        create_cluster(client, f"payments-{i}", "payments")
+
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(CONFIG)
+
+    with patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1):
+        result = runner.invoke(app, ["--config", str(config_path), "--parallel", "3"])
+
+    assert result.exit_code == 0
+    assert len(backup_snapshots(client)) == 6
+    # rds for discovery, snapshots and polling, and sts for the cache key
+    assert client_pool.stats()["misses"] == 2
+    # 3 snapshot slots + 1 poller, 2 describe threads + 8 tag workers
+    assert client_pool.max_pool_connections == 14
+
+
+@mock_aws
+@patch("cli.commands.backup.create_session")
+def test_backup_rate_limits_rds_calls(mock_session, mock_aws_credentials, tmp_path):
+    """Discovery, creates and polls share one RDS rate limiter per region."""
+    session = boto3.Session(region_name="us-east-1")
+    mock_session.return_value = session
+    client = boto3.client("rds", region_name="us-east-1")
+    create_cluster(client, "payments-1", "payments")
+    create_cluster(client, "search-1", "search")
+
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(CONFIG + "\napi:\n  rds_rate: 40\n")
+
+    with patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1):
+        result = runner.invoke(app, ["--config", str(config_path)])
+
+    assert result.exit_code == 0
+    limiter = client_pool.rate_limiter(session, "us-east-1")
+    assert limiter.max_rate == 40
+    # Two describe pages, two creates and at least one status check
+    assert limiter.calls >= 5
+
+
+@mock_aws
+@patch("cli.commands.backup.create_session")
+def test_backup_resume_reattaches(mock_session, mock_aws_credentials, tmp_path):
+    """--resume polls the snapshots a crashed run started instead of recreating them."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+    client = boto3.client("rds", region_name="us-east-1")
+    create_cluster(client, "payments-1", "payments")
+    create_cluster(client, "payments-2", "payments")
+    cluster = client.describe_db_clusters(DBClusterIdentifier="payments-1")[
+        "DBClusters"
+    ][0]
+    snapshot = client.create_db_cluster_snapshot(
+        DBClusterSnapshotIdentifier="backup-payments-1-crashed",
+        DBClusterIdentifier="payments-1",
+    )["DBClusterSnapshot"]
+
+    # The crashed run had started payments-1 when it died
+    journal = RunJournal.create("crashed", "backup-config.yml")
+    journal.record(
+        "initiated",
+        "payments",
+        cluster,
+        "us-east-1",
+        snapshot_id=snapshot["DBClusterSnapshotIdentifier"],
+        snapshot_arn=snapshot["DBClusterSnapshotArn"],
+    )
+
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(CONFIG)
+
+    with patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1):
+        result = runner.invoke(
+            app, ["--config", str(config_path), "--resume", "crashed"]
+        )
+
+    assert result.exit_code == 0
+    assert backup_snapshots(client) == ["payments-1", "payments-2"]
+    resumed = RunJournal.load("crashed")
+    assert resumed.get("payments", cluster)["status"] == "available"
+
+
+def test_backup_resume_unknown_run(mock_aws_credentials, tmp_path):
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(CONFIG)
+
+    result = runner.invoke(app, ["--config", str(config_path), "--resume", "nope"])
+
+    assert result.exit_code == 1
+
+
+@mock_aws
+@patch("cli.commands.backup.create_session")
+def test_backup_skips_fresh_clusters(mock_session, mock_aws_credentials, tmp_path):
+    """Clusters with a snapshot younger than min_interval are not snapshotted."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+    client = boto3.client("rds", region_name="us-east-1")
+    create_cluster(client, "payments-1", "payments")
+    create_cluster(client, "payments-2", "payments")
+    create_cluster(client, "search-1", "search")
+    create_cluster_snapshot(
+        "payments-1", "backup", mock_session.return_value, "us-east-1"
+    )
+
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(
+        CONFIG.replace(
+            'discover: "tag:Team=payments"',
+            'discover: "tag:Team=payments"\n      min_interval: 3600',
+        )
+    )
+
+    with (
+        patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1),
+        patch(
+            "cli.internal.aws.freshness.list_latest_snapshots",
+            wraps=list_latest_snapshots,
+        ) as listing,
+    ):
+        result = runner.invoke(app, ["--config", str(config_path)])
+
+    assert result.exit_code == 0
+    assert listing.call_count == 1
+    # payments-1 keeps its recent snapshot, the others get a new one
+    assert backup_snapshots(client) == ["payments-1", "payments-2", "search-1"]
+
+
+@mock_aws
+@patch("cli.commands.backup.create_session")
+def test_backup_copies_to_other_region(mock_session, mock_aws_credentials, tmp_path):
+    """Encrypted snapshots are copied with the destination region's key."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+    client = boto3.client("rds", region_name="us-east-1")
+    source_key = boto3.client("kms", region_name="us-east-1").create_key()
+    target_key = boto3.client("kms", region_name="us-west-2").create_key()
+    client.create_db_cluster(
+        DBClusterIdentifier="payments-1",
+        Engine="aurora-postgresql",
+        MasterUsername="admin",
+        MasterUserPassword="password123",
+        StorageEncrypted=True,
+        KmsKeyId=source_key["KeyMetadata"]["Arn"],
+        Tags=[{"Key": "Team", "Value": "payments"}],
+    )
+    create_cluster(client, "payments-2", "payments")
+
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(
+        CONFIG.replace(
+            'discover: "tag:Team=payments"',
+            'discover: "tag:Team=payments"\n'
+            "      copy_to:\n"
+            "        region: us-west-2\n"
+            f"        kms_key_id: {target_key['KeyMetadata']['Arn']}",
+        )
+    )
+
+    with patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1):
+        result = runner.invoke(app, ["--config", str(config_path)])
+
+    assert result.exit_code == 0
+    target = boto3.client("rds", region_name="us-west-2")
+    assert backup_snapshots(target) == ["payments-1", "payments-2"]
+    keys = {
+        s["DBClusterIdentifier"]: s.get("KmsKeyId")
+        for s in target.describe_db_cluster_snapshots()["DBClusterSnapshots"]
+    }
+    assert keys["payments-1"] == target_key["KeyMetadata"]["Arn"]
+
+
+@mock_aws
+@patch("cli.commands.backup.create_session")
+def test_backup_copies_are_told_apart(mock_session, mock_aws_credentials, tmp_path):
+    """Copies skip the source region and are not taken for local snapshots."""
+    session = boto3.Session(region_name="us-east-1")
+    mock_session.return_value = session
+    client = boto3.client("rds", region_name="us-east-1")
+    create_cluster(client, "payments-1", "payments")
+
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(
+        CONFIG.replace(
+            'discover: "tag:Team=payments"',
+            'discover: "tag:Team=payments"\n'
+            "      copy_to: [{region: us-east-1}, {region: us-west-2}]",
+        )
+    )
+
+    with patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1):
+        result = runner.invoke(app, ["--config", str(config_path)])
+
+    assert result.exit_code == 0
+    assert backup_snapshots(client) == ["payments-1"]
+    assert list(iter_sumi_snapshots(session, "us-west-2")) == []
+    [copy] = iter_sumi_snapshots(session, "us-west-2", include_copies=True)
+    tags = {t["Key"]: t["Value"] for t in copy["TagList"]}
+    assert tags["origin"] == "snapctl-copy"
+    assert tags["group"] == "payments"
+    assert tags["sourceRegion"] == "us-east-1"
+
+
+@mock_aws
+@patch("cli.commands.backup.create_session")
+def test_backup_shares_with_accounts(mock_session, mock_aws_credentials, tmp_path):
+    """Snapshots of a group with share_with can be restored by those accounts."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+    client = boto3.client("rds", region_name="us-east-1")
+    create_cluster(client, "payments-1", "payments")
+    create_cluster(client, "search-1", "search")
+
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(
+        CONFIG.replace(
+            'discover: "tag:Team=payments"',
+            'discover: "tag:Team=payments"\n      share_with: ["111111111111"]',
+        )
+    )
+
+    with patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1):
+        result = runner.invoke(app, ["--config", str(config_path)])
+
+    assert result.exit_code == 0
+    shared = {}
+    for snapshot in client.describe_db_cluster_snapshots()["DBClusterSnapshots"]:
+        if not snapshot["DBClusterSnapshotIdentifier"].startswith("backup-"):
+            continue
+        attributes = client.describe_db_cluster_snapshot_attributes(
+            DBClusterSnapshotIdentifier=snapshot["DBClusterSnapshotIdentifier"]
+        )["DBClusterSnapshotAttributesResult"]["DBClusterSnapshotAttributes"]
+        shared[snapshot["DBClusterIdentifier"]] = [
+            value
+            for attribute in attributes
+            if attribute["AttributeName"] == "restore"
+            for value in attribute["AttributeValues"]
+        ]
+    assert shared == {"payments-1": ["111111111111"], "search-1": []}
@@ -1,7 +1,9 @@
-from moto import mock_aws
-import boto3
+import threading
 from unittest.mock import patch
 
+import boto3
+from moto import mock_aws
+
 from cli.internal.aws.backup import backup_rds_resources
 
 
@@ -28,7 +30,7 @@ def test_backup_single_cluster(mock_aws_credentials):
         }
     ]
 
-    with patch("cli.internal.aws.backup.POLL_INTERVAL", 0.1):
+    with patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1):
         backup_rds_resources(resources, session, "us-east-1", parallel=1)
 
     # Verify snapshot was created - filter for backup snapshots only
@@ -68,7 +70,7 @@ def test_backup_respects_parallel_limit(mock_aws_credentials):
         for i in range(1, 6)
     ]
 
-    with patch("cli.internal.aws.backup.POLL_INTERVAL", 0.1):
+    with patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1):
         backup_rds_resources(resources, session, "us-east-1", parallel=2)
 
     # All 5 clusters should be backed up
@@ -115,7 +117,7 @@ def test_backup_handles_unavailable_clusters(mock_aws_credentials):
         },
     ]
 
-    with patch("cli.internal.aws.backup.POLL_INTERVAL", 0.1):
+    with patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1):
         backup_rds_resources(resources, session, "us-east-1", parallel=2)
 
     # Only 2 snapshots should be created (cluster-1 and cluster-3)
@@ -188,18 +190,19 @@ def test_backup_polls_until_complete(mock_aws_credentials):
     poll_count = 0
 
     # Import the actual function to call
-    from cli.internal.aws.snapshotting import check_snapshot_status as real_check
+    from cli.internal.aws.snapshotting import describe_cluster_snapshots as real_check
 
-    def track_polling(snapshot_id, session, region):
+    def track_polling(snapshot_ids, session, region):
         nonlocal poll_count
         poll_count += 1
-        return real_check(snapshot_id, session, region)
+        return real_check(snapshot_ids, session, region)
 
     # Patch where it's USED (in backup module), not where it's defined
     with (
-        patch("cli.internal.aws.backup.POLL_INTERVAL", 0.1),
+        patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1),
         patch(
-            "cli.internal.aws.backup.check_snapshot_status", side_effect=track_polling
+            "cli.internal.aws.backup.describe_cluster_snapshots",
+            side_effect=track_polling,
         ),
     ):
         backup_rds_resources(resources, session, "us-east-1", parallel=1)
@@ -248,7 +251,7 @@ def test_backup_parallel_higher_than_resource_count(mock_aws_credentials):
     ]
 
     # Parallel limit of 10 but only 2 resources
-    with patch("cli.internal.aws.backup.POLL_INTERVAL", 0.1):
+    with patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1):
         backup_rds_resources(resources, session, "us-east-1", parallel=10)
 
     # Should still create 2 snapshots
@@ -259,3 +262,50 @@ def test_backup_parallel_higher_than_resource_count(mock_aws_credentials):
         if s["DBClusterSnapshotIdentifier"].startswith("backup-")
     ]
     assert len(backup_snapshots) == 2
+
+
+@mock_aws
+def test_backup_starts_snapshots_while_streaming(mock_aws_credentials):
+    """Snapshots start before the resource stream is fully read."""
+    client = boto3.client("rds", region_name="us-east-1")
+
+    for i in range(1, 3):
+        client.create_db_cluster(
+            DBClusterIdentifier=f"stream-{i}",
+            Engine="aurora-postgresql",
+            MasterUsername="admin",
+            MasterUserPassword="password123",
+        )
+
+    session = boto3.Session(region_name="us-east-1")
+    first_started = threading.Event()
+    started_before_next = []
+
+    def resource_stream():
+        for i in range(1, 3):
+            yield {
+                "DBClusterIdentifier": f"stream-{i}",
+                "Engine": "aurora-postgresql",
+                "Status": "available",
+            }
+            # Discovery of the rest is still running when the first snapshot starts
+            started_before_next.append(first_started.wait(timeout=5))
+
+    from cli.internal.aws.snapshotting import initiate_snapshot as real_initiate
+
+    def track_initiate(resource, session, region):
+        result = real_initiate(resource, session, region)
+        if resource["DBClusterIdentifier"] == "stream-1":
+            first_started.set()
+        return result
+
+    with (
+        patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1),
+        patch("cli.internal.aws.backup.initiate_snapshot", side_effect=track_initiate),
+    ):
+        results = backup_rds_resources(
+            resource_stream(), session, "us-east-1", parallel=2
+        )
+
+    assert started_before_next[0] is True
+    assert sorted(r["cluster"] for r in results) == ["stream-1", "stream-2"]
@@ -0,0 +1,263 @@
+from unittest.mock import patch
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from cli.internal.aws.discovery import (
+    discover_resource_groups,
+    get_discovery_settings,
+    stream_resource_groups,
+)
+from cli.internal.aws.resource_filtering import scan_fleet
+
+
+@pytest.fixture
+def mock_rds_fleet():
+    """Create a small fleet of RDS instances and clusters owned by two teams."""
+    with mock_aws():
+        client = boto3.client("rds", region_name="us-east-1")
+
+        for team in ["payments", "search"]:
+            client.create_db_instance(
+                DBInstanceIdentifier=f"{team}-db",
+                DBInstanceClass="db.t3.micro",
+                Engine="postgres",
+                MasterUsername="admin",
+                MasterUserPassword="password123",
+                Tags=[{"Key": "Team", "Value": team}],
+            )
+            client.create_db_cluster(
+                DBClusterIdentifier=f"{team}-cluster",
+                Engine="aurora-postgresql",
+                MasterUsername="admin",
+                MasterUserPassword="password123",
+                Tags=[{"Key": "Team", "Value": team}],
+            )
+
+        yield client
+
+
+def identifier(resource):
+    return resource.get("DBInstanceIdentifier") or resource["DBClusterIdentifier"]
+
+
+def group(name, discover, service="rds"):
+    return {"type": service, "name": name, "discover": discover}
+
+
+class TestDiscoverResourceGroups:
+    """Test the shared-scan discovery engine."""
+
+    def test_groups_share_one_scan(self, mock_aws_credentials, mock_rds_fleet):
+        """The fleet is described once no matter how many groups there are."""
+        session = boto3.Session(region_name="us-east-1")
+        configs = [
+            group("payments", "tag:Team=payments"),
+            group("search", "tag:Team=search"),
+            group("everyone", "tag:Team=payments OR tag:Team=search"),
+        ]
+
+        with patch("cli.internal.aws.discovery.scan_fleet", wraps=scan_fleet) as scan:
+            groups = discover_resource_groups(configs, session, "us-east-1")
+
+        assert scan.call_count == 1
+        assert [len(g["resources"]) for g in groups] == [2, 2, 4]
+        assert [g["name"] for g in groups] == ["payments", "search", "everyone"]
+
+    def test_inventory_is_reused_across_calls(
+        self, mock_aws_credentials, mock_rds_fleet
+    ):
+        """A caller-provided inventory avoids rescanning."""
+        session = boto3.Session(region_name="us-east-1")
+        inventory: dict = {}
+
+        discover_resource_groups(
+            [group("payments", "tag:Team=payments")],
+            session,
+            "us-east-1",
+            inventory=inventory,
+        )
+        assert list(inventory) == [("us-east-1", "rds")]
+
+        # Later changes to the fleet are not seen through the same inventory
+        mock_rds_fleet.delete_db_instance(
+            DBInstanceIdentifier="payments-db", SkipFinalSnapshot=True
+        )
+        groups = discover_resource_groups(
+            [group("payments", "tag:Team=payments")],
+            session,
+            "us-east-1",
+            inventory=inventory,
+        )
+        assert len(groups[0]["resources"]) == 2
+
+    def test_unsupported_service_is_isolated(
+        self, mock_aws_credentials, mock_rds_fleet
+    ):
+        """A failing group carries its error without hiding other groups."""
+        session = boto3.Session(region_name="us-east-1")
+        configs = [
+            group("volumes", "tag:Team=payments", service="ebs"),
+            group("payments", "tag:Team=payments"),
+        ]
+
+        groups = discover_resource_groups(configs, session, "us-east-1")
+
+        assert isinstance(groups[0]["error"], ValueError)
+        assert groups[0]["resources"] == []
+        assert "error" not in groups[1]
+        assert len(groups[1]["resources"]) == 2
+
+    def test_pushdown_mode(self, mock_aws_credentials, mock_rds_fleet):
+        """Pushdown mode resolves each group through the tagging API."""
+        session = boto3.Session(region_name="us-east-1")
+        settings = get_discovery_settings({"discovery": {"mode": "pushdown"}})
+
+        groups = discover_resource_groups(
+            [group("search", "tag:Team=search")], session, "us-east-1", settings
+        )
+
+        identifiers = sorted(
+            r.get("DBInstanceIdentifier") or r["DBClusterIdentifier"]
+            for r in groups[0]["resources"]
+        )
+        assert identifiers == ["search-cluster", "search-db"]
+
+
+class TestInventoryCache:
+    """Test reuse of the on-disk inventory between runs."""
+
+    def delete_payments_db(self, client):
+        client.delete_db_instance(
+            DBInstanceIdentifier="payments-db", SkipFinalSnapshot=True
+        )
+
+    def test_second_run_reuses_cached_inventory(
+        self, mock_aws_credentials, mock_rds_fleet
+    ):
+        """A later run within the TTL does not rescan the fleet."""
+        session = boto3.Session(region_name="us-east-1")
+        configs = [group("payments", "tag:Team=payments")]
+
+        discover_resource_groups(configs, session, "us-east-1")
+        self.delete_payments_db(mock_rds_fleet)
+
+        with patch("cli.internal.aws.discovery.scan_fleet") as scan:
+            groups = discover_resource_groups(configs, session, "us-east-1")
+
+        scan.assert_not_called()
+        assert len(groups[0]["resources"]) == 2
+
+    def test_refresh_rescans_and_rewrites(self, mock_aws_credentials, mock_rds_fleet):
+        """refresh_cache ignores the cached inventory and replaces it."""
+        session = boto3.Session(region_name="us-east-1")
+        configs = [group("payments", "tag:Team=payments")]
+        settings = get_discovery_settings({})
+
+        discover_resource_groups(configs, session, "us-east-1", settings)
+        self.delete_payments_db(mock_rds_fleet)
+
+        settings["refresh_cache"] = True
+        groups = discover_resource_groups(configs, session, "us-east-1", settings)
+        assert len(groups[0]["resources"]) == 1
+
+        settings["refresh_cache"] = False
+        groups = discover_resource_groups(configs, session, "us-east-1", settings)
+        assert len(groups[0]["resources"]) == 1
+
+    def test_no_cache(self, mock_aws_credentials, mock_rds_fleet, isolated_cache_dir):
+        """use_cache=False neither writes nor reads the cache."""
+        session = boto3.Session(region_name="us-east-1")
+        settings = get_discovery_settings({})
+        settings["use_cache"] = False
+
+        discover_resource_groups(
+            [group("payments", "tag:Team=payments")], session, "us-east-1", settings
+        )
+
+        assert not isolated_cache_dir.exists()
+
+    def test_expired_cache_is_rescanned(self, mock_aws_credentials, mock_rds_fleet):
+        """A zero TTL always rescans."""
+        session = boto3.Session(region_name="us-east-1")
+        configs = [group("payments", "tag:Team=payments")]
+        settings = get_discovery_settings({"discovery": {"cache_ttl": 0}})
+
+        discover_resource_groups(configs, session, "us-east-1", settings)
+        self.delete_payments_db(mock_rds_fleet)
+        groups = discover_resource_groups(configs, session, "us-east-1", settings)
+
+        assert len(groups[0]["resources"]) == 1
+
+
+class TestGetDiscoverySettings:
+    """Test discovery config parsing."""
+
+    def test_defaults(self):
+        """Missing discovery block falls back to scan mode."""
+        settings = get_discovery_settings({})
+        assert settings["mode"] == "scan"
+        assert settings["tag_workers"] == 8
+
+    def test_rejects_unknown_mode(self):
+        """Unknown modes raise ValueError."""
+        with pytest.raises(ValueError, match="Unsupported discovery mode"):
+            get_discovery_settings({"discovery": {"mode": "guess"}})
+
+    def test_rejects_negative_cache_ttl(self):
+        """cache_ttl cannot be negative."""
+        with pytest.raises(ValueError, match="cache_ttl"):
+            get_discovery_settings({"discovery": {"cache_ttl": -1}})
+
+    def test_rejects_bad_tag_workers(self):
+        """tag_workers must be a positive integer."""
+        with pytest.raises(ValueError, match="tag_workers"):
+            get_discovery_settings({"discovery": {"tag_workers": 0}})
+
+
+class TestStreamResourceGroups:
+    """Test streaming discovery."""
+
+    def test_stream_matches_discovery(self, mock_aws_credentials, mock_rds_fleet):
+        """Streamed groups contain the same resources as discovered groups."""
+        session = boto3.Session(region_name="us-east-1")
+        configs = [
+            group("payments", "tag:Team=payments"),
+            group("search", "tag:Team=search"),
+        ]
+        settings = get_discovery_settings({})
+        settings["use_cache"] = False
+
+        streamed = stream_resource_groups(configs, session, "us-east-1", settings)
+        discovered = discover_resource_groups(configs, session, "us-east-1", settings)
+
+        for streamed_group, discovered_group in zip(streamed, discovered):
+            assert sorted(map(identifier, streamed_group["resources"])) == sorted(
+                map(identifier, discovered_group["resources"])
+            )
+
+    def test_stream_fills_cache_when_exhausted(
+        self, mock_aws_credentials, mock_rds_fleet
+    ):
+        """Completing a streamed scan caches it for the next run."""
+        session = boto3.Session(region_name="us-east-1")
+        configs = [group("payments", "tag:Team=payments")]
+
+        groups = stream_resource_groups(configs, session, "us-east-1")
+        assert len(list(groups[0]["resources"])) == 2
+
+        with patch("cli.internal.aws.discovery.scan_fleet") as scan:
+            groups = discover_resource_groups(configs, session, "us-east-1")
+        scan.assert_not_called()
+        assert len(groups[0]["resources"]) == 2
+
+    def test_stream_unsupported_service(self, mock_aws_credentials, mock_rds_fleet):
+        """Unsupported services are reported on the group up front."""
+        session = boto3.Session(region_name="us-east-1")
+
+        groups = stream_resource_groups(
+            [group("volumes", "tag:Team=search", service="ebs")], session, "us-east-1"
+        )
+
+        assert isinstance(groups[0]["error"], ValueError)
@@ -1,9 +1,11 @@
 """Integration tests for plan command - shows actual formatted output."""
 
-from moto import mock_aws
+from unittest.mock import patch
+
 import boto3
+from moto import mock_aws
 from typer.testing import CliRunner
-from unittest.mock import patch
+
 from cli.commands.plan import app
 
 runner = CliRunner()
@@ -356,3 +358,327 @@ backup:
     assert "Found: 2 resource(s)" in result.stdout
     assert "Instance:" in result.stdout  # Should show one instance
     assert "Cluster:" in result.stdout  # Should show one cluster
+
+
+@mock_aws
+@patch("cli.commands.plan.create_session")
+def test_plan_with_pushdown_discovery(mock_session, mock_aws_credentials, tmp_path):
+    """Test plan using the tagging API pushdown discovery mode."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+
+    client = boto3.client("rds", region_name="us-east-1")
+
+    for name, backup in [("tagged-db", "true"), ("untagged-db", "false")]:
+        client.create_db_instance(
+            DBInstanceIdentifier=name,
+            DBInstanceClass="db.t3.micro",
+            Engine="postgres",
+            MasterUsername="admin",
+            MasterUserPassword="password123",
+            Tags=[{"Key": "Backup", "Value": backup}],
+        )
+
+    config_content = """
+app: "pushdown-app"
+
+provider:
+  name: aws
+  region: us-east-1
+
+auth:
+  profile: "test-profile"
+
+discovery:
+  mode: pushdown
+
+backup:
+  resources:
+    - type: rds
+      name: backup-databases
+      discover: "tag:Backup=true"
+"""
+
+    config_path = tmp_path / "pushdown-config.yml"
+    config_path.write_text(config_content)
+
+    result = runner.invoke(app, ["--config", str(config_path)])
+
+    assert result.exit_code == 0
+    assert "tagged-db" in result.stdout
+    assert "untagged-db" not in result.stdout
+
+
+@mock_aws
+@patch("cli.commands.plan.create_session")
+def test_plan_reuses_cached_inventory(mock_session, mock_aws_credentials, tmp_path):
+    """A second plan reads the cached inventory unless --refresh is given."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+
+    client = boto3.client("rds", region_name="us-east-1")
+    client.create_db_instance(
+        DBInstanceIdentifier="cached-db",
+        DBInstanceClass="db.t3.micro",
+        Engine="postgres",
+        MasterUsername="admin",
+        MasterUserPassword="password123",
+        Tags=[{"Key": "Environment", "Value": "prod"}],
+    )
+
+    config_content = """
+app: "cache-app"
+
+provider:
+  name: aws
+  region: us-east-1
+
+auth:
+  profile: "test-profile"
+
+backup:
+  resources:
+    - type: rds
+      name: production-databases
+      discover: "tag:Environment=prod"
+"""
+
+    config_path = tmp_path / "cache-config.yml"
+    config_path.write_text(config_content)
+
+    assert "cached-db" in runner.invoke(app, ["--config", str(config_path)]).stdout
+
+    client.delete_db_instance(DBInstanceIdentifier="cached-db", SkipFinalSnapshot=True)
+
+    cached = runner.invoke(app, ["--config", str(config_path)])
+    assert cached.exit_code == 0
+    assert "cached-db" in cached.stdout
+
+    refreshed = runner.invoke(app, ["--config", str(config_path), "--refresh"])
+    assert refreshed.exit_code == 0
+    assert "cached-db" not in refreshed.stdout
+
+    uncached = runner.invoke(app, ["--config", str(config_path), "--no-cache"])
+    assert "cached-db" not in uncached.stdout
+
+
+@mock_aws
+@patch("cli.commands.plan.create_session")
+def test_plan_multiple_regions(mock_session, mock_aws_credentials, tmp_path):
+    """Test plan merging resources discovered in several regions."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+
+    for region in ["us-east-1", "eu-west-1"]:
+        boto3.client("rds", region_name=region).create_db_instance(
+            DBInstanceIdentifier=f"db-{region}",
+            DBInstanceClass="db.t3.micro",
+            Engine="postgres",
+            MasterUsername="admin",
+            MasterUserPassword="password123",
+            Tags=[{"Key": "Environment", "Value": "prod"}],
+        )
+
+    config_content = """
+app: "global-app"
+
+provider:
+  name: aws
+  region:
+    - us-east-1
+    - eu-west-1
+
+auth:
+  profile: "test-profile"
+
+backup:
+  resources:
+    - type: rds
+      name: production-databases
+      discover: "tag:Environment=prod"
+"""
+
+    config_path = tmp_path / "regions-config.yml"
+    config_path.write_text(config_content)
+
+    result = runner.invoke(app, ["--config", str(config_path)])
+
+    assert result.exit_code == 0
+    assert "us-east-1, eu-west-1" in result.stdout
+    assert "db-us-east-1" in result.stdout
+    assert "db-eu-west-1" in result.stdout
+    assert "Found 2 resource(s) to backup" in result.stdout
+
+
+@mock_aws
+@patch("cli.commands.plan.create_session")
+def test_plan_multiple_accounts(mock_session, mock_aws_credentials, tmp_path):
+    """Test plan listing resources of every configured account."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+    sts = boto3.client("sts", region_name="us-east-1")
+
+    for account_id in ["111111111111", "222222222222"]:
+        credentials = sts.assume_role(
+            RoleArn=f"arn:aws:iam::{account_id}:role/SnapctlBackup",
+            RoleSessionName="test",
+        )["Credentials"]
+        boto3.client(
+            "rds",
+            region_name="us-east-1",
+            aws_access_key_id=credentials["AccessKeyId"],
+            aws_secret_access_key=credentials["SecretAccessKey"],
+            aws_session_token=credentials["SessionToken"],
+        ).create_db_instance(
+            DBInstanceIdentifier=f"db-{account_id}",
+            DBInstanceClass="db.t3.micro",
+            Engine="postgres",
+            MasterUsername="admin",
+            MasterUserPassword="password123",
+            Tags=[{"Key": "Environment", "Value": "prod"}],
+        )
+
+    config_content = """
+app: "org-app"
+
+provider:
+  name: aws
+  region: us-east-1
+
+auth:
+  profile: "test-profile"
+
+accounts:
+  - role_arn: arn:aws:iam::111111111111:role/SnapctlBackup
+  - role_arn: arn:aws:iam::222222222222:role/SnapctlBackup
+
+backup:
+  resources:
+    - type: rds
+      name: production-databases
+      discover: "tag:Environment=prod"
+"""
+
+    config_path = tmp_path / "accounts-config.yml"
+    config_path.write_text(config_content)
+
+    result = runner.invoke(app, ["--config", str(config_path)])
+
+    assert result.exit_code == 0
+    assert "111111111111, 222222222222" in result.stdout
+    assert "db-111111111111" in result.stdout
+    assert "db-222222222222" in result.stdout
+    assert "Found 2 resource(s) to backup" in result.stdout
+
+
+@mock_aws
+@patch("cli.commands.plan.create_session")
+def test_plan_deduplicates_members_and_replicas(
+    mock_session, mock_aws_credentials, tmp_path
+):
+    """Test plan skipping Aurora members and read replicas covered elsewhere."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+    rds = boto3.client("rds", region_name="us-east-1")
+    tags = [{"Key": "Environment", "Value": "prod"}]
+
+    rds.create_db_cluster(
+        DBClusterIdentifier="aurora-prod",
+        Engine="aurora-postgresql",
+        MasterUsername="admin",
+        MasterUserPassword="password123",
+        Tags=tags,
+    )
+    for name in ["aurora-prod-1", "aurora-prod-2"]:
+        rds.create_db_instance(
+            DBInstanceIdentifier=name,
+            DBInstanceClass="db.r6g.large",
+            Engine="aurora-postgresql",
+            DBClusterIdentifier="aurora-prod",
+            Tags=tags,
+        )
+    rds.create_db_instance(
+        DBInstanceIdentifier="standalone-prod",
+        DBInstanceClass="db.t3.micro",
+        Engine="postgres",
+        MasterUsername="admin",
+        MasterUserPassword="password123",
+        Tags=tags,
+    )
+    rds.create_db_instance_read_replica(
+        DBInstanceIdentifier="standalone-prod-replica",
+        SourceDBInstanceIdentifier="standalone-prod",
+        Tags=tags,
+    )
+
+    config_content = """
+app: "aurora-app"
+
+provider:
+  name: aws
+  region: us-east-1
+
+auth:
+  profile: "test-profile"
+
+backup:
+  resources:
+    - type: rds
+      name: production-databases
+      discover: "tag:Environment=prod"
+"""
+
+    config_path = tmp_path / "aurora-config.yml"
+    config_path.write_text(config_content)
+
+    result = runner.invoke(app, ["--config", str(config_path)])
+
+    assert result.exit_code == 0
+    assert "Found 2 resource(s) to backup" in result.stdout
+    assert "Skipped 2 member instance(s): aurora-prod-1, aurora-prod-2" in result.stdout
+    assert "Skipped 1 read replica(s): standalone-prod-replica" in result.stdout
+    assert "Deduplicated 2 cluster member instance(s) and 1 read replica(s)" in (
+        result.stdout
+    )
+
+
+@mock_aws
+@patch("cli.commands.plan.create_session")
+def test_plan_isolates_failed_group(mock_session, mock_aws_credentials, tmp_path):
+    """Test plan still showing healthy groups when another group fails."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+    boto3.client("rds", region_name="us-east-1").create_db_instance(
+        DBInstanceIdentifier="healthy-db",
+        DBInstanceClass="db.t3.micro",
+        Engine="postgres",
+        MasterUsername="admin",
+        MasterUserPassword="password123",
+        Tags=[{"Key": "Environment", "Value": "prod"}],
+    )
+
+    config_content = """
+app: "partial-app"
+
+provider:
+  name: aws
+  region: us-east-1
+
+auth:
+  profile: "test-profile"
+
+backup:
+  resources:
+    - type: rds
+      name: broken-group
+      discover: "tag:Environment=prod AND"
+    - type: rds
+      name: production-databases
+      discover: "tag:Environment=prod"
+"""
+
+    config_path = tmp_path / "partial-config.yml"
+    config_path.write_text(config_content)
+
+    result = runner.invoke(app, ["--config", str(config_path)])
+
+    assert result.exit_code == 1
+    assert "healthy-db" in result.stdout
+    assert "Discovery failed for 1 target(s) or group(s): broken-group (us-east-1)" in (
+        result.stdout
+    )
+    assert "Found 1 resource(s) to backup in the others" in result.stdout
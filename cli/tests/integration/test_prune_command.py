@@ -0,0 +1,138 @@
+"""Integration tests for the prune command."""
+
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+from typer.testing import CliRunner
+
+from cli.commands.prune import app
+
+runner = CliRunner()
+
+CONFIG = """
+app: "backup-app"
+
+provider:
+  name: aws
+  region: us-east-1
+
+auth:
+  profile: "test-profile"
+
+backup:
+  resources:
+    - type: rds
+      name: payments
+      discover: "tag:Team=payments"
+      retention:
+        keep_last: 1
+    - type: rds
+      name: search
+      discover: "tag:Team=search"
+"""
+
+SUMI_TAGS = [{"Key": "origin", "Value": "snapctl"}]
+
+
+def create_cluster(client, name, team):
+    client.create_db_cluster(
+        DBClusterIdentifier=name,
+        Engine="aurora-postgresql",
+        MasterUsername="admin",
+        MasterUserPassword="password123",
+        Tags=[{"Key": "Team", "Value": team}],
+    )
+
+
+def create_snapshots(client):
+    """Three sumi snapshots of a pruned and a kept cluster, one foreign one."""
+    create_cluster(client, "payments-1", "payments")
+    create_cluster(client, "search-1", "search")
+    for cluster in ["payments-1", "search-1"]:
+        for i in range(3):
+            client.create_db_cluster_snapshot(
+                DBClusterIdentifier=cluster,
+                DBClusterSnapshotIdentifier=f"backup-{cluster}-{i}",
+                Tags=SUMI_TAGS,
+            )
+    client.create_db_cluster_snapshot(
+        DBClusterIdentifier="payments-1", DBClusterSnapshotIdentifier="by-hand"
+    )
+
+
+def manual_snapshots(client):
+    return sorted(
+        s["DBClusterSnapshotIdentifier"]
+        for s in client.describe_db_cluster_snapshots(SnapshotType="manual")[
+            "DBClusterSnapshots"
+        ]
+    )
+
+
+@mock_aws
+@patch("cli.commands.prune.create_session")
+def test_prune_keeps_last(mock_session, mock_aws_credentials, tmp_path):
+    """Only sumi snapshots of groups with a retention policy are deleted."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+    client = boto3.client("rds", region_name="us-east-1")
+    create_snapshots(client)
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(CONFIG)
+
+    result = runner.invoke(app, ["--config", str(config_path)])
+
+    assert result.exit_code == 0
+    remaining = manual_snapshots(client)
+    assert "by-hand" in remaining
+    assert sum(s.startswith("backup-payments-1") for s in remaining) == 1
+    assert sum(s.startswith("backup-search-1") for s in remaining) == 3
+
+
+@mock_aws
+@patch("cli.commands.prune.create_session")
+def test_prune_copies_apart(mock_session, mock_aws_credentials, tmp_path):
+    """Copies from other regions are pruned apart from local snapshots."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+    client = boto3.client("rds", region_name="us-east-1")
+    create_snapshots(client)
+    copy_tags = {
+        "origin": "snapctl-copy",
+        "group": "payments",
+        "sourceRegion": "us-west-2",
+        "resource": "payments-west",
+    }
+    for i in range(3):
+        client.create_db_cluster_snapshot(
+            DBClusterIdentifier="payments-1",
+            DBClusterSnapshotIdentifier=f"copy-payments-west-{i}",
+            Tags=[{"Key": key, "Value": value} for key, value in copy_tags.items()],
+        )
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(CONFIG)
+
+    result = runner.invoke(app, ["--config", str(config_path)])
+
+    assert result.exit_code == 0
+    remaining = manual_snapshots(client)
+    assert sum(s.startswith("backup-payments-1") for s in remaining) == 1
+    assert sum(s.startswith("copy-payments-west") for s in remaining) == 1
+
+
+@mock_aws
+@patch("cli.commands.prune.create_session")
+def test_prune_dry_run(mock_session, mock_aws_credentials, tmp_path):
+    """A dry run deletes nothing."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+    client = boto3.client("rds", region_name="us-east-1")
+    create_snapshots(client)
+    before = manual_snapshots(client)
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(CONFIG)
+
+    with patch("cli.internal.aws.pruning.delete_cluster_snapshot") as delete_snapshot:
+        result = runner.invoke(app, ["--config", str(config_path), "--dry-run"])
+
+    assert result.exit_code == 0
+    delete_snapshot.assert_not_called()
+    assert manual_snapshots(client) == before
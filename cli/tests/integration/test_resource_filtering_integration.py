@@ -1,7 +1,11 @@
+import boto3
 import pytest
 from moto import mock_aws
-import boto3
-from cli.internal.aws.resource_filtering import list_resource_by_tag
+
+from cli.internal.aws.resource_filtering import (
+    list_resource_by_tag,
+    list_resource_by_tag_pushdown,
+)
 
 
 @pytest.fixture
@@ -163,3 +167,90 @@ class TestResourceFilteringIntegration:
         assert "Engine" in resource
         assert "DBInstanceArn" in resource
         assert "DBInstanceStatus" in resource
+
+    def test_tags_come_from_describe_pages(
+        self, mock_aws_credentials, mock_rds_instances
+    ):
+        """Discovery should read TagList from describe pages, not per resource."""
+        stats: dict[str, int] = {}
+        resources = list_resource_by_tag(
+            mock_rds_instances, "rds", "tag:Environment=prod", stats=stats
+        )
+
+        assert len(resources) == 2
+        # One page of instances plus one page of clusters, no tag lookups
+        assert stats["describe_calls"] == 2
+        assert stats.get("tag_calls", 0) == 0
+
+
+class TestTagPushdownIntegration:
+    """Test discovery through the Resource Groups Tagging API (mocked)."""
+
+    def test_pushdown_single_tag(self, mock_aws_credentials, mock_rds_instances):
+        """Only resources returned by the tagging API are described."""
+        tagging_client = boto3.client(
+            "resourcegroupstaggingapi", region_name="us-east-1"
+        )
+        stats: dict[str, int] = {}
+
+        resources = list_resource_by_tag_pushdown(
+            mock_rds_instances, tagging_client, "rds", "tag:Environment=prod", stats
+        )
+
+        identifiers = sorted(r["DBInstanceIdentifier"] for r in resources)
+        assert identifiers == ["prod-db-1", "prod-db-2"]
+        assert stats["tagging_calls"] == 1
+        # Matching instances are described in one batch; no clusters matched
+        assert stats["describe_calls"] == 1
+        assert stats.get("tag_calls", 0) == 0
+
+    def test_pushdown_matches_scan(self, mock_aws_credentials, mock_rds_instances):
+        """Pushdown and scan discovery should agree on complex filters."""
+        tagging_client = boto3.client(
+            "resourcegroupstaggingapi", region_name="us-east-1"
+        )
+        tag_filter = "tag:Environment=prod AND tag:Backup=true OR tag:Critical=yes"
+
+        pushed = list_resource_by_tag_pushdown(
+            mock_rds_instances, tagging_client, "rds", tag_filter
+        )
+        scanned = list_resource_by_tag(mock_rds_instances, "rds", tag_filter)
+
+        assert sorted(r["DBInstanceIdentifier"] for r in pushed) == sorted(
+            r["DBInstanceIdentifier"] for r in scanned
+        )
+
+    def test_pushdown_includes_clusters(self, mock_aws_credentials, mock_rds_instances):
+        """Clusters found by the tagging API are described with db-cluster-id."""
+        mock_rds_instances.create_db_cluster(
+            DBClusterIdentifier="prod-aurora",
+            Engine="aurora-postgresql",
+            MasterUsername="admin",
+            MasterUserPassword="password123",
+            Tags=[{"Key": "Critical", "Value": "yes"}],
+        )
+        tagging_client = boto3.client(
+            "resourcegroupstaggingapi", region_name="us-east-1"
+        )
+
+        resources = list_resource_by_tag_pushdown(
+            mock_rds_instances, tagging_client, "rds", "tag:Critical=yes"
+        )
+
+        clusters = [r["DBClusterIdentifier"] for r in resources if "DBClusterArn" in r]
+        assert clusters == ["prod-aurora"]
+        assert len(resources) == 2
+
+    def test_pushdown_no_matches(self, mock_aws_credentials, mock_rds_instances):
+        """No describe calls are made when nothing is tagged."""
+        tagging_client = boto3.client(
+            "resourcegroupstaggingapi", region_name="us-east-1"
+        )
+        stats: dict[str, int] = {}
+
+        resources = list_resource_by_tag_pushdown(
+            mock_rds_instances, tagging_client, "rds", "tag:Environment=staging", stats
+        )
+
+        assert resources == []
+        assert stats == {"tagging_calls": 1}
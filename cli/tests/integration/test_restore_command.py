@@ -0,0 +1,145 @@
+"""Integration tests for the restore command."""
+
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+from typer.testing import CliRunner
+
+from cli.commands.backup import app as backup_app
+from cli.commands.restore import app as restore_app
+from cli.internal.aws.snapshotting import create_cluster_snapshot
+
+runner = CliRunner()
+
+CONFIG = """
+app: "backup-app"
+
+provider:
+  name: aws
+  region: us-east-1
+
+auth:
+  profile: "test-profile"
+
+backup:
+  resources:
+    - type: rds
+      name: payments
+      discover: "tag:Team=payments"
+"""
+
+
+def create_cluster(client, name, team="payments"):
+    client.create_db_cluster(
+        DBClusterIdentifier=name,
+        Engine="aurora-postgresql",
+        MasterUsername="admin",
+        MasterUserPassword="password123",
+        Tags=[{"Key": "Team", "Value": team}],
+    )
+
+
+def restored_clusters(client):
+    return sorted(
+        (
+            c["DBClusterIdentifier"],
+            [m["DBInstanceIdentifier"] for m in c["DBClusterMembers"]],
+        )
+        for c in client.describe_db_clusters()["DBClusters"]
+        if c["DBClusterIdentifier"].endswith("-restored")
+    )
+
+
+@mock_aws
+@patch("cli.commands.restore.create_session")
+def test_restore_latest_snapshots(mock_session, mock_aws_credentials, tmp_path):
+    """Every cluster is restored from its latest sumi snapshot with an instance."""
+    session = boto3.Session(region_name="us-east-1")
+    mock_session.return_value = session
+    client = boto3.client("rds", region_name="us-east-1")
+    create_cluster(client, "payments-1")
+    create_cluster(client, "payments-2")
+    create_cluster_snapshot("payments-1", "backup", session, "us-east-1")
+    create_cluster_snapshot("payments-2", "backup", session, "us-east-1")
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(CONFIG)
+
+    with patch("cli.internal.aws.restore.RESTORE_POLL_INTERVAL", 0.1):
+        result = runner.invoke(
+            restore_app, ["--config", str(config_path), "--cluster", "payments-1"]
+        )
+
+    assert result.exit_code == 0
+    assert restored_clusters(client) == [
+        ("payments-1-restored", ["payments-1-restored-1"])
+    ]
+
+
+@mock_aws
+@patch("cli.commands.restore.create_session")
+def test_restore_only_config_groups(mock_session, mock_aws_credentials, tmp_path):
+    """Clusters outside the config's resource groups are never restored."""
+    session = boto3.Session(region_name="us-east-1")
+    mock_session.return_value = session
+    client = boto3.client("rds", region_name="us-east-1")
+    create_cluster(client, "payments-1")
+    create_cluster(client, "search-1", team="search")
+    create_cluster_snapshot("payments-1", "backup", session, "us-east-1")
+    create_cluster_snapshot("search-1", "backup", session, "us-east-1")
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(CONFIG)
+
+    skipped = runner.invoke(
+        restore_app, ["--config", str(config_path), "--cluster", "search-1"]
+    )
+    assert skipped.exit_code == 0
+    assert restored_clusters(client) == []
+
+    with patch("cli.internal.aws.restore.RESTORE_POLL_INTERVAL", 0.1):
+        result = runner.invoke(restore_app, ["--config", str(config_path)])
+
+    assert result.exit_code == 0
+    assert [cluster for cluster, _ in restored_clusters(client)] == [
+        "payments-1-restored"
+    ]
+
+
+@mock_aws
+@patch("cli.commands.restore.create_session")
+@patch("cli.commands.backup.create_session")
+def test_restore_run(backup_session, restore_session, mock_aws_credentials, tmp_path):
+    """A run's snapshots are restored using the config it was started with."""
+    session = boto3.Session(region_name="us-east-1")
+    backup_session.return_value = session
+    restore_session.return_value = session
+    client = boto3.client("rds", region_name="us-east-1")
+    create_cluster(client, "payments-1")
+    create_cluster(client, "payments-2")
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(CONFIG)
+
+    with (
+        patch("cli.commands.backup.new_run_id", return_value="nightly"),
+        patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1),
+    ):
+        result = runner.invoke(backup_app, ["--config", str(config_path)])
+    assert result.exit_code == 0
+
+    dry_run = runner.invoke(restore_app, ["--run", "nightly", "--dry-run"])
+    assert dry_run.exit_code == 0
+    assert restored_clusters(client) == []
+
+    with patch("cli.internal.aws.restore.RESTORE_POLL_INTERVAL", 0.1):
+        result = runner.invoke(restore_app, ["--run", "nightly"])
+
+    assert result.exit_code == 0
+    assert [cluster for cluster, _ in restored_clusters(client)] == [
+        "payments-1-restored",
+        "payments-2-restored",
+    ]
+
+    # Restoring again fails instead of touching the existing clusters
+    with patch("cli.internal.aws.restore.RESTORE_POLL_INTERVAL", 0.1):
+        result = runner.invoke(restore_app, ["--run", "nightly"])
+    assert result.exit_code == 1
@@ -0,0 +1,108 @@
+"""Integration tests for the serve command."""
+
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+from typer.testing import CliRunner
+
+from cli.commands.serve import app
+from cli.internal.aws.client import client_pool
+
+runner = CliRunner()
+
+CONFIG = """
+app: "{name}"
+schedule: "{schedule}"
+
+provider:
+  name: aws
+  region: us-east-1
+
+auth:
+  profile: "test-profile"
+
+backup:
+  resources:
+    - type: rds
+      name: {name}
+      discover: "tag:Team={name}"
+"""
+
+
+def write_config(tmp_path, name, schedule="@hourly"):
+    path = tmp_path / f"{name}.yml"
+    path.write_text(CONFIG.format(name=name, schedule=schedule))
+    return str(path)
+
+
+def run_every_job_once(self, stop):
+    """Stand-in for CronRunner.serve that runs each job once."""
+    for job in self.jobs:
+        self.run(job)
+        self.runs += 1
+
+
+@mock_aws
+@patch("cli.commands.serve.create_session")
+def test_serve_runs_configs_with_warm_sessions(
+    mock_session, mock_aws_credentials, tmp_path
+):
+    """Runs of every config reuse one session and its clients."""
+    mock_session.return_value = boto3.Session(region_name="us-east-1")
+    client = boto3.client("rds", region_name="us-east-1")
+    for team in ["hourly", "daily"]:
+        client.create_db_cluster(
+            DBClusterIdentifier=f"{team}-1",
+            Engine="aurora-postgresql",
+            MasterUsername="admin",
+            MasterUserPassword="password123",
+            Tags=[{"Key": "Team", "Value": team}],
+        )
+
+    configs = [
+        write_config(tmp_path, "hourly"),
+        write_config(tmp_path, "daily", "@daily"),
+    ]
+    with (
+        patch("cli.internal.aws.backup.MAX_POLL_INTERVAL", 0.1),
+        patch("cli.internal.utility.daemon.CronRunner.serve", run_every_job_once),
+    ):
+        result = runner.invoke(app, ["-c", configs[0], "-c", configs[1]])
+
+    assert result.exit_code == 0
+    # One session for both configs, whose clients the second run reuses
+    assert mock_session.call_count == 1
+    stats = client_pool.stats()
+    assert stats["misses"] == stats["clients"]
+    snapshots = client.describe_db_cluster_snapshots()["DBClusterSnapshots"]
+    assert sorted(
+        s["DBClusterIdentifier"]
+        for s in snapshots
+        if s["DBClusterSnapshotIdentifier"].startswith("backup-")
+    ) == [
+        "daily-1",
+        "hourly-1",
+    ]
+
+
+def test_serve_requires_schedule(mock_aws_credentials, tmp_path):
+    path = tmp_path / "config.yml"
+    path.write_text(
+        CONFIG.format(name="x", schedule="@hourly").replace('schedule: "@hourly"\n', "")
+    )
+
+    result = runner.invoke(app, ["-c", str(path)])
+
+    assert result.exit_code == 1
+
+
+def test_serve_rejects_invalid_schedule(mock_aws_credentials, tmp_path):
+    result = runner.invoke(app, ["-c", write_config(tmp_path, "x", "every hour")])
+    assert result.exit_code == 1
+
+
+def test_serve_rejects_schedule_that_never_runs(mock_aws_credentials, tmp_path):
+    result = runner.invoke(app, ["-c", write_config(tmp_path, "x", "0 0 30 2 *")])
+    assert result.exit_code == 1
+    assert result.exception is None or isinstance(result.exception, SystemExit)
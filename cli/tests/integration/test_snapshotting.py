@@ -1,12 +1,14 @@
-import pytest
-from moto import mock_aws
 import boto3
+import pytest
 from botocore.exceptions import ClientError
+from moto import mock_aws
 
 from cli.internal.aws.snapshotting import (
-    create_cluster_snapshot,
     check_snapshot_status,
+    create_cluster_snapshot,
+    describe_cluster_snapshots,
     initiate_snapshot,
+    list_latest_snapshots,
 )
 
 
@@ -81,7 +83,7 @@ class TestCreateClusterSnapshot:
         with mock_aws():
             session = boto3.Session(region_name="us-east-1")
 
-            with pytest.raises(Exception):
+            with pytest.raises(ClientError):
                 create_cluster_snapshot(
                     cluster_id="nonexistent-cluster",
                     prefix="backup",
@@ -152,6 +154,56 @@ class TestCheckSnapshotStatus:
                 check_snapshot_status("nonexistent-snapshot", session, "us-east-1")
 
 
+class TestDescribeClusterSnapshots:
+    """Test the batched describe_cluster_snapshots function."""
+
+    def test_describe_many_snapshots(self, mock_aws_credentials, mock_rds_cluster):
+        """Only the requested snapshots are returned, keyed by identifier."""
+        session = boto3.Session(region_name="us-east-1")
+        for name in ["batch-1", "batch-2", "other"]:
+            mock_rds_cluster.create_db_cluster_snapshot(
+                DBClusterSnapshotIdentifier=name, DBClusterIdentifier="test-cluster"
+            )
+
+        snapshots = describe_cluster_snapshots(
+            ["batch-1", "batch-2", "not-created-yet"], session, "us-east-1"
+        )
+
+        assert sorted(snapshots) == ["batch-1", "batch-2"]
+        assert snapshots["batch-1"]["DBClusterIdentifier"] == "test-cluster"
+
+    def test_describe_no_snapshots(self, mock_aws_credentials):
+        """No identifiers means no calls and no results."""
+        with mock_aws():
+            session = boto3.Session(region_name="us-east-1")
+            assert describe_cluster_snapshots([], session, "us-east-1") == {}
+
+
+class TestListLatestSnapshots:
+    """Test the bulk listing of recent snapshots."""
+
+    def test_latest_snapctl_snapshot_per_cluster(
+        self, mock_aws_credentials, mock_rds_cluster
+    ):
+        """Only snapshots tagged origin=snapctl count, the newest one wins."""
+        session = boto3.Session(region_name="us-east-1")
+        older = create_cluster_snapshot("test-cluster", "old", session, "us-east-1")
+        newer = create_cluster_snapshot("test-cluster", "new", session, "us-east-1")
+        mock_rds_cluster.create_db_cluster_snapshot(
+            DBClusterSnapshotIdentifier="someone-else",
+            DBClusterIdentifier="test-cluster",
+        )
+
+        latest = list_latest_snapshots(session, "us-east-1")
+
+        assert latest == {"test-cluster": newer["SnapshotCreateTime"]}
+        assert newer["SnapshotCreateTime"] >= older["SnapshotCreateTime"]
+
+    def test_no_snapshots(self, mock_aws_credentials, mock_rds_cluster):
+        session = boto3.Session(region_name="us-east-1")
+        assert list_latest_snapshots(session, "us-east-1") == {}
+
+
 class TestInitiateSnapshot:
     """Test the initiate_snapshot function."""
 
@@ -0,0 +1,139 @@
+"""Integration tests for detached backups and the status command."""
+
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+from typer.testing import CliRunner
+
+from cli.commands.backup import app as backup_app
+from cli.commands.status import app as status_app
+from cli.internal.aws.journal import RunJournal
+from cli.internal.aws.snapshotting import describe_cluster_snapshots
+
+runner = CliRunner()
+
+CONFIG = """
+app: "backup-app"
+
+provider:
+  name: aws
+  region: us-east-1
+
+auth:
+  profile: "test-profile"
+
+backup:
+  resources:
+    - type: rds
+      name: payments
+      discover: "tag:Team=payments"
+"""
+
+
+def create_cluster(client, name):
+    client.create_db_cluster(
+        DBClusterIdentifier=name,
+        Engine="aurora-postgresql",
+        MasterUsername="admin",
+        MasterUserPassword="password123",
+        Tags=[{"Key": "Team", "Value": "payments"}],
+    )
+
+
+def detached_run(tmp_path):
+    """Start a detached backup of two clusters and return its run id."""
+    client = boto3.client("rds", region_name="us-east-1")
+    create_cluster(client, "payments-1")
+    create_cluster(client, "payments-2")
+    config_path = tmp_path / "backup-config.yml"
+    config_path.write_text(CONFIG)
+
+    with (
+        patch("cli.commands.backup.new_run_id", return_value="detached"),
+        patch("cli.internal.aws.backup.describe_cluster_snapshots") as describe,
+    ):
+        result = runner.invoke(backup_app, ["--config", str(config_path), "--detach"])
+
+    assert result.exit_code == 0
+    # Detached runs never poll
+    describe.assert_not_called()
+    return "detached"
+
+
+@mock_aws
+@patch("cli.commands.status.create_session")
+@patch("cli.commands.backup.create_session")
+def test_detach_then_status(
+    mock_backup_session, mock_status_session, mock_aws_credentials, tmp_path
+):
+    """status checks a detached run from its manifest and records completions."""
+    session = boto3.Session(region_name="us-east-1")
+    mock_backup_session.return_value = session
+    mock_status_session.return_value = session
+    run_id = detached_run(tmp_path)
+
+    journal = RunJournal.load(run_id)
+    assert sorted(e["event"] for e in journal.entries.values()) == [
+        "initiated",
+        "initiated",
+    ]
+
+    with patch(
+        "cli.internal.aws.status.describe_cluster_snapshots",
+        wraps=describe_cluster_snapshots,
+    ) as describe:
+        result = runner.invoke(status_app, ["--run", run_id])
+
+    assert result.exit_code == 0
+    # The whole manifest is checked with one batched call
+    assert describe.call_count == 1
+    journal = RunJournal.load(run_id)
+    assert [e["status"] for e in journal.entries.values()] == [
+        "available",
+        "available",
+    ]
+
+
+@mock_aws
+@patch("cli.commands.status.create_session")
+@patch("cli.commands.backup.create_session")
+def test_status_wait(
+    mock_backup_session, mock_status_session, mock_aws_credentials, tmp_path
+):
+    session = boto3.Session(region_name="us-east-1")
+    mock_backup_session.return_value = session
+    mock_status_session.return_value = session
+    run_id = detached_run(tmp_path)
+
+    result = runner.invoke(status_app, ["--run", run_id, "--wait"])
+
+    assert result.exit_code == 0
+    journal = RunJournal.load(run_id)
+    assert all(e["event"] == "completed" for e in journal.entries.values())
+
+
+@mock_aws
+@patch("cli.commands.status.create_session")
+@patch("cli.commands.backup.create_session")
+def test_status_reports_missing_snapshot(
+    mock_backup_session, mock_status_session, mock_aws_credentials, tmp_path
+):
+    """A snapshot deleted since the run started fails the check."""
+    session = boto3.Session(region_name="us-east-1")
+    mock_backup_session.return_value = session
+    mock_status_session.return_value = session
+    run_id = detached_run(tmp_path)
+    entry = next(iter(RunJournal.load(run_id).entries.values()))
+    boto3.client("rds", region_name="us-east-1").delete_db_cluster_snapshot(
+        DBClusterSnapshotIdentifier=entry["snapshot_id"]
+    )
+
+    result = runner.invoke(status_app, ["--run", run_id])
+
+    assert result.exit_code == 1
+
+
+def test_status_unknown_run(mock_aws_credentials):
+    result = runner.invoke(status_app, ["--run", "nope"])
+    assert result.exit_code == 1
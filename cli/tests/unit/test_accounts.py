@@ -0,0 +1,144 @@
+import threading
+from unittest.mock import Mock, patch
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+
+from cli.internal.aws.accounts import (
+    AccountSessions,
+    get_accounts,
+    get_targets,
+    run_targets,
+    target_label,
+)
+
+ROLE_A = "arn:aws:iam::111111111111:role/Backup"
+ROLE_B = "arn:aws:iam::222222222222:role/Backup"
+
+
+class TestGetAccounts:
+    """Test parsing of the accounts list."""
+
+    def test_no_accounts_uses_top_level_auth(self):
+        """Without accounts, a single unnamed account is returned."""
+        assert get_accounts({"auth": {"profile": "default"}}) == [{"name": None}]
+
+    def test_default_names(self):
+        """Names default to the role's account ID or the profile."""
+        accounts = get_accounts(
+            {"accounts": [{"role_arn": ROLE_A}, {"profile": "staging"}]}
+        )
+        assert [a["name"] for a in accounts] == ["111111111111", "staging"]
+
+    def test_explicit_name(self):
+        """An explicit name is kept."""
+        accounts = get_accounts({"accounts": [{"name": "prod", "role_arn": ROLE_A}]})
+        assert accounts == [{"name": "prod", "role_arn": ROLE_A}]
+
+    @pytest.mark.parametrize(
+        "accounts",
+        [
+            [],
+            "prod",
+            [{"name": "prod"}],
+            [{"role_arn": ROLE_A}, {"role_arn": ROLE_A}],
+        ],
+    )
+    def test_invalid_accounts(self, accounts):
+        """Empty lists, entries without credentials and duplicates are rejected."""
+        with pytest.raises(ValueError, match="accounts"):
+            get_accounts({"accounts": accounts})
+
+
+class TestTargets:
+    """Test account/region targets."""
+
+    def test_targets_grouped_by_account(self):
+        """Every account is paired with every region."""
+        accounts = [{"name": "a"}, {"name": "b"}]
+        targets = get_targets(accounts, ["us-east-1", "eu-west-1"])
+        assert [target_label(t) for t in targets] == [
+            "a/us-east-1",
+            "a/eu-west-1",
+            "b/us-east-1",
+            "b/eu-west-1",
+        ]
+
+    def test_label_without_accounts(self):
+        """Targets of the top-level account are labelled by region."""
+        target = get_targets([{"name": None}], ["us-east-1"])[0]
+        assert target_label(target) == "us-east-1"
+
+
+class TestAccountSessions:
+    """Test per-account session creation."""
+
+    def test_unnamed_account_uses_source_session(self):
+        """The top-level account reuses the source session."""
+        source = Mock(spec=boto3.Session)
+        assert AccountSessions(source, "app").get({"name": None}) is source
+
+    @patch("cli.internal.aws.accounts.create_session_with_role")
+    def test_role_assumed_once(self, mock_assume):
+        """Concurrent requests for one account share a single assumption."""
+        source = Mock(spec=boto3.Session)
+        sessions = AccountSessions(source, "app")
+        account = {"name": "prod", "role_arn": ROLE_A}
+
+        threads = [
+            threading.Thread(target=sessions.get, args=(account,)) for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        mock_assume.assert_called_once_with({"app": "app", "role_arn": ROLE_A}, source)
+
+    @patch("cli.internal.aws.accounts.create_session_with_role")
+    def test_failure_is_remembered(self, mock_assume):
+        """A failed assumption is raised again without retrying."""
+        mock_assume.side_effect = RuntimeError("AccessDenied")
+        sessions = AccountSessions(Mock(spec=boto3.Session), "app")
+        account = {"name": "prod", "role_arn": ROLE_A}
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError, match="AccessDenied"):
+                sessions.get(account)
+
+        assert mock_assume.call_count == 1
+
+
+class TestRunTargets:
+    """Test the account/region fan-out."""
+
+    @patch("cli.internal.aws.accounts.create_session_with_role")
+    def test_broken_account_is_isolated(self, mock_assume):
+        """Targets of an account whose role fails do not affect other accounts."""
+
+        def assume(auth, source):
+            if auth["role_arn"] == ROLE_B:
+                raise ClientError({"Error": {"Code": "AccessDenied"}}, "AssumeRole")
+            return Mock(spec=boto3.Session)
+
+        mock_assume.side_effect = assume
+        accounts = get_accounts(
+            {"accounts": [{"role_arn": ROLE_A}, {"role_arn": ROLE_B}]}
+        )
+        targets = get_targets(accounts, ["us-east-1", "eu-west-1"])
+
+        results = run_targets(
+            targets,
+            AccountSessions(Mock(spec=boto3.Session), "app"),
+            lambda session, region: region,
+            max_targets=2,
+        )
+
+        assert [(target_label(t), r) for t, r, _ in results] == [
+            ("111111111111/us-east-1", "us-east-1"),
+            ("111111111111/eu-west-1", "eu-west-1"),
+            ("222222222222/us-east-1", None),
+            ("222222222222/eu-west-1", None),
+        ]
+        assert all(isinstance(e, ClientError) for _, _, e in results[2:])
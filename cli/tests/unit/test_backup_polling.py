@@ -0,0 +1,812 @@
+import asyncio
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+
+from cli.internal.aws.backup import (
+    MAX_CREATE_ATTEMPTS,
+    MAX_POLL_INTERVAL,
+    MIN_POLL_INTERVAL,
+    estimate_time_to_completion,
+    next_poll_delay,
+    run_snapshots,
+)
+from cli.internal.aws.durations import DurationEstimator
+from cli.internal.aws.journal import RunJournal
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop on a virtual clock: instead of sleeping until its next timer,
+    the clock jumps forward. Results from executor threads are still waited
+    for (briefly, in real time) before the clock moves.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.now = 0.0
+        self.sleeps = []
+        self._selector = JumpingSelector(self._selector, self)
+
+    def time(self):
+        return self.now
+
+
+class JumpingSelector:
+    """Wraps a selector so timed waits advance the loop's virtual clock."""
+
+    def __init__(self, selector, loop):
+        self._selector = selector
+        self._loop = loop
+
+    def select(self, timeout=None):
+        if timeout is None or timeout <= 0:
+            return self._selector.select(timeout)
+        events = self._selector.select(0.05)
+        if not events:
+            self._loop.sleeps.append(timeout)
+            self._loop.now += timeout
+        return events
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+def run_on_virtual_clock(loop, resources, parallel, groups=None, journal=None):
+    """Run the snapshot engine to completion on the given virtual clock loop."""
+    groups = groups or [{"name": "group", "resources": resources}]
+    try:
+        return loop.run_until_complete(
+            run_snapshots(groups, None, "us-east-1", parallel, journal=journal)
+        )
+    finally:
+        loop.close()
+
+
+def initiate(resource, session, region):
+    name = f"backup-{resource['DBClusterIdentifier']}"
+    return {"DBClusterSnapshotIdentifier": name, "DBClusterSnapshotArn": name}
+
+
+class TestEstimateTimeToCompletion:
+    """Test completion estimates from PercentProgress samples."""
+
+    def test_extrapolates_progress_rate(self):
+        """50% done after 100s at a steady rate needs 100s more."""
+        samples = [(60.0, 30.0), (100.0, 50.0)]
+        assert estimate_time_to_completion(samples, started=0.0) == 100.0
+
+    def test_single_sample_uses_elapsed_time(self):
+        """Progress without a trend is extrapolated from the start."""
+        assert estimate_time_to_completion([(20.0, 80.0)], started=0.0) == 5.0
+
+    def test_no_progress_backs_off(self):
+        """Without progress, the snapshot is assumed to need as long again."""
+        assert estimate_time_to_completion([(40.0, 0.0)], started=0.0) == 40.0
+
+    def test_no_samples(self):
+        """A snapshot that was never checked is due immediately."""
+        assert estimate_time_to_completion([], started=0.0) == 0.0
+
+
+class TestNextPollDelay:
+    """Test clamping of poll delays."""
+
+    def test_floor(self):
+        assert next_poll_delay([(10.0, 99.0)], started=0.0) == MIN_POLL_INTERVAL
+
+    def test_ceiling(self):
+        assert next_poll_delay([(600.0, 1.0)], started=0.0) == MAX_POLL_INTERVAL
+
+
+class TestBackupPolling:
+    """Test the polling schedule of the snapshot engine."""
+
+    def test_fast_snapshot_frees_slot_early(self):
+        """A snapshot that finishes quickly is noticed without a fixed sleep."""
+        loop = VirtualClockLoop()
+        finish_at = {"backup-a": 12.0, "backup-b": 30.0}
+        checks = []
+
+        def describe(snapshot_ids, session, region):
+            checks.append((loop.time(), snapshot_ids))
+            return {
+                snapshot_id: (
+                    {"Status": "available", "PercentProgress": 100}
+                    if loop.time() >= finish_at[snapshot_id]
+                    else {"Status": "creating", "PercentProgress": 0}
+                )
+                for snapshot_id in snapshot_ids
+            }
+
+        resources = [
+            {"DBClusterIdentifier": "a", "Status": "available"},
+            {"DBClusterIdentifier": "b", "Status": "available"},
+        ]
+        with (
+            patch("cli.internal.aws.backup.initiate_snapshot", side_effect=initiate),
+            patch(
+                "cli.internal.aws.backup.describe_cluster_snapshots",
+                side_effect=describe,
+            ),
+        ):
+            results = run_on_virtual_clock(loop, resources, parallel=1)
+
+        assert [r["status"] for r in results] == ["available", "available"]
+        # Checks back off 5s, 10s, 20s: "a" is noticed at 20s, not after 30s
+        assert results[0]["duration"] == 20.0
+        assert checks[:3] == [
+            (5.0, ["backup-a"]),
+            (10.0, ["backup-a"]),
+            (20.0, ["backup-a"]),
+        ]
+        # Never sleeps longer than the poll ceiling
+        assert max(loop.sleeps) <= MAX_POLL_INTERVAL
+
+    def test_progress_trend_schedules_check(self):
+        """A snapshot is checked again when its progress says it is done."""
+        loop = VirtualClockLoop()
+        progress = {5.0: 10, 50.0: 55}
+        checks = []
+
+        def describe(snapshot_ids, session, region):
+            now = loop.time()
+            checks.append(now)
+            if now in progress:
+                snapshot = {"Status": "creating", "PercentProgress": progress[now]}
+            else:
+                snapshot = {"Status": "available", "PercentProgress": 100}
+            return {"backup-a": snapshot}
+
+        with (
+            patch("cli.internal.aws.backup.initiate_snapshot", side_effect=initiate),
+            patch(
+                "cli.internal.aws.backup.describe_cluster_snapshots",
+                side_effect=describe,
+            ),
+        ):
+            run_on_virtual_clock(
+                loop, [{"DBClusterIdentifier": "a", "Status": "available"}], 1
+            )
+
+        # 10% after 5s leaves 90% = 45s; then 45% in 45s leaves 45% = 45s
+        assert checks == [5.0, 50.0, 95.0]
+
+    def test_one_status_call_per_cycle(self):
+        """All in-flight snapshots are checked with a single call per cycle."""
+        loop = VirtualClockLoop()
+        calls = []
+
+        def describe(snapshot_ids, session, region):
+            calls.append(list(snapshot_ids))
+            status = "available" if loop.time() >= 20 else "creating"
+            return {
+                snapshot_id: {"Status": status, "PercentProgress": 0}
+                for snapshot_id in snapshot_ids
+            }
+
+        resources = [
+            {"DBClusterIdentifier": str(i), "Status": "available"} for i in range(50)
+        ]
+        with (
+            patch("cli.internal.aws.backup.initiate_snapshot", side_effect=initiate),
+            patch(
+                "cli.internal.aws.backup.describe_cluster_snapshots",
+                side_effect=describe,
+            ),
+        ):
+            results = run_on_virtual_clock(loop, resources, parallel=50)
+
+        assert len(results) == 50
+        assert len(calls) == 3
+        assert all(len(snapshot_ids) == 50 for snapshot_ids in calls)
+
+    def test_hundreds_in_flight(self):
+        """Hundreds of snapshots can be in flight from one engine."""
+        loop = VirtualClockLoop()
+        in_flight = []
+
+        def describe(snapshot_ids, session, region):
+            in_flight.append(len(snapshot_ids))
+            return {
+                snapshot_id: {"Status": "available", "PercentProgress": 100}
+                for snapshot_id in snapshot_ids
+            }
+
+        resources = [
+            {"DBClusterIdentifier": str(i), "Status": "available"} for i in range(300)
+        ]
+        with (
+            patch("cli.internal.aws.backup.initiate_snapshot", side_effect=initiate),
+            patch(
+                "cli.internal.aws.backup.describe_cluster_snapshots",
+                side_effect=describe,
+            ),
+        ):
+            results = run_on_virtual_clock(loop, resources, parallel=300)
+
+        assert len(results) == 300
+        assert in_flight == [300]
+
+    def test_snapshot_not_listed_yet(self):
+        """A snapshot missing from the listing is checked again later."""
+        loop = VirtualClockLoop()
+        responses = iter(
+            [{}, {"backup-a": {"Status": "available", "PercentProgress": 100}}]
+        )
+
+        with (
+            patch("cli.internal.aws.backup.initiate_snapshot", side_effect=initiate),
+            patch(
+                "cli.internal.aws.backup.describe_cluster_snapshots",
+                side_effect=lambda ids, session, region: next(responses),
+            ),
+        ):
+            results = run_on_virtual_clock(
+                loop, [{"DBClusterIdentifier": "a", "Status": "available"}], 1
+            )
+
+        assert [r["status"] for r in results] == ["available"]
+
+    def test_failed_create_does_not_stop_others(self):
+        """A snapshot that cannot be created fails alone."""
+        loop = VirtualClockLoop()
+
+        def flaky_initiate(resource, session, region):
+            if resource["DBClusterIdentifier"] == "broken":
+                raise ClientError(
+                    {"Error": {"Code": "InvalidDBClusterStateFault"}},
+                    "CreateDBClusterSnapshot",
+                )
+            return initiate(resource, session, region)
+
+        with (
+            patch(
+                "cli.internal.aws.backup.initiate_snapshot", side_effect=flaky_initiate
+            ),
+            patch(
+                "cli.internal.aws.backup.describe_cluster_snapshots",
+                side_effect=lambda ids, session, region: {
+                    i: {"Status": "available", "DBClusterIdentifier": "a"} for i in ids
+                },
+            ),
+        ):
+            results = run_on_virtual_clock(
+                loop,
+                [
+                    {"DBClusterIdentifier": "broken", "Status": "available"},
+                    {"DBClusterIdentifier": "a", "Status": "available"},
+                ],
+                2,
+            )
+
+        assert [(r["cluster"], r["status"]) for r in results] == [
+            ("broken", "failed"),
+            ("a", "available"),
+        ]
+        assert "InvalidDBClusterStateFault" in results[0]["error"]
+
+
+class TestCapacityBackoff:
+    """Test retries of snapshots RDS refuses for capacity."""
+
+    def test_refused_create_is_retried_with_less_concurrency(self):
+        """Quota errors requeue the snapshot and lower the in-flight limit."""
+        loop = VirtualClockLoop()
+        refusals = {"a": 2}
+        in_flight = []
+
+        def refusing_initiate(resource, session, region):
+            cluster_id = resource["DBClusterIdentifier"]
+            if refusals.get(cluster_id, 0) > 0:
+                refusals[cluster_id] -= 1
+                raise ClientError(
+                    {"Error": {"Code": "SnapshotQuotaExceeded", "Message": "quota"}},
+                    "CreateDBClusterSnapshot",
+                )
+            return initiate(resource, session, region)
+
+        def describe(snapshot_ids, session, region):
+            in_flight.append(len(snapshot_ids))
+            status = "available" if loop.time() >= 200 else "creating"
+            return {i: {"Status": status, "PercentProgress": 0} for i in snapshot_ids}
+
+        resources = [
+            {"DBClusterIdentifier": name, "Status": "available"}
+            for name in ["a", "b", "c", "d"]
+        ]
+        with (
+            patch(
+                "cli.internal.aws.backup.initiate_snapshot",
+                side_effect=refusing_initiate,
+            ),
+            patch(
+                "cli.internal.aws.backup.describe_cluster_snapshots",
+                side_effect=describe,
+            ),
+        ):
+            results = run_on_virtual_clock(loop, resources, parallel=4)
+
+        assert sorted((r["cluster"], r["status"]) for r in results) == [
+            ("a", "available"),
+            ("b", "available"),
+            ("c", "available"),
+            ("d", "available"),
+        ]
+        assert refusals["a"] == 0
+
+    def test_gives_up_after_max_attempts(self):
+        """A snapshot refused on every attempt ends as failed."""
+        loop = VirtualClockLoop()
+        attempts = []
+
+        def always_refused(resource, session, region):
+            attempts.append(loop.time())
+            raise ClientError(
+                {"Error": {"Code": "SnapshotQuotaExceeded", "Message": "quota"}},
+                "CreateDBClusterSnapshot",
+            )
+
+        with patch(
+            "cli.internal.aws.backup.initiate_snapshot", side_effect=always_refused
+        ):
+            results = run_on_virtual_clock(
+                loop, [{"DBClusterIdentifier": "a", "Status": "available"}], 1
+            )
+
+        assert [r["status"] for r in results] == ["failed"]
+        assert len(attempts) == MAX_CREATE_ATTEMPTS
+        # Retries back off 30s, 60s, 120s, 240s
+        assert attempts[-1] == 450.0
+
+    def test_invalid_cluster_state_fails_at_once(self):
+        """A cluster that cannot be snapshotted fails without a retry."""
+        loop = VirtualClockLoop()
+        attempts = []
+
+        def stopped(resource, session, region):
+            if resource["DBClusterIdentifier"] != "stopped":
+                return initiate(resource, session, region)
+            attempts.append(loop.time())
+            raise ClientError(
+                {"Error": {"Code": "InvalidDBClusterStateFault", "Message": "stopped"}},
+                "CreateDBClusterSnapshot",
+            )
+
+        def describe(snapshot_ids, session, region):
+            return {
+                i: {"Status": "available", "PercentProgress": 100} for i in snapshot_ids
+            }
+
+        resources = [
+            {"DBClusterIdentifier": name, "Status": "available"}
+            for name in ["stopped", "b"]
+        ]
+        with (
+            patch("cli.internal.aws.backup.initiate_snapshot", side_effect=stopped),
+            patch(
+                "cli.internal.aws.backup.describe_cluster_snapshots",
+                side_effect=describe,
+            ),
+        ):
+            results = run_on_virtual_clock(loop, resources, parallel=2)
+
+        assert sorted((r["cluster"], r["status"]) for r in results) == [
+            ("b", "available"),
+            ("stopped", "failed"),
+        ]
+        assert attempts == [0.0]
+
+
+class TestCrossGroupScheduling:
+    """Test that groups share the engine's slots instead of running in turn."""
+
+    def test_slow_snapshot_does_not_hold_up_other_groups(self):
+        """Other groups use the free slots while one group's large cluster runs."""
+        loop = VirtualClockLoop()
+        finish_at = {"backup-big": 1000.0}
+
+        def describe(snapshot_ids, session, region):
+            return {
+                snapshot_id: (
+                    {"Status": "available", "PercentProgress": 100}
+                    if loop.time() >= finish_at.get(snapshot_id, 0)
+                    else {"Status": "creating", "PercentProgress": 0}
+                )
+                for snapshot_id in snapshot_ids
+            }
+
+        groups = [
+            {
+                "name": "large",
+                "resources": [{"DBClusterIdentifier": "big", "Status": "available"}],
+            },
+            {
+                "name": "small",
+                "resources": [
+                    {"DBClusterIdentifier": str(i), "Status": "available"}
+                    for i in range(4)
+                ],
+            },
+        ]
+        with (
+            patch("cli.internal.aws.backup.initiate_snapshot", side_effect=initiate),
+            patch(
+                "cli.internal.aws.backup.describe_cluster_snapshots",
+                side_effect=describe,
+            ),
+        ):
+            results = run_on_virtual_clock(loop, None, parallel=2, groups=groups)
+
+        by_cluster = {r["cluster"]: r for r in results}
+        assert by_cluster["big"]["group"] == "large"
+        assert {r["group"] for r in results} == {"large", "small"}
+        # The small group's snapshots ran one after another in the second slot
+        assert all(by_cluster[str(i)]["duration"] == 5.0 for i in range(4))
+        assert loop.time() < 1100
+
+    def test_group_max_parallel(self):
+        """A group never has more than its max_parallel snapshots in flight."""
+        loop = VirtualClockLoop()
+        in_flight = []
+
+        def describe(snapshot_ids, session, region):
+            in_flight.append(sorted(snapshot_ids))
+            status = "available" if loop.time() >= 10 else "creating"
+            return {i: {"Status": status, "PercentProgress": 0} for i in snapshot_ids}
+
+        groups = [
+            {
+                "name": "capped",
+                "max_parallel": 1,
+                "resources": [
+                    {"DBClusterIdentifier": f"c{i}", "Status": "available"}
+                    for i in range(3)
+                ],
+            },
+            {
+                "name": "free",
+                "resources": [
+                    {"DBClusterIdentifier": f"f{i}", "Status": "available"}
+                    for i in range(3)
+                ],
+            },
+        ]
+        with (
+            patch("cli.internal.aws.backup.initiate_snapshot", side_effect=initiate),
+            patch(
+                "cli.internal.aws.backup.describe_cluster_snapshots",
+                side_effect=describe,
+            ),
+        ):
+            results = run_on_virtual_clock(loop, None, parallel=10, groups=groups)
+
+        assert len(results) == 6
+        for snapshot_ids in in_flight:
+            assert sum(i.startswith("backup-c") for i in snapshot_ids) <= 1
+
+
+RESUMED_FLEET = [
+    {"DBClusterIdentifier": "a", "Status": "available"},
+    {"DBClusterIdentifier": "b", "Status": "available"},
+]
+
+
+class TestResume:
+    """Test continuing a run from its journal after the process died."""
+
+    def crashed_run(self, event, **fields):
+        """Journal of a run that died after recording event for cluster a."""
+        journal = RunJournal.create("run-1", "config.yml")
+        for resource in RESUMED_FLEET:
+            journal.record("pending", "group", resource, "us-east-1")
+        journal.record(
+            event,
+            "group",
+            RESUMED_FLEET[0],
+            "us-east-1",
+            snapshot_id="backup-a-old",
+            snapshot_arn="arn:backup-a-old",
+            **fields,
+        )
+        return RunJournal.load("run-1")
+
+    def resume(self, journal, existing):
+        """Resume the run, return its results and the clusters created."""
+        created = []
+
+        def record_initiate(resource, session, region):
+            created.append(resource["DBClusterIdentifier"])
+            return initiate(resource, session, region)
+
+        def describe(snapshot_ids, session, region):
+            return {
+                snapshot_id: {"Status": "available", "PercentProgress": 100}
+                for snapshot_id in snapshot_ids
+                if snapshot_id in existing or snapshot_id.startswith("backup-b")
+            }
+
+        with (
+            patch(
+                "cli.internal.aws.backup.initiate_snapshot",
+                side_effect=record_initiate,
+            ),
+            patch(
+                "cli.internal.aws.backup.describe_cluster_snapshots",
+                side_effect=describe,
+            ),
+        ):
+            results = run_on_virtual_clock(
+                VirtualClockLoop(), RESUMED_FLEET, parallel=2, journal=journal
+            )
+        return {r["cluster"]: r for r in results}, created
+
+    def test_reattaches_to_initiated_snapshot(self):
+        """An initiated snapshot is only polled, never created again."""
+        journal = self.crashed_run("initiated")
+
+        results, created = self.resume(journal, existing={"backup-a-old"})
+
+        assert created == ["b"]
+        assert results["a"]["snapshot_id"] == "backup-a-old"
+        assert results["a"]["status"] == "available"
+        assert (
+            RunJournal.load("run-1").get("group", RESUMED_FLEET[0])["event"]
+            == "completed"
+        )
+
+    def test_recreates_vanished_snapshot(self):
+        """An initiated snapshot that no longer exists is created again."""
+        journal = self.crashed_run("initiated")
+
+        results, created = self.resume(journal, existing={"backup-a"})
+
+        assert sorted(created) == ["a", "b"]
+        assert results["a"]["snapshot_id"] == "backup-a"
+
+    def test_skips_completed_snapshot(self):
+        """An available snapshot is carried over without any AWS call."""
+        journal = self.crashed_run("completed", status="available", duration=90.0)
+
+        results, created = self.resume(journal, existing=set())
+
+        assert created == ["b"]
+        assert results["a"]["resumed"] is True
+        assert results["a"]["duration"] == 90.0
+
+    def test_retries_failed_snapshot(self):
+        journal = self.crashed_run("completed", status="failed", duration=5.0)
+
+        results, created = self.resume(journal, existing={"backup-a"})
+
+        assert sorted(created) == ["a", "b"]
+        assert results["a"]["status"] == "available"
+
+
+class TestLongestFirst:
+    """Test that the engine shortens a run by starting long snapshots first."""
+
+    def run_fleet(self, resources, parallel, stream=False):
+        """Run resources taking 1 virtual second per GiB, return start times."""
+        loop = VirtualClockLoop()
+        started = {}
+
+        def initiate_at(resource, session, region):
+            started[resource["DBClusterIdentifier"]] = loop.time()
+            return initiate(resource, session, region)
+
+        def describe(snapshot_ids, session, region):
+            return {
+                snapshot_id: (
+                    {"Status": "available", "PercentProgress": 100}
+                    if loop.time() - started[cluster] >= storage[cluster]
+                    else {"Status": "creating", "PercentProgress": 0}
+                )
+                for snapshot_id in snapshot_ids
+                for cluster in [snapshot_id.removeprefix("backup-")]
+            }
+
+        storage = {r["DBClusterIdentifier"]: r["AllocatedStorage"] for r in resources}
+        with (
+            patch("cli.internal.aws.backup.initiate_snapshot", side_effect=initiate_at),
+            patch(
+                "cli.internal.aws.backup.describe_cluster_snapshots",
+                side_effect=describe,
+            ),
+        ):
+            try:
+                loop.run_until_complete(
+                    run_snapshots(
+                        [
+                            {
+                                "name": "g",
+                                "resources": iter(resources) if stream else resources,
+                            }
+                        ],
+                        None,
+                        "us-east-1",
+                        parallel,
+                        DurationEstimator({}),
+                    )
+                )
+            finally:
+                loop.close()
+        return started
+
+    def fleet(self, sizes):
+        return [
+            {
+                "DBClusterIdentifier": name,
+                "AllocatedStorage": size,
+                "Status": "available",
+            }
+            for name, size in sizes
+        ]
+
+    def test_known_fleet_starts_largest_first(self):
+        """A fully known fleet (e.g. from the cache) starts longest first."""
+        resources = self.fleet(
+            [("small-0", 60), ("small-1", 60), ("medium", 120), ("large", 240)]
+        )
+
+        started = self.run_fleet(resources, parallel=2)
+
+        assert started["large"] == 0.0
+        assert started["medium"] == 0.0
+        assert max(started.values()) > 0
+
+    def test_waiting_clusters_start_largest_first(self):
+        """Streamed clusters waiting for a slot are started longest first."""
+        resources = self.fleet(
+            [("first", 30), ("second", 300), ("small", 60), ("large", 240)]
+        )
+
+        started = self.run_fleet(resources, parallel=2, stream=True)
+
+        assert started["large"] < started["small"]
+
+
+class TestCopies:
+    """Test that copies to other regions overlap the rest of the run."""
+
+    def run_with_copies(self, loop, describe, clusters, max_parallel=5):
+        copy_started = {}
+
+        def copy(
+            source_arn, target_id, session, source_region, region, kms_key_id, tags
+        ):
+            copy_started[target_id] = loop.time()
+            return {"DBClusterSnapshotArn": f"{region}:{target_id}"}
+
+        groups = [
+            {
+                "name": "group",
+                "copy_to": [
+                    {
+                        "region": "us-west-2",
+                        "kms_key_id": None,
+                        "kms_keys": {},
+                        "max_parallel": max_parallel,
+                    }
+                ],
+                "resources": [
+                    {"DBClusterIdentifier": cluster, "Status": "available"}
+                    for cluster in clusters
+                ],
+            }
+        ]
+        with (
+            patch("cli.internal.aws.backup.initiate_snapshot", side_effect=initiate),
+            patch(
+                "cli.internal.aws.backup.describe_cluster_snapshots",
+                side_effect=describe,
+            ),
+            patch("cli.internal.aws.copying.copy_cluster_snapshot", side_effect=copy),
+        ):
+            results = run_on_virtual_clock(loop, None, parallel=5, groups=groups)
+        return results, copy_started
+
+    def test_copy_starts_while_other_snapshots_run(self):
+        """A finished snapshot is copied before the slow one completes."""
+        loop = VirtualClockLoop()
+        finish_at = {"backup-slow": 500.0}
+
+        def describe(snapshot_ids, session, region):
+            return {
+                snapshot_id: (
+                    {"Status": "available", "PercentProgress": 100}
+                    if loop.time() >= finish_at.get(snapshot_id, 0)
+                    else {"Status": "creating", "PercentProgress": 0}
+                )
+                for snapshot_id in snapshot_ids
+            }
+
+        results, copy_started = self.run_with_copies(loop, describe, ["slow", "fast"])
+
+        by_cluster = {r["cluster"]: r for r in results}
+        assert copy_started["backup-fast"] < 500
+        assert copy_started["backup-slow"] >= 500
+        for result in results:
+            assert result["copies"] == [
+                {
+                    "region": "us-west-2",
+                    "snapshot_id": result["snapshot_id"],
+                    "snapshot_arn": f"us-west-2:{result['snapshot_id']}",
+                    "status": "available",
+                    "duration": result["copies"][0]["duration"],
+                }
+            ]
+        assert by_cluster["fast"]["duration"] < 500
+
+    def test_copies_capped_per_destination(self):
+        """No more than max_parallel copies of a group are in flight."""
+        loop = VirtualClockLoop()
+        copies_in_flight = []
+
+        def describe(snapshot_ids, session, region):
+            if region == "us-west-2":
+                copies_in_flight.append(len(snapshot_ids))
+                status = "available" if loop.time() >= 50 else "copying"
+            else:
+                status = "available"
+            return {i: {"Status": status, "PercentProgress": 0} for i in snapshot_ids}
+
+        results, copy_started = self.run_with_copies(
+            loop, describe, ["a", "b", "c"], max_parallel=1
+        )
+
+        assert len(copy_started) == 3
+        assert max(copies_in_flight) == 1
+        assert all(r["copies"][0]["status"] == "available" for r in results)
+
+
+class TestShares:
+    """Test that snapshots are shared as each one completes."""
+
+    def test_share_starts_while_other_snapshots_run(self):
+        """A finished snapshot is shared before the slow one completes."""
+        loop = VirtualClockLoop()
+        finish_at = {"backup-slow": 500.0}
+        shared_at = {}
+
+        def describe(snapshot_ids, session, region):
+            return {
+                snapshot_id: (
+                    {"Status": "available", "PercentProgress": 100}
+                    if loop.time() >= finish_at.get(snapshot_id, 0)
+                    else {"Status": "creating", "PercentProgress": 0}
+                )
+                for snapshot_id in snapshot_ids
+            }
+
+        def share(snapshot_id, account_ids, session, region):
+            shared_at[snapshot_id] = loop.time()
+            return account_ids
+
+        groups = [
+            {
+                "name": "group",
+                "share_with": ["111111111111"],
+                "resources": [
+                    {"DBClusterIdentifier": cluster, "Status": "available"}
+                    for cluster in ["slow", "fast"]
+                ],
+            }
+        ]
+        with (
+            patch("cli.internal.aws.backup.initiate_snapshot", side_effect=initiate),
+            patch(
+                "cli.internal.aws.backup.describe_cluster_snapshots",
+                side_effect=describe,
+            ),
+            patch("cli.internal.aws.sharing.share_cluster_snapshot", side_effect=share),
+        ):
+            results = run_on_virtual_clock(loop, None, parallel=5, groups=groups)
+
+        by_cluster = {r["cluster"]: r for r in results}
+        assert shared_at["backup-fast"] < 500
+        assert shared_at["backup-slow"] >= 500
+        for result in results:
+            assert result["share"]["status"] == "shared"
+            assert result["share"]["latency"] >= result["duration"]
+        assert by_cluster["slow"]["share"]["latency"] >= 500
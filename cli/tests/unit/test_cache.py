@@ -0,0 +1,70 @@
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from cli.internal.utility.cache import (
+    get_cache_dir,
+    read_cache,
+    write_cache,
+    write_json_atomic,
+)
+
+
+class TestCache:
+    """Test the on-disk JSON cache."""
+
+    def test_cache_dir_from_environment(self, isolated_cache_dir):
+        """SUMI_CACHE_DIR overrides the default location."""
+        assert get_cache_dir() == isolated_cache_dir
+
+    def test_round_trip(self):
+        """Written values are read back while fresh."""
+        write_cache("inventory/123/us-east-1/rds", [{"DBClusterIdentifier": "a"}])
+
+        result = read_cache("inventory/123/us-east-1/rds", ttl=60)
+
+        assert result == [{"DBClusterIdentifier": "a"}]
+
+    def test_missing_entry(self):
+        """Missing entries read as None."""
+        assert read_cache("inventory/none", ttl=60) is None
+
+    def test_expired_entry(self):
+        """Entries older than the TTL read as None."""
+        write_cache("inventory/old", [1, 2, 3])
+
+        with patch(
+            "cli.internal.utility.cache.time.time", return_value=time.time() + 61
+        ):
+            assert read_cache("inventory/old", ttl=60) is None
+
+    def test_corrupt_entry(self, isolated_cache_dir):
+        """Unreadable entries read as None."""
+        path = isolated_cache_dir / "broken.json"
+        path.parent.mkdir(parents=True)
+        path.write_text("{not json")
+
+        assert read_cache("broken", ttl=60) is None
+
+    def test_non_json_values_are_stringified(self):
+        """Values like datetimes are stored as strings."""
+        from datetime import datetime
+
+        write_cache("dates", {"created": datetime(2025, 1, 2, 3, 4, 5)})
+
+        assert read_cache("dates", ttl=60) == {"created": "2025-01-02 03:04:05"}
+
+    def test_failed_write_keeps_previous_file(self, tmp_path):
+        """A write that fails midway leaves the old file and no temp files."""
+        path = tmp_path / "state.json"
+        write_json_atomic(path, {"version": 1})
+
+        circular: dict = {"version": 2}
+        circular["self"] = circular
+        with pytest.raises(ValueError):
+            write_json_atomic(path, circular)
+
+        assert json.loads(path.read_text()) == {"version": 1}
+        assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
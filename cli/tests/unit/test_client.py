@@ -1,6 +1,10 @@
-import boto3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
-from cli.internal.aws.client import get_client
+
+import boto3
+
+from cli.internal.aws.client import ClientPool, get_client
 
 
 class TestGetClient:
@@ -56,3 +60,86 @@ class TestGetClient:
         for region in regions:
             get_client("rds", mock_session, region)
             mock_session.client.assert_called_with("rds", region_name=region)
+
+
+class TestClientPool:
+    """Test client caching."""
+
+    def test_reuses_client_for_same_key(self):
+        """The same session, service and region share one client."""
+        pool = ClientPool()
+        mock_session = Mock(spec=boto3.Session)
+
+        first = pool.get("rds", mock_session, "us-east-1")
+        second = pool.get("rds", mock_session, "us-east-1")
+
+        assert first is second
+        mock_session.client.assert_called_once_with("rds", region_name="us-east-1")
+        assert pool.stats() == {"clients": 1, "hits": 1, "misses": 1}
+
+    def test_separate_clients_per_session_service_and_region(self):
+        """Any difference in the key creates a new client."""
+        pool = ClientPool()
+        session_a = Mock(spec=boto3.Session)
+        session_b = Mock(spec=boto3.Session)
+
+        pool.get("rds", session_a, "us-east-1")
+        pool.get("rds", session_b, "us-east-1")
+        pool.get("sts", session_a, "us-east-1")
+        pool.get("rds", session_a, "eu-west-1")
+
+        assert pool.stats() == {"clients": 4, "hits": 0, "misses": 4}
+
+    def test_configure_sets_pool_size(self):
+        """Configured pools size the HTTP connection pool of new clients."""
+        pool = ClientPool()
+        mock_session = Mock(spec=boto3.Session)
+        pool.get("rds", mock_session, "us-east-1")
+
+        pool.configure(max_pool_connections=50)
+        pool.get("rds", mock_session, "us-east-1")
+
+        config = mock_session.client.call_args.kwargs["config"]
+        assert config.max_pool_connections == 50
+        assert mock_session.client.call_count == 2
+
+    def test_concurrent_gets_create_one_client(self):
+        """Worker threads asking for the same client get a single instance."""
+        pool = ClientPool()
+        mock_session = Mock(spec=boto3.Session)
+        mock_session.client.side_effect = lambda *args, **kwargs: object()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(
+                executor.map(
+                    lambda _: pool.get("rds", mock_session, "us-east-1"), range(100)
+                )
+            )
+
+        assert len({id(client) for client in clients}) == 1
+        assert pool.stats() == {"clients": 1, "hits": 99, "misses": 1}
+
+    def test_slow_creation_does_not_block_other_sessions(self):
+        """A client still being created does not hold up other lookups."""
+        pool = ClientPool()
+        slow_session = Mock(spec=boto3.Session)
+        fast_session = Mock(spec=boto3.Session)
+        creating = threading.Event()
+        release = threading.Event()
+
+        def slow_client(*args, **kwargs):
+            creating.set()
+            release.wait(5)
+            return Mock()
+
+        slow_session.client.side_effect = slow_client
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            slow = executor.submit(pool.get, "rds", slow_session, "us-east-1")
+            creating.wait(5)
+            pool.get("rds", fast_session, "us-east-1")
+            assert not slow.done()
+            release.set()
+            slow.result()
+
+        assert pool.stats() == {"clients": 2, "hits": 0, "misses": 2}
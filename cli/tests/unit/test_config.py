@@ -1,6 +1,7 @@
 import pytest
 import yaml
-from cli.internal.utility.config import read_config
+
+from cli.internal.utility.config import get_regions, get_schedule, read_config
 
 
 class TestReadConfig:
@@ -65,3 +66,38 @@ class TestReadConfig:
 
         assert len(result["backup"]["resources"]) == 2
         assert result["backup"]["resources"][0]["type"] == "rds"
+
+
+class TestGetRegions:
+    """Test region list parsing."""
+
+    def test_single_region(self):
+        """A single region name becomes a one-item list."""
+        config = {"provider": {"region": "us-east-1"}}
+        assert get_regions(config) == ["us-east-1"]
+
+    def test_region_list(self):
+        """A list keeps its order and drops duplicates."""
+        config = {"provider": {"region": ["eu-west-1", "us-east-1", "eu-west-1"]}}
+        assert get_regions(config) == ["eu-west-1", "us-east-1"]
+
+    @pytest.mark.parametrize("region", [[], [""], ["us-east-1", 5], 42])
+    def test_invalid_regions(self, region):
+        """Empty lists and non-string entries are rejected."""
+        with pytest.raises(ValueError, match="provider.region"):
+            get_regions({"provider": {"region": region}})
+
+
+class TestGetSchedule:
+    """Test the serve schedule key."""
+
+    def test_optional(self):
+        assert get_schedule({}) is None
+
+    def test_cron_expression(self):
+        assert get_schedule({"schedule": "0 * * * *"}).expression == "0 * * * *"
+
+    @pytest.mark.parametrize("schedule", ["hourly", 60, "0 0 * *", "0 0 30 2 *"])
+    def test_invalid(self, schedule):
+        with pytest.raises(ValueError):
+            get_schedule({"schedule": schedule})
@@ -0,0 +1,162 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from cli.internal.aws.copying import (
+    DEFAULT_COPY_PARALLEL,
+    copy_lifecycle,
+    get_copy_destinations,
+    get_copy_kms_key,
+    get_copy_tags,
+)
+
+
+class TestGetCopyDestinations:
+    """Test reading copy_to from a resource group config."""
+
+    def test_no_copy_to(self):
+        assert get_copy_destinations({"name": "db"}) == []
+
+    def test_single_destination(self):
+        destinations = get_copy_destinations(
+            {"name": "db", "copy_to": {"region": "us-west-2"}}
+        )
+        assert destinations == [
+            {
+                "region": "us-west-2",
+                "kms_key_id": None,
+                "kms_keys": {},
+                "max_parallel": DEFAULT_COPY_PARALLEL,
+            }
+        ]
+
+    def test_list_of_destinations(self):
+        destinations = get_copy_destinations(
+            {
+                "name": "db",
+                "copy_to": [
+                    {"region": "us-west-2", "kms_key_id": "key", "max_parallel": 2},
+                    {"region": "eu-west-1", "kms_keys": {"src": "dst"}},
+                ],
+            }
+        )
+        assert [d["region"] for d in destinations] == ["us-west-2", "eu-west-1"]
+        assert destinations[0]["max_parallel"] == 2
+        assert destinations[1]["kms_keys"] == {"src": "dst"}
+
+    @pytest.mark.parametrize(
+        "copy_to",
+        [
+            [],
+            "us-west-2",
+            [{"kms_key_id": "key"}],
+            [{"region": "us-west-2", "max_parallel": 0}],
+            [{"region": "us-west-2", "max_parallel": True}],
+            [{"region": "us-west-2", "kms_keys": ["key"]}],
+            [{"region": "us-west-2"}, {"region": "us-west-2"}],
+        ],
+    )
+    def test_invalid(self, copy_to):
+        with pytest.raises(ValueError):
+            get_copy_destinations({"name": "db", "copy_to": copy_to})
+
+
+DESTINATION = {
+    "region": "us-west-2",
+    "kms_key_id": "default-key",
+    "kms_keys": {"source-key": "mapped-key"},
+}
+
+
+class TestGetCopyKmsKey:
+    """Test choosing the destination key of a copy."""
+
+    def test_unencrypted(self):
+        assert get_copy_kms_key(DESTINATION, None) is None
+
+    def test_mapped_key(self):
+        assert get_copy_kms_key(DESTINATION, "source-key") == "mapped-key"
+
+    def test_default_key(self):
+        assert get_copy_kms_key(DESTINATION, "other-key") == "default-key"
+
+    def test_missing_key(self):
+        destination = {**DESTINATION, "kms_key_id": None}
+        with pytest.raises(ValueError):
+            get_copy_kms_key(destination, "other-key")
+
+
+RESULT = {
+    "group": "payments",
+    "cluster": "payments-1",
+    "snapshot_id": "backup-payments-1",
+    "snapshot_arn": "arn:us-east-1:backup-payments-1",
+}
+
+
+def test_copy_tags():
+    """Copies are tagged with their source instead of as local snapshots."""
+    tags = {t["Key"]: t["Value"] for t in get_copy_tags(RESULT, "us-east-1")}
+    assert tags == {
+        "origin": "snapctl-copy",
+        "resource": "payments-1",
+        "group": "payments",
+        "sourceRegion": "us-east-1",
+        "sourceSnapshot": "arn:us-east-1:backup-payments-1",
+    }
+
+
+class TestExistingCopy:
+    """Test copying a snapshot whose name is already taken in the region."""
+
+    def run_copy(self, existing):
+        error = ClientError(
+            {"Error": {"Code": "DBClusterSnapshotAlreadyExistsFault"}},
+            "CopyDBClusterSnapshot",
+        )
+        poller = Mock()
+        poller.wait = AsyncMock(return_value={"Status": "available"})
+
+        async def copy():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                return await copy_lifecycle(
+                    RESULT,
+                    DESTINATION,
+                    Mock(),
+                    "us-east-1",
+                    executor,
+                    poller,
+                    asyncio.Semaphore(1),
+                )
+
+        with (
+            patch("cli.internal.aws.copying.copy_cluster_snapshot", side_effect=error),
+            patch(
+                "cli.internal.aws.copying.describe_cluster_snapshots",
+                return_value={"backup-payments-1": existing},
+            ),
+        ):
+            return asyncio.run(copy()), poller
+
+    def test_copy_of_snapshot_is_waited_for(self):
+        existing = {
+            "Status": "copying",
+            "SourceDBClusterSnapshotArn": "arn:us-east-1:backup-payments-1",
+        }
+        copy, poller = self.run_copy(existing)
+        assert copy["status"] == "available"
+        poller.wait.assert_called_once()
+
+    def test_other_snapshot_fails_copy(self):
+        """e.g. the source snapshot itself, when copy_to names its region."""
+        existing = {
+            "Status": "available",
+            "TagList": [{"Key": "origin", "Value": "snapctl"}],
+        }
+        copy, poller = self.run_copy(existing)
+        assert copy["status"] == "failed"
+        assert "Another snapshot named backup-payments-1" in copy["error"]
+        poller.wait.assert_not_called()
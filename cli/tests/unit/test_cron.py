@@ -0,0 +1,71 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from cli.internal.utility.cron import CronSchedule, parse_cron_field
+
+
+def at(day, hour=0, minute=0, month=1, year=2025):
+    return datetime(year, month, day, hour, minute, tzinfo=UTC)
+
+
+class TestParseCronField:
+    """Test parsing of single cron fields."""
+
+    @pytest.mark.parametrize(
+        "field,expected",
+        [
+            ("*", set(range(24))),
+            ("5", {5}),
+            ("1-3", {1, 2, 3}),
+            ("*/6", {0, 6, 12, 18}),
+            ("2-10/4", {2, 6, 10}),
+            ("1,4,20-21", {1, 4, 20, 21}),
+            ("20/2", {20, 22}),
+        ],
+    )
+    def test_valid(self, field, expected):
+        assert parse_cron_field(field, "hour", 0, 23) == expected
+
+    @pytest.mark.parametrize("field", ["24", "a", "*/0", "5-2", "", "1-"])
+    def test_invalid(self, field):
+        with pytest.raises(ValueError):
+            parse_cron_field(field, "hour", 0, 23)
+
+
+class TestCronSchedule:
+    """Test finding the next run time."""
+
+    def test_hourly(self):
+        schedule = CronSchedule("@hourly")
+        assert schedule.next_after(at(1, 10, 0)) == at(1, 11, 0)
+        assert schedule.next_after(at(1, 10, 59)) == at(1, 11, 0)
+
+    def test_strictly_after(self):
+        """A run due right now is not returned again."""
+        schedule = CronSchedule("30 2 * * *")
+        assert schedule.next_after(at(1, 2, 30)) == at(2, 2, 30)
+
+    def test_rolls_over_month(self):
+        schedule = CronSchedule("0 0 1 * *")
+        assert schedule.next_after(at(15)) == at(1, month=2)
+
+    def test_day_of_week(self):
+        """2025-01-01 is a Wednesday, the next Sunday (0 or 7) is the 5th."""
+        assert CronSchedule("0 3 * * 0").next_after(at(1)) == at(5, 3)
+        assert CronSchedule("0 3 * * 7").next_after(at(1)) == at(5, 3)
+
+    def test_either_day_field_matches(self):
+        """Like cron, restricted day of month and day of week are OR-ed."""
+        schedule = CronSchedule("0 0 10 * 0")
+        assert schedule.next_after(at(1)) == at(5)
+        assert schedule.next_after(at(6)) == at(10)
+
+    def test_never_runs(self):
+        with pytest.raises(ValueError):
+            CronSchedule("0 0 30 2 *").next_after(at(1))
+
+    @pytest.mark.parametrize("expression", ["* * * *", "@often", "61 * * * *"])
+    def test_invalid(self, expression):
+        with pytest.raises(ValueError):
+            CronSchedule(expression)
@@ -0,0 +1,98 @@
+import threading
+from datetime import UTC, datetime, timedelta
+
+from cli.internal.utility.cron import CronSchedule
+from cli.internal.utility.daemon import CronRunner
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime(2025, 1, 1, tzinfo=UTC)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, minutes):
+        self.now += timedelta(minutes=minutes)
+
+
+def job(name, expression="* * * * *"):
+    return {"name": name, "schedule": CronSchedule(expression)}
+
+
+class TestCronRunner:
+    """Test running jobs on their schedules."""
+
+    def test_runs_due_jobs_only(self):
+        clock = FakeClock()
+        ran = []
+        runner = CronRunner(
+            [job("minutely"), job("hourly", "@hourly")],
+            lambda j: ran.append(j["name"]),
+            clock,
+        )
+
+        assert runner.run_due() == []
+        clock.advance(1)
+        assert runner.run_due() == ["minutely"]
+        clock.advance(59)
+        assert runner.run_due() == ["minutely", "hourly"]
+
+    def test_jobs_overlap(self):
+        """A long run of one job does not delay another job."""
+        clock = FakeClock()
+        release = threading.Event()
+        started = threading.Barrier(3, timeout=5)
+
+        def run(j):
+            started.wait()
+            release.wait(5)
+
+        runner = CronRunner([job("a"), job("b")], run, clock)
+        clock.advance(1)
+        runner.run_due()
+
+        started.wait()
+        release.set()
+
+    def test_skips_job_still_running(self):
+        clock = FakeClock()
+        release = threading.Event()
+        runner = CronRunner([job("slow")], lambda j: release.wait(5), clock)
+
+        clock.advance(1)
+        assert runner.run_due() == ["slow"]
+        clock.advance(1)
+        assert runner.run_due() == []
+        assert runner.skipped == 1
+        release.set()
+
+    def test_failed_run_stays_scheduled(self):
+        clock = FakeClock()
+        calls = []
+
+        def run(j):
+            calls.append(j["name"])
+            raise OSError("boom")
+
+        runner = CronRunner([job("flaky")], run, clock)
+        stop = threading.Event()
+        clock.advance(1)
+        runner.run_due()
+        clock.advance(1)
+        # Wait for the failed run to finish before it is due again
+        runner._running["flaky"].result(timeout=5)
+        assert runner.run_due() == ["flaky"]
+        stop.set()
+        runner.serve(stop)
+        assert calls == ["flaky", "flaky"]
+
+    def test_serve_stops(self):
+        clock = FakeClock()
+        runner = CronRunner([job("a")], lambda j: None, clock)
+        stop = threading.Event()
+        stop.set()
+
+        runner.serve(stop)
+
+        assert runner.runs == 0
@@ -0,0 +1,68 @@
+from cli.internal.aws.durations import (
+    DEFAULT_SECONDS_PER_GB,
+    DurationEstimator,
+    load_duration_history,
+    save_duration_history,
+)
+
+
+def result(cluster, duration, status="available", storage=100):
+    return {
+        "cluster": cluster,
+        "status": status,
+        "duration": duration,
+        "allocated_storage": storage,
+    }
+
+
+class TestDurationEstimator:
+    """Test expected snapshot durations."""
+
+    def test_uses_history(self):
+        estimate = DurationEstimator({"a": {"duration": 600.0, "storage": 100.0}})
+        assert estimate({"DBClusterIdentifier": "a", "AllocatedStorage": 1}) == 600.0
+
+    def test_storage_at_median_rate(self):
+        """Unknown clusters are estimated at the median seconds per GiB seen."""
+        estimate = DurationEstimator(
+            {
+                "a": {"duration": 100.0, "storage": 100.0},
+                "b": {"duration": 400.0, "storage": 100.0},
+                "c": {"duration": 900.0, "storage": 100.0},
+            }
+        )
+        assert estimate({"DBClusterIdentifier": "new", "AllocatedStorage": 50}) == 200.0
+
+    def test_default_rate_without_history(self):
+        estimate = DurationEstimator({})
+        resource = {"DBClusterIdentifier": "new", "AllocatedStorage": 10}
+        assert estimate(resource) == 10 * DEFAULT_SECONDS_PER_GB
+
+    def test_unknown_size(self):
+        assert DurationEstimator({})({"DBClusterIdentifier": "new"}) == 0.0
+
+
+class TestDurationHistory:
+    """Test recording durations between runs."""
+
+    def test_round_trip_and_smoothing(self):
+        """Durations are smoothed with earlier runs and failures are ignored."""
+        history = load_duration_history("durations/123/us-east-1")
+        assert history == {}
+
+        save_duration_history(
+            "durations/123/us-east-1",
+            history,
+            [result("a", 100), result("b", 50, status="failed")],
+        )
+        history = load_duration_history("durations/123/us-east-1")
+        assert history == {"a": {"duration": 100.0, "storage": 100.0}}
+
+        save_duration_history("durations/123/us-east-1", history, [result("a", 300)])
+        history = load_duration_history("durations/123/us-east-1")
+        assert history["a"]["duration"] == 200.0
+
+    def test_disabled_without_cache_name(self, isolated_cache_dir):
+        save_duration_history(None, {}, [result("a", 100)])
+        assert load_duration_history(None) == {}
+        assert not isolated_cache_dir.exists()
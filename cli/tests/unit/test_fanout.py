@@ -0,0 +1,60 @@
+import threading
+
+from botocore.exceptions import ClientError
+
+from cli.internal.aws.fanout import run_concurrently
+
+
+class TestRunConcurrently:
+    """Test concurrent fan-out with per-item isolation."""
+
+    def test_results_keep_item_order(self):
+        """Results come back in the order of the items."""
+        results = run_concurrently([3, 1, 2], lambda n: n * 10)
+        assert results == [(3, 30, None), (1, 10, None), (2, 20, None)]
+
+    def test_failures_are_isolated(self):
+        """One failing item does not affect the others."""
+
+        def work(name):
+            if name == "broken":
+                raise ClientError({"Error": {"Code": "Boom"}}, "Work")
+            return name.upper()
+
+        results = run_concurrently(["a", "broken", "b"], work)
+
+        assert results[0] == ("a", "A", None)
+        assert results[1][0] == "broken"
+        assert isinstance(results[1][2], ClientError)
+        assert results[2] == ("b", "B", None)
+
+    def test_items_run_concurrently(self):
+        """All items are in flight at the same time when workers allow it."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        results = run_concurrently(["a", "b", "c"], lambda item: barrier.wait())
+
+        assert all(error is None for _, _, error in results)
+
+    def test_max_workers_caps_concurrency(self):
+        """No more than max_workers items run at once."""
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def work(item):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            threading.Event().wait(0.01)
+            with lock:
+                running -= 1
+
+        run_concurrently(list(range(10)), work, max_workers=2)
+
+        assert peak <= 2
+
+    def test_empty_items(self):
+        """No work for no items."""
+        assert run_concurrently([], lambda item: item) == []
@@ -0,0 +1,130 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from cli.internal.aws.discovery import FleetStream
+from cli.internal.aws.resource_filtering import iter_fleet, scan_fleet
+from cli.internal.aws.tag_filter import compile_tag_filter
+
+
+def record(name, **tags):
+    return {
+        "DBClusterIdentifier": name,
+        "TagList": [{"Key": k, "Value": v} for k, v in tags.items()],
+    }
+
+
+class TestFleetStream:
+    """Test splitting one scan into per-group streams."""
+
+    def test_reading_one_group_buffers_the_others(self):
+        """Records for other groups are buffered, not lost or rescanned."""
+        pulled = []
+
+        def source():
+            for item in [
+                record("a", Team="x"),
+                record("b", Team="y"),
+                record("c", Team="x"),
+            ]:
+                pulled.append(item["DBClusterIdentifier"])
+                yield item
+
+        stream = FleetStream(
+            source(),
+            [compile_tag_filter("tag:Team=x"), compile_tag_filter("tag:Team=y")],
+        )
+        first_group = stream.resources(0)
+
+        assert next(first_group)["DBClusterIdentifier"] == "a"
+        # Only as much of the scan as needed has been read
+        assert pulled == ["a"]
+
+        assert [r["DBClusterIdentifier"] for r in first_group] == ["c"]
+        assert [r["DBClusterIdentifier"] for r in stream.resources(1)] == ["b"]
+        assert pulled == ["a", "b", "c"]
+
+    def test_on_complete_receives_whole_scan(self):
+        """The completion callback gets every scanned record once."""
+        completed = []
+        stream = FleetStream(
+            iter([record("a", Team="x"), record("b")]),
+            [compile_tag_filter("tag:Team=x")],
+            completed.append,
+        )
+
+        list(stream.resources(0))
+        list(stream.resources(0))
+
+        assert len(completed) == 1
+        assert [r["DBClusterIdentifier"] for r in completed[0]] == ["a", "b"]
+
+    def test_scan_errors_reach_every_group(self):
+        """A failed scan raises for every reader."""
+
+        def source():
+            yield record("a", Team="x")
+            raise RuntimeError("describe failed")
+
+        stream = FleetStream(
+            source(),
+            [compile_tag_filter("tag:Team=x"), compile_tag_filter("tag:Team=y")],
+        )
+
+        with pytest.raises(RuntimeError):
+            list(stream.resources(0))
+        with pytest.raises(RuntimeError):
+            list(stream.resources(1))
+
+
+class TestIterFleet:
+    """Test concurrent fleet enumeration."""
+
+    def test_instances_and_clusters_are_described_concurrently(self):
+        """Each operation waits for the other to start, so sequential paging would hang."""
+        started = {op: threading.Event() for op in ["instances", "clusters"]}
+
+        def pages(own, other, key, items):
+            started[own].set()
+            assert started[other].wait(timeout=5), "operations ran sequentially"
+            yield {key: items}
+
+        client = Mock()
+        client.get_paginator.side_effect = lambda operation: Mock(
+            paginate=Mock(
+                return_value=pages(
+                    "instances", "clusters", "DBInstances", [{"TagList": [], "i": 1}]
+                )
+                if operation == "describe_db_instances"
+                else pages(
+                    "clusters", "instances", "DBClusters", [{"TagList": [], "c": 1}]
+                )
+            )
+        )
+        stats: dict[str, int] = {}
+
+        records = list(iter_fleet(client, "rds", stats))
+
+        assert len(records) == 2
+        assert stats == {"describe_calls": 2}
+
+    def test_scan_fleet_orders_instances_first(self):
+        """scan_fleet returns a deterministic order regardless of arrival."""
+        client = Mock()
+        client.get_paginator.side_effect = lambda operation: Mock(
+            paginate=Mock(
+                return_value=[
+                    {"DBInstances": [{"TagList": [], "n": 1}, {"TagList": [], "n": 2}]}
+                ]
+                if operation == "describe_db_instances"
+                else [{"DBClusters": [{"TagList": [], "n": 3}]}]
+            )
+        )
+
+        assert [r["n"] for r in scan_fleet(client, "rds")] == [1, 2, 3]
+
+    def test_unsupported_service(self):
+        """Unknown services raise ValueError."""
+        with pytest.raises(ValueError, match="Unsupported service: s3"):
+            list(iter_fleet(Mock(), "s3"))
@@ -0,0 +1,62 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+
+from cli.internal.aws.freshness import FreshnessPolicy, load_freshness_policy
+
+NOW = datetime(2025, 1, 1, 12, 0, tzinfo=UTC)
+
+
+def policy(**ages):
+    """Policy whose clusters' latest snapshots are the given minutes old."""
+    latest = {name: NOW - timedelta(minutes=age) for name, age in ages.items()}
+    return FreshnessPolicy(latest, clock=lambda: NOW)
+
+
+class TestFreshnessPolicy:
+    """Test skipping clusters with a recent snapshot."""
+
+    def test_recent_snapshot_is_fresh(self):
+        freshness = policy(db=10)
+        assert freshness.is_fresh("db", min_interval=3600)
+        assert freshness.skipped == 1
+
+    def test_old_snapshot_is_stale(self):
+        freshness = policy(db=90)
+        assert not freshness.is_fresh("db", min_interval=3600)
+        assert freshness.skipped == 0
+
+    def test_without_snapshot(self):
+        assert not policy().is_fresh("db", min_interval=3600)
+
+    def test_without_min_interval(self):
+        assert not policy(db=1).is_fresh("db", min_interval=None)
+
+
+class TestLoadFreshnessPolicy:
+    """Test listing recent snapshots only when needed."""
+
+    @patch("cli.internal.aws.freshness.list_latest_snapshots")
+    def test_no_listing_without_min_interval(self, mock_list):
+        groups = [{"name": "g", "min_interval": None}]
+        assert load_freshness_policy(groups, None, "us-east-1") is None
+        mock_list.assert_not_called()
+
+    @patch("cli.internal.aws.freshness.list_latest_snapshots")
+    def test_one_listing_for_all_groups(self, mock_list):
+        mock_list.return_value = {"db": NOW}
+        groups = [{"name": "a", "min_interval": 60}, {"name": "b", "min_interval": 60}]
+
+        freshness = load_freshness_policy(groups, None, "us-east-1")
+
+        assert freshness.latest == {"db": NOW}
+        mock_list.assert_called_once_with(None, "us-east-1")
+
+    @patch("cli.internal.aws.freshness.list_latest_snapshots")
+    def test_listing_failure_skips_nothing(self, mock_list):
+        mock_list.side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied"}}, "DescribeDBClusterSnapshots"
+        )
+        groups = [{"name": "g", "min_interval": 60}]
+        assert load_freshness_policy(groups, None, "us-east-1") is None
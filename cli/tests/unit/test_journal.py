@@ -0,0 +1,94 @@
+import pytest
+
+from cli.internal.aws.journal import (
+    RunJournal,
+    get_journal_key,
+    get_journal_path,
+    new_run_id,
+)
+
+CLUSTER = {
+    "DBClusterIdentifier": "db-1",
+    "DBClusterArn": "arn:aws:rds:us-east-1:111111111111:cluster:db-1",
+}
+
+
+class TestRunJournal:
+    """Test recording and replaying a backup run."""
+
+    def test_replays_latest_state(self):
+        """A reloaded journal holds each snapshot's merged, latest event."""
+        journal = RunJournal.create("run-1", "config.yml")
+        journal.record("pending", "payments", CLUSTER, "us-east-1")
+        journal.record(
+            "initiated",
+            "payments",
+            CLUSTER,
+            "us-east-1",
+            snapshot_id="backup-db-1",
+            snapshot_arn="arn:snapshot",
+        )
+
+        entry = RunJournal.load("run-1").get("payments", CLUSTER)
+
+        assert entry["event"] == "initiated"
+        assert entry["snapshot_id"] == "backup-db-1"
+        assert entry["initiated_at"] == entry["at"]
+
+    def test_completed_keeps_initiated_time(self):
+        journal = RunJournal.create("run-1", "config.yml")
+        journal.record("initiated", "g", CLUSTER, "us-east-1", snapshot_id="s")
+        journal.record("completed", "g", CLUSTER, "us-east-1", status="available")
+
+        entry = RunJournal.load("run-1").get("g", CLUSTER)
+
+        assert entry["event"] == "completed"
+        assert entry["status"] == "available"
+        assert entry["snapshot_id"] == "s"
+        assert "initiated_at" in entry
+
+    def test_ignores_torn_last_line(self):
+        """A line half written when the process died is skipped."""
+        journal = RunJournal.create("run-1", "config.yml")
+        journal.record("initiated", "g", CLUSTER, "us-east-1", snapshot_id="s")
+        with open(journal.path, "a") as file:
+            file.write('{"event": "completed", "key": ')
+
+        entry = RunJournal.load("run-1").get("g", CLUSTER)
+
+        assert entry["event"] == "initiated"
+
+    def test_groups_are_separate(self):
+        """The same cluster in two groups is journaled twice."""
+        journal = RunJournal.create("run-1", "config.yml")
+        journal.record("initiated", "a", CLUSTER, "us-east-1", snapshot_id="s")
+
+        assert journal.get("b", CLUSTER) is None
+
+    def test_create_refuses_existing_run(self):
+        RunJournal.create("run-1", "config.yml")
+        with pytest.raises(FileExistsError):
+            RunJournal.create("run-1", "config.yml")
+
+    def test_load_unknown_run(self):
+        with pytest.raises(FileNotFoundError):
+            RunJournal.load("missing")
+
+
+class TestJournalNames:
+    """Test run ids, paths and keys."""
+
+    def test_run_ids_are_unique(self):
+        assert new_run_id() != new_run_id()
+
+    def test_path_under_cache_dir(self, isolated_cache_dir):
+        assert get_journal_path("run-1") == isolated_cache_dir / "runs/run-1.jsonl"
+
+    @pytest.mark.parametrize("run_id", ["../escape", "a/b", "", ".hidden"])
+    def test_rejects_non_file_names(self, run_id):
+        with pytest.raises(ValueError):
+            get_journal_path(run_id)
+
+    def test_key_prefers_arn(self):
+        assert get_journal_key("g", CLUSTER) == f"g/{CLUSTER['DBClusterArn']}"
+        assert get_journal_key("g", {"DBClusterIdentifier": "x"}) == "g/x"
@@ -0,0 +1,162 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from cli.internal.aws.pruning import (
+    find_expired_copies,
+    find_expired_snapshots,
+    get_retention_policy,
+    select_expired,
+)
+
+NOW = datetime(2026, 6, 15, 12, tzinfo=UTC)
+
+
+def snapshot(snapshot_id, age, cluster="db-1"):
+    return {
+        "DBClusterSnapshotIdentifier": snapshot_id,
+        "DBClusterIdentifier": cluster,
+        "SnapshotCreateTime": NOW - age,
+    }
+
+
+def expired_ids(snapshots, policy):
+    return sorted(
+        s["DBClusterSnapshotIdentifier"] for s in select_expired(snapshots, policy, NOW)
+    )
+
+
+# One snapshot every 12 hours for 90 days, newest first
+HISTORY = [snapshot(f"s{i}", timedelta(hours=12 * i)) for i in range(180)]
+
+
+class TestGetRetentionPolicy:
+    """Test reading retention from a resource group config."""
+
+    def test_no_retention(self):
+        assert get_retention_policy({"name": "db"}) is None
+
+    def test_valid(self):
+        policy = {"keep_last": 3, "daily": 7, "max_age_days": 90}
+        assert get_retention_policy({"name": "db", "retention": policy}) == policy
+
+    @pytest.mark.parametrize(
+        "retention",
+        [{}, [], {"hourly": 3}, {"keep_last": 0}, {"daily": "7"}, {"weekly": True}],
+    )
+    def test_invalid(self, retention):
+        with pytest.raises(ValueError):
+            get_retention_policy({"name": "db", "retention": retention})
+
+
+class TestSelectExpired:
+    """Test which snapshots a retention policy expires."""
+
+    def test_keep_last(self):
+        expired = expired_ids(HISTORY, {"keep_last": 3})
+        assert len(expired) == 177
+        assert not {"s0", "s1", "s2"} & set(expired)
+
+    def test_daily_keeps_newest_per_day(self):
+        kept = {s["DBClusterSnapshotIdentifier"] for s in HISTORY} - set(
+            expired_ids(HISTORY, {"daily": 7})
+        )
+        days = {
+            s["SnapshotCreateTime"].date()
+            for s in HISTORY
+            if s["DBClusterSnapshotIdentifier"] in kept
+        }
+        assert len(kept) == len(days) == 7
+
+    def test_weekly_and_monthly(self):
+        expired = set(expired_ids(HISTORY, {"weekly": 4, "monthly": 3}))
+        kept = [s for s in HISTORY if s["DBClusterSnapshotIdentifier"] not in expired]
+        # The newest snapshot and the last of May count for both rules
+        assert [s["SnapshotCreateTime"].date().isoformat() for s in kept] == [
+            "2026-06-15",
+            "2026-06-14",
+            "2026-06-07",
+            "2026-05-31",
+            "2026-04-30",
+        ]
+
+    def test_max_age_only(self):
+        expired = expired_ids(HISTORY, {"max_age_days": 30})
+        assert all(
+            NOW - s["SnapshotCreateTime"] > timedelta(days=30)
+            for s in HISTORY
+            if s["DBClusterSnapshotIdentifier"] in expired
+        )
+        assert len(expired) == 180 - 61
+
+    def test_max_age_overrides_periodic_rules(self):
+        expired = expired_ids(HISTORY, {"monthly": 12, "max_age_days": 31})
+        assert len(HISTORY) - len(expired) == 2
+
+    def test_keep_last_overrides_max_age(self):
+        old = [
+            snapshot("old-1", timedelta(days=400)),
+            snapshot("old-2", timedelta(days=500)),
+        ]
+        assert expired_ids(old, {"keep_last": 1, "max_age_days": 30}) == ["old-2"]
+
+
+class TestFindExpiredSnapshots:
+    """Test sorting a snapshot listing by cluster and group."""
+
+    def test_clusters_outside_groups_are_kept(self):
+        snapshots = [
+            snapshot("a-new", timedelta(days=1), "a"),
+            snapshot("a-old", timedelta(days=2), "a"),
+            snapshot("b-old", timedelta(days=2), "b"),
+        ]
+        groups = [{"name": "g", "retention": {"keep_last": 1}, "clusters": {"a"}}]
+
+        expired, kept = find_expired_snapshots(groups, iter(snapshots), NOW)
+
+        assert [e["snapshot_id"] for e in expired] == ["a-old"]
+        assert expired[0]["group"] == "g"
+        assert kept == 1
+
+    def test_cluster_in_several_groups_keeps_union(self):
+        snapshots = [snapshot(f"s{i}", timedelta(days=i)) for i in range(5)]
+        groups = [
+            {"name": "short", "retention": {"keep_last": 1}, "clusters": {"db-1"}},
+            {"name": "long", "retention": {"keep_last": 3}, "clusters": {"db-1"}},
+        ]
+
+        expired, kept = find_expired_snapshots(groups, snapshots, NOW)
+
+        assert sorted(e["snapshot_id"] for e in expired) == ["s3", "s4"]
+        assert kept == 3
+
+
+def copy(snapshot_id, age, group, source_region="us-east-1"):
+    tags = {"group": group, "sourceRegion": source_region, "resource": "db-1"}
+    return {
+        **snapshot(snapshot_id, age),
+        "TagList": [{"Key": key, "Value": value} for key, value in tags.items()],
+    }
+
+
+class TestFindExpiredCopies:
+    """Test sorting the copies in a region by source and group."""
+
+    def test_copies_pruned_per_source_region(self):
+        copies = [
+            copy("east-new", timedelta(days=1), "g"),
+            copy("east-old", timedelta(days=2), "g"),
+            copy("west-old", timedelta(days=2), "g", "us-west-2"),
+        ]
+
+        expired, kept = find_expired_copies({"g": {"keep_last": 1}}, copies, NOW)
+
+        assert [e["snapshot_id"] for e in expired] == ["east-old"]
+        assert expired[0]["source_region"] == "us-east-1"
+        assert kept == 2
+
+    def test_copies_of_groups_without_policy_are_kept(self):
+        copies = [copy(f"c{i}", timedelta(days=i), "other") for i in range(3)]
+        copies.append({**snapshot("untagged", timedelta(days=9)), "TagList": []})
+
+        assert find_expired_copies({"g": {"keep_last": 1}}, copies, NOW) == ([], 0)
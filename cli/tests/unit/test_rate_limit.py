@@ -0,0 +1,124 @@
+from unittest.mock import Mock
+
+import pytest
+
+from cli.internal.aws.rate_limit import (
+    DEFAULT_RDS_RATE,
+    RateLimiter,
+    attach_rate_limiter,
+    get_api_settings,
+)
+
+
+class FakeClock:
+    """Clock whose sleep advances time instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def limiter(max_rate, clock):
+    return RateLimiter(max_rate, clock=clock.time, sleep=clock.sleep)
+
+
+class TestGetApiSettings:
+    """Test the optional api config block."""
+
+    def test_defaults(self):
+        assert get_api_settings({}) == {"rds_rate": DEFAULT_RDS_RATE}
+
+    def test_reads_rate(self):
+        assert get_api_settings({"api": {"rds_rate": 5}}) == {"rds_rate": 5}
+
+    @pytest.mark.parametrize("rate", [0, -1, "fast", True])
+    def test_invalid_rate(self, rate):
+        with pytest.raises(ValueError):
+            get_api_settings({"api": {"rds_rate": rate}})
+
+
+class TestRateLimiter:
+    """Test the adaptive token bucket."""
+
+    def test_burst_then_paced(self):
+        """One second of tokens is available at once, then calls are paced."""
+        clock = FakeClock()
+        bucket = limiter(10, clock)
+
+        for _ in range(10):
+            bucket.acquire()
+        assert clock.sleeps == []
+
+        for _ in range(5):
+            bucket.acquire()
+        assert clock.now == pytest.approx(0.5)
+        assert bucket.calls == 15
+
+    def test_throttle_halves_rate_and_drains(self):
+        clock = FakeClock()
+        bucket = limiter(8, clock)
+
+        bucket.record_throttle()
+        bucket.acquire()
+
+        assert bucket.rate == 4
+        assert bucket.throttles == 1
+        assert clock.now == pytest.approx(0.25)
+
+    def test_rate_recovers_up_to_maximum(self):
+        clock = FakeClock()
+        bucket = limiter(8, clock)
+        bucket.record_throttle()
+        bucket.record_throttle()
+
+        for _ in range(4):
+            bucket.record_success()
+        assert 2 < bucket.rate < 8
+
+        for _ in range(100):
+            bucket.record_success()
+        assert bucket.rate == 8
+
+    def test_rate_floor(self):
+        bucket = limiter(4, FakeClock())
+        for _ in range(10):
+            bucket.record_throttle()
+        assert bucket.rate == 1
+
+
+class TestAttachRateLimiter:
+    """Test the botocore event hooks."""
+
+    def hooks(self):
+        client = Mock()
+        client.meta.service_model.endpoint_prefix = "rds"
+        bucket = Mock(spec=RateLimiter)
+        attach_rate_limiter(client, bucket)
+        before_send = client.meta.events.register_first.call_args.args
+        after_attempt = client.meta.events.register.call_args.args
+        assert before_send[0] == "before-send.rds"
+        assert after_attempt[0] == "needs-retry.rds"
+        return bucket, before_send[1], after_attempt[1]
+
+    def test_every_attempt_takes_a_token(self):
+        bucket, before_send, _ = self.hooks()
+        assert before_send(request=Mock()) is None
+        bucket.acquire.assert_called_once()
+
+    def test_attempt_outcomes_adjust_rate(self):
+        bucket, _, after_attempt = self.hooks()
+
+        after_attempt(response=(Mock(), {"DBClusters": []}), attempts=1)
+        after_attempt(response=(Mock(), {"Error": {"Code": "Throttling"}}), attempts=1)
+        after_attempt(response=(Mock(), {"Error": {"Code": "DBClusterNotFoundFault"}}))
+        after_attempt(response=None, caught_exception=ConnectionError())
+
+        bucket.record_success.assert_called_once()
+        bucket.record_throttle.assert_called_once()
@@ -1,4 +1,16 @@
-from cli.internal.aws.resource_filtering import parse_tag_filter, matches_tag_filter
+from unittest.mock import Mock
+
+import pytest
+
+from cli.internal.aws.resource_filtering import (
+    build_tag_filters,
+    classify_rds_record,
+    get_covered_identifiers,
+    list_resource_by_tag,
+    matches_tag_filter,
+    parse_tag_filter,
+    prune_redundant_records,
+)
 
 
 class TestParseTagFilter:
@@ -34,6 +46,11 @@ class TestParseTagFilter:
         result = parse_tag_filter("")
         assert result == []
 
+    def test_parse_rejects_non_equality_filters(self):
+        """Filters using NOT cannot be expressed as AND/OR groups."""
+        with pytest.raises(ValueError, match="AND/OR equalities"):
+            parse_tag_filter("NOT tag:Owner=devops")
+
 
 class TestMatchesTagFilter:
     """Test tag matching logic."""
@@ -97,3 +114,193 @@ class TestMatchesTagFilter:
         tags = [{"Key": "Owner", "Value": "devops"}]
         filter_groups = []
         assert matches_tag_filter(tags, filter_groups) is False
+
+
+class TestBuildTagFilters:
+    """Test conversion of AND groups into tagging API filters."""
+
+    def test_build_single_condition(self):
+        """Single condition becomes one TagFilter."""
+        result = build_tag_filters([("Backup", "true")])
+        assert result == [{"Key": "Backup", "Values": ["true"]}]
+
+    def test_build_and_conditions(self):
+        """AND conditions become separate TagFilters."""
+        result = build_tag_filters([("Env", "prod"), ("Backup", "true")])
+        assert result == [
+            {"Key": "Env", "Values": ["prod"]},
+            {"Key": "Backup", "Values": ["true"]},
+        ]
+
+    def test_build_conflicting_conditions(self):
+        """Same key with different values can never match."""
+        assert build_tag_filters([("Env", "prod"), ("Env", "dev")]) is None
+
+
+def make_paging_client(instances, clusters, tags_by_arn=None):
+    """Build a mock RDS client that serves one describe page per record type."""
+    client = Mock()
+    pages = {
+        "describe_db_instances": [{"DBInstances": instances}],
+        "describe_db_clusters": [{"DBClusters": clusters}],
+    }
+
+    def get_paginator(operation):
+        paginator = Mock()
+        paginator.paginate.return_value = pages[operation]
+        return paginator
+
+    client.get_paginator.side_effect = get_paginator
+    client.list_tags_for_resource.side_effect = lambda ResourceName: {
+        "TagList": (tags_by_arn or {}).get(ResourceName, [])
+    }
+    return client
+
+
+class TestListResourceByTag:
+    """Test tag resolution during discovery."""
+
+    def test_uses_tag_list_from_describe_records(self):
+        """Records carrying a TagList should not trigger a tag lookup."""
+        client = make_paging_client(
+            instances=[
+                {
+                    "DBInstanceArn": "arn:db:a",
+                    "TagList": [{"Key": "Env", "Value": "prod"}],
+                }
+            ],
+            clusters=[{"DBClusterArn": "arn:cluster:b", "TagList": []}],
+        )
+        stats: dict[str, int] = {}
+
+        result = list_resource_by_tag(client, "rds", "tag:Env=prod", stats=stats)
+
+        assert [r["DBInstanceArn"] for r in result] == ["arn:db:a"]
+        client.list_tags_for_resource.assert_not_called()
+        assert stats == {"describe_calls": 2}
+
+    def test_falls_back_to_tag_lookup_when_tag_list_missing(self):
+        """Records without a TagList should have their tags fetched by ARN."""
+        client = make_paging_client(
+            instances=[{"DBInstanceArn": "arn:db:a"}],
+            clusters=[{"DBClusterArn": "arn:cluster:b", "TagList": []}],
+            tags_by_arn={"arn:db:a": [{"Key": "Env", "Value": "prod"}]},
+        )
+        stats: dict[str, int] = {}
+
+        result = list_resource_by_tag(client, "rds", "tag:Env=prod", stats=stats)
+
+        assert [r["DBInstanceArn"] for r in result] == ["arn:db:a"]
+        client.list_tags_for_resource.assert_called_once_with(ResourceName="arn:db:a")
+        assert stats == {"describe_calls": 2, "tag_calls": 1}
+
+    def test_skips_member_and_replica_tag_lookups(self):
+        """Cluster members and read replicas are pruned before tag lookups."""
+        client = make_paging_client(
+            instances=[
+                {"DBInstanceIdentifier": "standalone", "DBInstanceArn": "arn:db:a"},
+                {
+                    "DBInstanceIdentifier": "member",
+                    "DBInstanceArn": "arn:db:member",
+                    "DBClusterIdentifier": "aurora",
+                },
+                {
+                    "DBInstanceIdentifier": "replica",
+                    "DBInstanceArn": "arn:db:replica",
+                    "ReadReplicaSourceDBInstanceIdentifier": "standalone",
+                },
+            ],
+            clusters=[{"DBClusterIdentifier": "aurora", "DBClusterArn": "arn:c"}],
+            tags_by_arn={"arn:db:a": [{"Key": "Env", "Value": "prod"}]},
+        )
+        stats: dict[str, int] = {}
+
+        result = list_resource_by_tag(client, "rds", "tag:Env=prod", stats=stats)
+
+        assert [r["DBInstanceArn"] for r in result] == ["arn:db:a"]
+        looked_up = {
+            call.kwargs["ResourceName"]
+            for call in client.list_tags_for_resource.call_args_list
+        }
+        assert looked_up == {"arn:db:a", "arn:c"}
+        assert stats["skipped_cluster_members"] == 1
+        assert stats["skipped_read_replicas"] == 1
+
+
+class TestClassifyRdsRecord:
+    """Test classification of RDS describe records."""
+
+    @pytest.mark.parametrize(
+        "record,kind",
+        [
+            ({"DBInstanceIdentifier": "db"}, "instance"),
+            ({"DBClusterIdentifier": "aurora"}, "cluster"),
+            (
+                {"DBInstanceIdentifier": "db", "DBClusterIdentifier": "aurora"},
+                "cluster_member",
+            ),
+            (
+                {
+                    "DBInstanceIdentifier": "db",
+                    "ReadReplicaSourceDBInstanceIdentifier": "source",
+                },
+                "read_replica",
+            ),
+            (
+                {
+                    "DBInstanceIdentifier": "db",
+                    "ReadReplicaSourceDBClusterIdentifier": "aurora",
+                },
+                "read_replica",
+            ),
+            (
+                {
+                    "DBInstanceIdentifier": "db",
+                    "ReadReplicaSourceDBInstanceIdentifier": (
+                        "arn:aws:rds:eu-west-1:123456789012:db:source"
+                    ),
+                },
+                "instance",
+            ),
+        ],
+    )
+    def test_classify(self, record, kind):
+        assert classify_rds_record(record) == kind
+
+    def test_prune_keeps_order_and_counts(self):
+        """Standalone instances and clusters are kept in order."""
+        records = [
+            {"DBInstanceIdentifier": "a"},
+            {"DBInstanceIdentifier": "m", "DBClusterIdentifier": "c"},
+            {"DBClusterIdentifier": "c"},
+        ]
+        stats: dict[str, int] = {}
+
+        kept = prune_redundant_records(records, stats)
+
+        assert kept == [records[0], records[2]]
+        assert stats == {"skipped_cluster_members": 1}
+
+    def test_covered_identifiers(self):
+        """Clusters cover their members, instances their same-region replicas."""
+        cluster = {
+            "DBClusterIdentifier": "c",
+            "DBClusterMembers": [{"DBInstanceIdentifier": "m1"}],
+        }
+        instance = {
+            "DBInstanceIdentifier": "a",
+            "ReadReplicaDBInstanceIdentifiers": [
+                "r1",
+                "r2",
+                "arn:aws:rds:eu-west-1:123456789012:db:r3",
+            ],
+        }
+
+        assert get_covered_identifiers(cluster) == {
+            "cluster_member": ["m1"],
+            "read_replica": [],
+        }
+        assert get_covered_identifiers(instance) == {
+            "cluster_member": [],
+            "read_replica": ["r1", "r2"],
+        }
@@ -0,0 +1,190 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from cli.internal.aws.restore import (
+    PartialRestoreError,
+    get_restore_status,
+    run_restores,
+    start_restore,
+)
+from cli.tests.unit.test_backup_polling import VirtualClockLoop
+
+OPTIONS = {
+    "suffix": "-restored",
+    "instance_class": "db.r6g.large",
+    "db_subnet_group": None,
+    "security_groups": [],
+}
+
+
+def point(cluster):
+    return {
+        "group": None,
+        "cluster": cluster,
+        "snapshot_id": f"backup-{cluster}",
+        "engine": "aurora-postgresql",
+        "engine_version": None,
+    }
+
+
+class TestGetRestoreStatus:
+    """Test deriving a restore's status from its cluster and instances."""
+
+    def test_not_listed_yet(self):
+        assert get_restore_status(None) == "creating"
+
+    def test_cluster_without_instance(self):
+        restore = {"status": "available", "instances": {}}
+        assert get_restore_status(restore) == "creating"
+
+    def test_instance_still_creating(self):
+        restore = {"status": "available", "instances": {"db-1": "creating"}}
+        assert get_restore_status(restore) == "creating"
+
+    def test_available(self):
+        restore = {"status": "available", "instances": {"db-1": "available"}}
+        assert get_restore_status(restore) == "available"
+
+    def test_failed(self):
+        restore = {"status": "incompatible-restore", "instances": {}}
+        assert get_restore_status(restore) == "failed"
+
+
+class TestRunRestores:
+    """Test restoring a fleet at once on a virtual clock."""
+
+    def run(self, loop, ready_at, parallel):
+        started = {}
+        status_calls = []
+
+        def start(point, options, session, region):
+            started[options["target_id"]] = loop.time()
+
+        def describe(cluster_ids, session, region):
+            status_calls.append(sorted(cluster_ids))
+            return {
+                cluster_id: {
+                    "status": "available",
+                    "instances": {
+                        f"{cluster_id}-1": (
+                            "available"
+                            if loop.time() - started[cluster_id]
+                            >= ready_at[cluster_id.removesuffix("-restored")]
+                            else "creating"
+                        )
+                    },
+                }
+                for cluster_id in cluster_ids
+            }
+
+        points = [point(cluster) for cluster in ready_at]
+        with (
+            patch("cli.internal.aws.restore.start_restore", side_effect=start),
+            patch("cli.internal.aws.restore.describe_restores", side_effect=describe),
+        ):
+            try:
+                results = loop.run_until_complete(
+                    run_restores(points, OPTIONS, None, "us-east-1", parallel)
+                )
+            finally:
+                loop.close()
+        return results, status_calls
+
+    def test_fleet_takes_as_long_as_slowest_restore(self):
+        """Restores overlap, so the fleet is not the sum of its restores."""
+        loop = VirtualClockLoop()
+        ready_at = {"a": 300, "b": 600, "c": 900}
+
+        results, status_calls = self.run(loop, ready_at, parallel=3)
+
+        assert [r["status"] for r in results] == ["available"] * 3
+        assert max(r["available_after"] for r in results) < 1000
+        # Every check covers all restores still in flight
+        assert status_calls[0] == ["a-restored", "b-restored", "c-restored"]
+        assert len(status_calls) <= 900 / 30 + 1
+
+    def test_parallel_caps_restores_in_flight(self):
+        """With one slot, restores run one after another."""
+        loop = VirtualClockLoop()
+        ready_at = {"a": 300, "b": 300}
+
+        results, status_calls = self.run(loop, ready_at, parallel=1)
+
+        assert all(len(cluster_ids) == 1 for cluster_ids in status_calls)
+        assert results[1]["available_after"] >= 600
+
+    def test_failed_start_does_not_stop_others(self):
+        loop = VirtualClockLoop()
+
+        def start(point, options, session, region):
+            if point["cluster"] == "bad":
+                raise ClientError(
+                    {"Error": {"Code": "DBClusterAlreadyExistsFault"}},
+                    "RestoreDBClusterFromSnapshot",
+                )
+
+        def describe(cluster_ids, session, region):
+            return {
+                cluster_id: {"status": "available", "instances": {"i": "available"}}
+                for cluster_id in cluster_ids
+            }
+
+        with (
+            patch("cli.internal.aws.restore.start_restore", side_effect=start),
+            patch("cli.internal.aws.restore.describe_restores", side_effect=describe),
+        ):
+            try:
+                results = loop.run_until_complete(
+                    run_restores(
+                        [point("bad"), point("good")],
+                        OPTIONS,
+                        None,
+                        "us-east-1",
+                        2,
+                    )
+                )
+            finally:
+                loop.close()
+
+        assert [r["status"] for r in results] == ["failed", "available"]
+        assert "DBClusterAlreadyExistsFault" in results[0]["error"]
+
+
+class TestStartRestore:
+    """Test that a failed instance does not leave its cluster behind."""
+
+    def start(self, client):
+        with patch("cli.internal.aws.restore.get_client", return_value=client):
+            start_restore(
+                point("db-1"),
+                {**OPTIONS, "target_id": "db-1-restored"},
+                None,
+                "us-east-1",
+            )
+
+    def test_cluster_deleted_when_instance_fails(self):
+        client = Mock()
+        client.create_db_instance.side_effect = ClientError(
+            {"Error": {"Code": "InsufficientDBInstanceCapacity"}}, "CreateDBInstance"
+        )
+
+        with pytest.raises(ClientError):
+            self.start(client)
+
+        client.delete_db_cluster.assert_called_once_with(
+            DBClusterIdentifier="db-1-restored", SkipFinalSnapshot=True
+        )
+
+    def test_cluster_left_behind_is_reported(self):
+        client = Mock()
+        client.create_db_instance.side_effect = ClientError(
+            {"Error": {"Code": "InsufficientDBInstanceCapacity"}}, "CreateDBInstance"
+        )
+        client.delete_db_cluster.side_effect = ClientError(
+            {"Error": {"Code": "InvalidDBClusterStateFault"}}, "DeleteDBCluster"
+        )
+
+        with pytest.raises(PartialRestoreError, match="db-1-restored was restored"):
+            self.start(client)
@@ -0,0 +1,177 @@
+import asyncio
+
+import pytest
+
+from cli.internal.aws.scheduling import SnapshotScheduler, get_group_schedule
+
+
+def cluster(name):
+    return {"DBClusterIdentifier": name, "Status": "available"}
+
+
+def admit_all(scheduler):
+    """Take every admissible resource without waiting, as (group, cluster) pairs."""
+    admitted = []
+    while (entry := scheduler._admit()) is not None:
+        admitted.append((entry[0], entry[1]["DBClusterIdentifier"]))
+    return admitted
+
+
+class TestGetGroupSchedule:
+    """Test the per-group scheduling keys."""
+
+    def test_defaults(self):
+        assert get_group_schedule({"name": "g"}) == {
+            "max_parallel": None,
+            "priority": 0,
+            "min_interval": None,
+        }
+
+    def test_reads_keys(self):
+        config = {"name": "g", "max_parallel": 2, "priority": 5, "min_interval": 60}
+        assert get_group_schedule(config) == {
+            "max_parallel": 2,
+            "priority": 5,
+            "min_interval": 60,
+        }
+
+    @pytest.mark.parametrize(
+        "config",
+        [
+            {"max_parallel": 0},
+            {"max_parallel": "2"},
+            {"max_parallel": True},
+            {"priority": "high"},
+            {"priority": 1.5},
+            {"min_interval": 0},
+            {"min_interval": "1h"},
+        ],
+    )
+    def test_invalid(self, config):
+        with pytest.raises(ValueError):
+            get_group_schedule({"name": "g", **config})
+
+
+class TestSnapshotScheduler:
+    """Test admission across groups."""
+
+    def test_global_cap(self):
+        """No more than parallel snapshots are admitted across all groups."""
+        scheduler = SnapshotScheduler(parallel=3)
+        for group in ["a", "b"]:
+            scheduler.add_group(group)
+            for i in range(3):
+                scheduler.submit(group, cluster(f"{group}{i}"))
+
+        assert len(admit_all(scheduler)) == 3
+
+        scheduler.release("a")
+        assert len(admit_all(scheduler)) == 1
+
+    def test_priority_then_arrival(self):
+        """Higher priority groups go first, each group in arrival order."""
+        scheduler = SnapshotScheduler(parallel=10)
+        scheduler.add_group("low")
+        scheduler.add_group("high", priority=10)
+        scheduler.submit("low", cluster("l1"))
+        scheduler.submit("high", cluster("h1"))
+        scheduler.submit("low", cluster("l2"))
+        scheduler.submit("high", cluster("h2"))
+
+        assert admit_all(scheduler) == [
+            ("high", "h1"),
+            ("high", "h2"),
+            ("low", "l1"),
+            ("low", "l2"),
+        ]
+
+    def test_longest_expected_first(self):
+        """Within a priority, the longest expected snapshots are admitted first."""
+        sizes = {"small": 10, "large": 1000, "medium": 100}
+        scheduler = SnapshotScheduler(
+            parallel=10, estimate=lambda r: sizes[r["DBClusterIdentifier"]]
+        )
+        scheduler.add_group("g")
+        scheduler.add_group("urgent", priority=1)
+        for name in sizes:
+            scheduler.submit("g", cluster(name))
+        scheduler.submit("urgent", cluster("small"))
+
+        assert admit_all(scheduler) == [
+            ("urgent", "small"),
+            ("g", "large"),
+            ("g", "medium"),
+            ("g", "small"),
+        ]
+
+    def test_group_max_parallel(self):
+        """A group at its max_parallel lets other groups use the free slots."""
+        scheduler = SnapshotScheduler(parallel=4)
+        scheduler.add_group("capped", max_parallel=1, priority=10)
+        scheduler.add_group("other")
+        for i in range(3):
+            scheduler.submit("capped", cluster(f"c{i}"))
+            scheduler.submit("other", cluster(f"o{i}"))
+
+        assert admit_all(scheduler) == [
+            ("capped", "c0"),
+            ("other", "o0"),
+            ("other", "o1"),
+            ("other", "o2"),
+        ]
+
+        scheduler.release("capped")
+        assert admit_all(scheduler) == [("capped", "c1")]
+
+    def test_backoff_lowers_limit(self):
+        """Capacity backoffs shrink the in-flight limit, successes grow it back."""
+        scheduler = SnapshotScheduler(parallel=4)
+        scheduler.add_group("g")
+        for i in range(8):
+            scheduler.submit("g", cluster(str(i)))
+
+        scheduler.record_backoff()
+        assert scheduler.limit == 2
+        assert len(admit_all(scheduler)) == 2
+
+        # About one more slot per limit's worth of successful creates
+        for _ in range(6):
+            scheduler.record_success()
+        assert scheduler.limit == 4
+        assert len(admit_all(scheduler)) == 2
+
+    def test_retry_later_keeps_next_waiting(self):
+        """A refused resource is resubmitted after its delay."""
+
+        async def run():
+            scheduler = SnapshotScheduler(parallel=1)
+            scheduler.add_group("g")
+            scheduler.close_group("g")
+            scheduler.running = 1
+            scheduler._groups["g"]["running"] = 1
+            scheduler.retry_later("g", cluster("a"), 0.01)
+            scheduler.release("g")
+            return await scheduler.next()
+
+        admitted = asyncio.run(run())
+        assert admitted[1]["DBClusterIdentifier"] == "a"
+
+    def test_next_ends_when_groups_closed(self):
+        """next() waits for submissions and returns None once all are closed."""
+
+        async def run():
+            scheduler = SnapshotScheduler(parallel=1)
+            scheduler.add_group("g")
+            waiting = asyncio.create_task(scheduler.next())
+            await asyncio.sleep(0)
+            assert not waiting.done()
+
+            scheduler.submit("g", cluster("a"))
+            first = await waiting
+            scheduler.close_group("g")
+            scheduler.release("g")
+            return first, await scheduler.next()
+
+        first, last = asyncio.run(run())
+        assert first[1]["DBClusterIdentifier"] == "a"
+        assert last is None
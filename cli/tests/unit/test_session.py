@@ -1,5 +1,9 @@
-from datetime import datetime
-from cli.internal.aws.session import generate_session_name
+from datetime import UTC, datetime, timedelta
+from unittest.mock import Mock
+
+import boto3
+
+from cli.internal.aws.session import create_session_with_role, generate_session_name
 
 
 class TestGenerateSessionName:
@@ -44,3 +48,50 @@ class TestGenerateSessionName:
 
         assert name1.startswith("app1")
         assert name2.startswith("app2")
+
+
+def assume_role_response(access_key, expires_in):
+    return {
+        "Credentials": {
+            "AccessKeyId": access_key,
+            "SecretAccessKey": "secret",
+            "SessionToken": "token",
+            "Expiration": datetime.now(UTC) + expires_in,
+        }
+    }
+
+
+class TestCreateSessionWithRole:
+    """Test role assumption."""
+
+    def test_assumes_role_with_source_session(self):
+        """The source session's STS client assumes the role."""
+        source = Mock(spec=boto3.Session)
+        sts = source.client.return_value
+        sts.assume_role.return_value = assume_role_response("AKIA", timedelta(hours=1))
+
+        session = create_session_with_role(
+            {"app": "myapp", "role_arn": "arn:aws:iam::111111111111:role/Backup"},
+            source,
+        )
+
+        call = sts.assume_role.call_args.kwargs
+        assert call["RoleArn"] == "arn:aws:iam::111111111111:role/Backup"
+        assert call["RoleSessionName"].startswith("myapp-backup-")
+        assert session.get_credentials().access_key == "AKIA"
+
+    def test_refreshes_expiring_credentials(self):
+        """The role is assumed again when the credentials are about to expire."""
+        source = Mock(spec=boto3.Session)
+        sts = source.client.return_value
+        sts.assume_role.side_effect = [
+            assume_role_response("AKIA1", timedelta(minutes=1)),
+            assume_role_response("AKIA2", timedelta(hours=1)),
+        ]
+
+        session = create_session_with_role(
+            {"role_arn": "arn:aws:iam::111111111111:role/Backup"}, source
+        )
+
+        assert session.get_credentials().get_frozen_credentials().access_key == "AKIA2"
+        assert sts.assume_role.call_count == 2
@@ -0,0 +1,95 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from cli.internal.aws.sharing import (
+    MAX_SHARE_ATTEMPTS,
+    get_share_accounts,
+    share_lifecycle,
+)
+
+RESULT = {"snapshot_id": "backup-a", "duration": 100.0}
+
+
+def throttled():
+    return ClientError(
+        {"Error": {"Code": "Throttling"}}, "ModifyDBClusterSnapshotAttribute"
+    )
+
+
+def run_share(side_effect):
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        with (
+            patch(
+                "cli.internal.aws.sharing.share_cluster_snapshot",
+                side_effect=side_effect,
+            ) as share,
+            patch("cli.internal.aws.sharing.SHARE_RETRY_DELAY", 0),
+        ):
+            result = asyncio.run(
+                share_lifecycle(RESULT, ["111111111111"], None, "us-east-1", executor)
+            )
+        return result, share
+    finally:
+        executor.shutdown()
+
+
+class TestGetShareAccounts:
+    """Test reading share_with from a resource group config."""
+
+    def test_no_share_with(self):
+        assert get_share_accounts({"name": "db"}) == []
+
+    def test_single_account(self):
+        assert get_share_accounts({"name": "db", "share_with": "111111111111"}) == [
+            "111111111111"
+        ]
+
+    def test_numeric_ids_and_duplicates(self):
+        accounts = get_share_accounts(
+            {"name": "db", "share_with": [11111111111, "011111111111", "222222222222"]}
+        )
+        assert accounts == ["011111111111", "222222222222"]
+
+    @pytest.mark.parametrize(
+        "share_with",
+        [[], "vault", ["12345"], [True], [str(i).zfill(12) for i in range(21)]],
+    )
+    def test_invalid(self, share_with):
+        with pytest.raises(ValueError):
+            get_share_accounts({"name": "db", "share_with": share_with})
+
+
+class TestShareLifecycle:
+    """Test sharing one snapshot."""
+
+    def test_shared(self):
+        share, call = run_share(lambda *args: ["111111111111"])
+        assert share["status"] == "shared"
+        assert share["attempts"] == 1
+        # Latency counts from the snapshot's start, not from when it was shared
+        assert share["latency"] >= RESULT["duration"]
+        call.assert_called_once_with("backup-a", ["111111111111"], None, "us-east-1")
+
+    def test_throttled_call_is_retried(self):
+        share, _call = run_share([throttled(), throttled(), ["111111111111"]])
+        assert share["status"] == "shared"
+        assert share["attempts"] == 3
+
+    def test_gives_up_after_max_attempts(self):
+        share, call = run_share(throttled())
+        assert share["status"] == "failed"
+        assert call.call_count == MAX_SHARE_ATTEMPTS
+
+    def test_other_errors_are_not_retried(self):
+        error = ClientError(
+            {"Error": {"Code": "DBClusterSnapshotNotFoundFault"}},
+            "ModifyDBClusterSnapshotAttribute",
+        )
+        share, call = run_share(error)
+        assert share["status"] == "failed"
+        assert call.call_count == 1
@@ -0,0 +1,37 @@
+from cli.internal.aws.journal import RunJournal
+from cli.internal.aws.status import get_target_entries
+
+
+def record(journal, cluster, account, region):
+    resource = {
+        "DBClusterIdentifier": cluster,
+        "DBClusterArn": f"arn:aws:rds:{region}:{account}:cluster:{cluster}",
+    }
+    journal.record(
+        "initiated",
+        "g",
+        resource,
+        region,
+        snapshot_id=f"backup-{cluster}",
+        snapshot_arn=f"arn:aws:rds:{region}:{account}:cluster-snapshot:backup-{cluster}",
+    )
+
+
+class TestGetTargetEntries:
+    """Test splitting a run's manifest by account and region."""
+
+    def test_filters_by_account_and_region(self):
+        journal = RunJournal.create("run-1", "config.yml")
+        record(journal, "a", "111111111111", "us-east-1")
+        record(journal, "b", "222222222222", "us-east-1")
+        record(journal, "c", "111111111111", "eu-west-1")
+
+        entries = get_target_entries(journal, "111111111111", "us-east-1")
+
+        assert [e["cluster"] for e in entries] == ["a"]
+
+    def test_skips_snapshots_never_started(self):
+        journal = RunJournal.create("run-1", "config.yml")
+        journal.record("pending", "g", {"DBClusterIdentifier": "a"}, "us-east-1")
+
+        assert get_target_entries(journal, "111111111111", "us-east-1") == []
@@ -0,0 +1,156 @@
+import pytest
+
+from cli.internal.aws.tag_filter import (
+    And,
+    Condition,
+    Not,
+    Or,
+    TagFilterError,
+    TagIndex,
+    compile_tag_filter,
+)
+
+
+def tags(**pairs):
+    return [{"Key": key, "Value": value} for key, value in pairs.items()]
+
+
+RECORDS = [
+    {"id": "a", "TagList": tags(Env="prod", Team="payments", Backup="true")},
+    {"id": "b", "TagList": tags(Env="prod", Team="search")},
+    {"id": "c", "TagList": tags(Env="dev", Team="payments")},
+    {"id": "d", "TagList": tags(Env="prod-eu", Critical="yes")},
+    {"id": "e", "TagList": []},
+]
+
+
+def select_ids(tag_filter):
+    """Evaluate through the index and check it agrees with per-record matching."""
+    compiled = compile_tag_filter(tag_filter)
+    indexed = [r["id"] for r in TagIndex(RECORDS).select(compiled)]
+    scanned = [r["id"] for r in RECORDS if compiled.matches(r["TagList"])]
+    assert indexed == scanned
+    return indexed
+
+
+class TestCompileTagFilter:
+    """Test tag filter parsing."""
+
+    def test_parse_precedence(self):
+        """AND binds tighter than OR."""
+        compiled = compile_tag_filter("tag:A=1 AND tag:B=2 OR tag:C=3")
+        assert compiled.root == Or(
+            (
+                And((Condition("A", "=", "1"), Condition("B", "=", "2"))),
+                Condition("C", "=", "3"),
+            )
+        )
+
+    def test_parse_parentheses_and_not(self):
+        """Parentheses group and NOT negates."""
+        compiled = compile_tag_filter("NOT (tag:A=1 OR tag:B)")
+        assert compiled.root == Not(
+            Or((Condition("A", "=", "1"), Condition("B", "exists")))
+        )
+
+    def test_parse_quoted_value(self):
+        """Quoted values may contain spaces and parentheses."""
+        compiled = compile_tag_filter('tag:Name="my db (old)"')
+        assert compiled.root == Condition("Name", "=", "my db (old)")
+
+    @pytest.mark.parametrize(
+        "tag_filter, expected",
+        [
+            ("tag:Name=My App", Condition("Name", "=", "My App")),
+            ("tag:Owner = devops", Condition("Owner", "=", "devops")),
+            ("tag:Team=[core]", Condition("Team", "=", "[core]")),
+            ("tag:Cost Center=abc", Condition("Cost Center", "=", "abc")),
+            ("tag:Env=", Condition("Env", "=", "")),
+            ("tag:Name=db (old)", Condition("Name", "=", "db (old)")),
+            (
+                "tag:Name=My App AND tag:Env=prod",
+                And((Condition("Name", "=", "My App"), Condition("Env", "=", "prod"))),
+            ),
+            (
+                "(tag:Name=My App OR tag:Team~=pay(ments|outs))",
+                Or(
+                    (
+                        Condition("Name", "=", "My App"),
+                        Condition("Team", "~=", "pay(ments|outs)"),
+                    )
+                ),
+            ),
+        ],
+    )
+    def test_parse_original_syntax(self, tag_filter, expected):
+        """Filters accepted by the original " AND " / " OR " parser keep their meaning."""
+        assert compile_tag_filter(tag_filter).root == expected
+
+    def test_equals_is_never_a_glob(self):
+        """Only *= matches globs, so = compares values containing * ? [ literally."""
+        assert compile_tag_filter("tag:Team=[core]").matches(tags(Team="[core]"))
+        assert not compile_tag_filter("tag:Team=c*").matches(tags(Team="core"))
+        assert compile_tag_filter("tag:Team*=c*").matches(tags(Team="core"))
+
+    @pytest.mark.parametrize(
+        "tag_filter",
+        ["", "tag:A=1 AND", "(tag:A=1", "tag:A=1)", "XOR tag:B=2", "tag:A~=("],
+    )
+    def test_invalid_filters(self, tag_filter):
+        """Malformed filters raise TagFilterError."""
+        with pytest.raises(TagFilterError):
+            compile_tag_filter(tag_filter)
+
+
+class TestEvaluateTagFilter:
+    """Test filter evaluation against the inverted index."""
+
+    def test_equality(self):
+        assert select_ids("tag:Env=prod") == ["a", "b"]
+
+    def test_and_or(self):
+        assert select_ids("tag:Env=prod AND tag:Backup=true OR tag:Critical=yes") == [
+            "a",
+            "d",
+        ]
+
+    def test_parentheses(self):
+        assert select_ids("tag:Team=payments AND (tag:Env=dev OR tag:Backup=true)") == [
+            "a",
+            "c",
+        ]
+
+    def test_not_equals_includes_missing_key(self):
+        assert select_ids("tag:Env!=prod") == ["c", "d", "e"]
+
+    def test_not(self):
+        assert select_ids("NOT tag:Team") == ["d", "e"]
+
+    def test_key_exists(self):
+        assert select_ids("tag:Critical") == ["d"]
+
+    def test_glob(self):
+        assert select_ids("tag:Env*=prod*") == ["a", "b", "d"]
+
+    def test_regex(self):
+        assert select_ids("tag:Team~=pay.*|sea.*") == ["a", "b", "c"]
+
+    def test_no_matches(self):
+        assert select_ids("tag:Env=staging") == []
+
+
+class TestToAndGroups:
+    """Test expansion of filters for tag pushdown."""
+
+    def test_expands_parentheses(self):
+        compiled = compile_tag_filter("tag:A=1 AND (tag:B=2 OR tag:C)")
+        assert compiled.to_and_groups() == [
+            [("A", "1"), ("B", "2")],
+            [("A", "1"), ("C", None)],
+        ]
+
+    @pytest.mark.parametrize(
+        "tag_filter", ["NOT tag:A=1", "tag:A!=1", "tag:A*=1*", "tag:A~=x"]
+    )
+    def test_not_pushable(self, tag_filter):
+        assert compile_tag_filter(tag_filter).to_and_groups() is None
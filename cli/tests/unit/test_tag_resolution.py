@@ -0,0 +1,161 @@
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from cli.internal.aws.tag_resolution import TagResolver, resolve_tags
+from cli.internal.aws.throttling import AdaptiveConcurrency, is_throttling_error
+
+
+def throttling_error(code="Throttling"):
+    return ClientError({"Error": {"Code": code, "Message": "Rate exceeded"}}, "op")
+
+
+class TestAdaptiveConcurrency:
+    """Test the AIMD concurrency limit."""
+
+    def test_starts_at_maximum(self):
+        """Limit starts fully open."""
+        assert AdaptiveConcurrency(8).limit == 8
+
+    def test_throttle_halves_limit(self):
+        """Each throttle halves the limit down to the minimum."""
+        limiter = AdaptiveConcurrency(8)
+
+        limiter.record_throttle()
+        assert limiter.limit == 4
+
+        for _ in range(10):
+            limiter.record_throttle()
+        assert limiter.limit == 1
+
+    def test_success_grows_limit_additively(self):
+        """Successes grow the limit by about one per window, up to the maximum."""
+        limiter = AdaptiveConcurrency(4)
+        limiter.record_throttle()
+        limiter.record_throttle()
+        assert limiter.limit == 1
+
+        limiter.record_success()
+        assert limiter.limit == 2
+
+        for _ in range(50):
+            limiter.record_success()
+        assert limiter.limit == 4
+
+    def test_rejects_zero_maximum(self):
+        """A limiter must allow at least one call."""
+        with pytest.raises(ValueError):
+            AdaptiveConcurrency(0)
+
+    def test_is_throttling_error(self):
+        """Throttling codes are detected, other errors are not."""
+        assert is_throttling_error(throttling_error("ThrottlingException"))
+        assert not is_throttling_error(throttling_error("AccessDenied"))
+        assert not is_throttling_error(ValueError("boom"))
+
+
+class TestResolveTags:
+    """Test concurrent tag resolution."""
+
+    def test_results_keep_input_order(self):
+        """Tag lists come back in the order of the ARNs given."""
+        client = Mock()
+        client.list_tags_for_resource.side_effect = lambda ResourceName: {
+            "TagList": [{"Key": "arn", "Value": ResourceName}]
+        }
+        arns = [f"arn:db:{i}" for i in range(20)]
+        stats: dict[str, int] = {}
+
+        result = resolve_tags(client, arns, max_workers=4, stats=stats)
+
+        assert [tags[0]["Value"] for tags in result] == arns
+        assert stats == {"tag_calls": 20}
+
+    def test_retries_throttled_calls(self):
+        """Throttled lookups are retried and counted."""
+        client = Mock()
+        client.list_tags_for_resource.side_effect = [
+            throttling_error(),
+            {"TagList": [{"Key": "Env", "Value": "prod"}]},
+        ]
+        stats: dict[str, int] = {}
+
+        with patch("cli.internal.aws.tag_resolution.THROTTLE_BACKOFF", 0):
+            result = resolve_tags(client, ["arn:db:a"], stats=stats)
+
+        assert result == [[{"Key": "Env", "Value": "prod"}]]
+        assert stats == {"tag_calls": 2}
+
+    def test_non_throttling_errors_propagate(self):
+        """Other API errors are raised to the caller."""
+        client = Mock()
+        client.list_tags_for_resource.side_effect = throttling_error("AccessDenied")
+
+        with pytest.raises(ClientError):
+            resolve_tags(client, ["arn:db:a"])
+
+    def test_empty_arn_list(self):
+        """No lookups for an empty list."""
+        client = Mock()
+        assert resolve_tags(client, []) == []
+        client.list_tags_for_resource.assert_not_called()
+
+
+class TestTagResolver:
+    """Test the scan-wide tag resolver."""
+
+    def test_throttle_state_persists_across_calls(self):
+        """Back-off from one page still applies to the next page."""
+        client = Mock()
+        client.list_tags_for_resource.side_effect = [
+            throttling_error(),
+            {"TagList": []},
+            {"TagList": []},
+        ]
+
+        with (
+            patch("cli.internal.aws.tag_resolution.time.sleep"),
+            TagResolver(client, max_workers=4) as resolver,
+        ):
+            resolver.resolve(["arn:db:a"])
+            limit_after_first_page = resolver.limiter.limit
+            resolver.resolve(["arn:db:b"])
+
+        assert limit_after_first_page < 4
+        assert resolver.limiter.limit < 4
+
+    def test_concurrent_streams_share_one_limit(self):
+        """Two describe streams together stay within max_workers lookups."""
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def list_tags(ResourceName):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            threading.Event().wait(0.01)
+            with lock:
+                running -= 1
+            return {"TagList": []}
+
+        client = Mock()
+        client.list_tags_for_resource.side_effect = list_tags
+
+        with TagResolver(client, max_workers=3) as resolver:
+            streams = [
+                threading.Thread(
+                    target=resolver.resolve,
+                    args=([f"arn:{stream}:{i}" for i in range(12)],),
+                )
+                for stream in ("db", "cluster")
+            ]
+            for stream in streams:
+                stream.start()
+            for stream in streams:
+                stream.join()
+
+        assert peak <= 3